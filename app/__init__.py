@@ -7,6 +7,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_mail import Mail
 from dotenv import load_dotenv
+from app.utils.cache import SimpleCache
+from app.utils.metrics import RequestMetrics
+from app.utils.settings import SettingsService
+from app.utils.read_routing import RoutingSession
 import os
 import pytz
 
@@ -14,16 +18,30 @@ import pytz
 load_dotenv()
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 mail = Mail()
+cache = SimpleCache()
+settings = SettingsService()
+metrics = RequestMetrics()
 
 
-def create_app(config_name='development'):
-    """Application factory pattern"""
+def create_app(config_name='development', mode=None):
+    """
+    Application factory pattern
+
+    Args:
+        config_name: Configuration name (development, production, ...)
+        mode: 'web' (default) or 'worker' for cron jobs and background
+              workers, which skips blueprints and template helpers
+              (default from APP_MODE)
+    """
     app = Flask(__name__)
 
     # Configuration
+    app.config['APP_MODE'] = mode or os.getenv('APP_MODE', 'web')
+    if app.config['APP_MODE'] not in ('web', 'worker'):
+        raise ValueError(f"APP_MODE must be 'web' or 'worker', got {app.config['APP_MODE']!r}")
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
     # Database configuration with absolute path support
@@ -61,7 +79,70 @@ def create_app(config_name='development'):
     # Pagination
     app.config['ITEMS_PER_PAGE'] = int(os.getenv('ITEMS_PER_PAGE', 50))
 
-    # System defaults (from specification)
+    # In-process cache
+    app.config['CACHE_DEFAULT_TIMEOUT'] = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 300))
+    app.config['CACHE_MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', 1000))
+    # Seconds between system_settings version checks
+    app.config['SETTINGS_CHECK_INTERVAL'] = float(os.getenv('SETTINGS_CHECK_INTERVAL', 5))
+
+    # Fingerprinted static assets (flask build-assets)
+    app.config['ASSETS_FINGERPRINT'] = os.getenv('ASSETS_FINGERPRINT', 'False' if config_name == 'development' else 'True') == 'True'
+    app.config['ASSETS_MAX_AGE'] = int(os.getenv('ASSETS_MAX_AGE', 31536000))  # seconds
+
+    # Response compression and conditional (304) report pages
+    app.config['COMPRESSION_ENABLED'] = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes
+    app.config['CONDITIONAL_PAGES_ENABLED'] = os.getenv('CONDITIONAL_PAGES_ENABLED', 'True') == 'True'
+
+    # Compiled templates shared by all workers (flask precompile-templates)
+    app.config['TEMPLATE_BYTECODE_CACHE'] = os.getenv('TEMPLATE_BYTECODE_CACHE', 'True') == 'True'
+    app.config['TEMPLATE_CACHE_DIR'] = os.getenv('TEMPLATE_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache'))
+
+    # {% cache %} template fragments (kept in the in-process cache)
+    app.config['FRAGMENT_CACHE_ENABLED'] = os.getenv('FRAGMENT_CACHE_ENABLED', 'False' if config_name == 'development' else 'True') == 'True'
+
+    # Query counting / N+1 detection
+    app.config['QUERY_COUNTER_ENABLED'] = os.getenv('QUERY_COUNTER_ENABLED', 'True') == 'True'
+    app.config['QUERY_COUNT_HEADER'] = os.getenv('QUERY_COUNT_HEADER', 'True' if config_name == 'development' else 'False') == 'True'
+    app.config['QUERY_COUNT_WARN_THRESHOLD'] = int(os.getenv('QUERY_COUNT_WARN_THRESHOLD', 40))
+    app.config['N_PLUS_ONE_THRESHOLD'] = int(os.getenv('N_PLUS_ONE_THRESHOLD', 5))
+
+    # Request metrics (/metrics for Prometheus, /admin/metrics for SuperAdmin)
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
+
+    # Schema migrations: True lets the gunicorn master apply pending migrations
+    # before forking; otherwise apply them with `flask db upgrade`
+    app.config['SCHEMA_AUTO_UPGRADE'] = os.getenv('SCHEMA_AUTO_UPGRADE', 'False') == 'True'
+
+    # Connection pool (SQLite files and server databases)
+    is_sqlite = database_url.startswith('sqlite')
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 5))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    app.config['DB_POOL_TIMEOUT'] = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    app.config['DB_POOL_RECYCLE'] = int(os.getenv('DB_POOL_RECYCLE', -1 if is_sqlite else 1800))
+    app.config['DB_POOL_PRE_PING'] = os.getenv('DB_POOL_PRE_PING', 'False' if is_sqlite else 'True') == 'True'
+
+    # SQLite connection profile (empty value = leave SQLite's default)
+    app.config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))  # ms
+    app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', -16000))  # 16 MB per connection
+    app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))
+    app.config['SQLITE_WAL_AUTOCHECKPOINT'] = int(os.getenv('SQLITE_WAL_AUTOCHECKPOINT', 1000))  # pages
+    app.config['SQLITE_FOREIGN_KEYS'] = os.getenv('SQLITE_FOREIGN_KEYS', 'True') == 'True'
+    app.config['SQLITE_AUTO_VACUUM'] = os.getenv('SQLITE_AUTO_VACUUM', 'INCREMENTAL')
+    app.config['SQLITE_LOCK_RETRIES'] = int(os.getenv('SQLITE_LOCK_RETRIES', 5))
+    app.config['SQLITE_LOCK_RETRY_BACKOFF'] = float(os.getenv('SQLITE_LOCK_RETRY_BACKOFF', 0.05))  # seconds
+
+    # Read-only engine for reports, dashboards and exports
+    app.config['READ_ROUTING_ENABLED'] = os.getenv('READ_ROUTING_ENABLED', 'True') == 'True'
+    app.config['READ_DATABASE_URL'] = os.getenv('READ_DATABASE_URL')
+    app.config['READ_ONLY_ENDPOINTS'] = [
+        e.strip() for e in os.getenv('READ_ONLY_ENDPOINTS', 'reports.,main.dashboard').split(',') if e.strip()
+    ]
+
+    # System defaults (from specification); system_settings rows override these
     app.config['MEMBERSHIP_FEE'] = int(os.getenv('MEMBERSHIP_FEE', 20000))
     app.config['MONTHLY_CONTRIBUTION'] = int(os.getenv('MONTHLY_CONTRIBUTION', 100000))
     app.config['BEREAVEMENT_AMOUNT'] = int(os.getenv('BEREAVEMENT_AMOUNT', 500000))
@@ -96,41 +177,89 @@ def create_app(config_name='development'):
     app.config['WHATSAPP_PHONE_ID'] = os.getenv('WHATSAPP_PHONE_ID')
 
     # Initialize extensions
+    from app.utils.database import engine_options
+    from app.utils.sqlite_profile import init_sqlite_profile
+    from app.utils.read_routing import READ_BIND, read_bind_options, init_read_routing
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app)
+    read_options = read_bind_options(app)
+    if read_options is not None:
+        app.config['SQLALCHEMY_BINDS'] = {READ_BIND: read_options}
     db.init_app(app)
+    init_sqlite_profile(app)
+    init_read_routing(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
     mail.init_app(app)
+    cache.init_app(app)
+    settings.init_app(app)
+
+    from app.utils.query_counter import init_query_counter
+    init_query_counter(app)
+    metrics.init_app(app)
 
-    # Register blueprints
     with app.app_context():
-        from app.routes import auth, main
-        from app.routes.members import members
-        from app.routes.contributions import contributions
-        from app.routes.membership_fees import membership_fees
-        from app.routes.loans import loans
-        from app.routes.welfare import welfare
-        from app.routes.meetings import meetings
-        from app.routes.reports import reports
-        from app.routes.users import users
-        from app.routes.expenses import expenses
-
-        app.register_blueprint(auth)
-        app.register_blueprint(main)
-        app.register_blueprint(members)
-        app.register_blueprint(contributions)
-        app.register_blueprint(membership_fees)
-        app.register_blueprint(loans)
-        app.register_blueprint(welfare)
-        app.register_blueprint(meetings)
-        app.register_blueprint(reports)
-        app.register_blueprint(users)
-        app.register_blueprint(expenses)
-
-        # Create database tables
-        db.create_all()
-
-    # Context processors and template filters
+        if app.config['APP_MODE'] == 'worker':
+            # Models and services only: no blueprints, templates or request helpers
+            from app import models
+        else:
+            _register_blueprints(app)
+
+        # Compare the stamped schema version (creates an empty database, warns when behind)
+        from app.migrations import ensure_schema
+        ensure_schema(app)
+
+    if app.config['APP_MODE'] == 'web':
+        _register_template_helpers(app)
+        from app.utils.template_cache import init_template_cache
+        init_template_cache(app)
+        from app.utils.fragment_cache import init_fragment_cache
+        init_fragment_cache(app)
+        from app.utils.assets import init_assets
+        init_assets(app)
+        if app.config['COMPRESSION_ENABLED']:
+            from app.utils.compression import CompressionMiddleware
+            app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=app.config['COMPRESSION_MIN_SIZE'])
+
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
+    return app
+
+
+def _register_blueprints(app):
+    """Import and register the web blueprints (web mode only)"""
+    from app.routes import auth, main
+    from app.routes.members import members
+    from app.routes.contributions import contributions
+    from app.routes.membership_fees import membership_fees
+    from app.routes.loans import loans
+    from app.routes.welfare import welfare
+    from app.routes.meetings import meetings
+    from app.routes.reports import reports
+    from app.routes.users import users
+    from app.routes.expenses import expenses
+    from app.routes.metrics import metrics as metrics_bp
+    from app.routes.api import api
+
+    app.register_blueprint(auth)
+    app.register_blueprint(main)
+    app.register_blueprint(members)
+    app.register_blueprint(contributions)
+    app.register_blueprint(membership_fees)
+    app.register_blueprint(loans)
+    app.register_blueprint(welfare)
+    app.register_blueprint(meetings)
+    app.register_blueprint(reports)
+    app.register_blueprint(users)
+    app.register_blueprint(expenses)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(api)
+
+
+def _register_template_helpers(app):
+    """Register context processors and template filters (web mode only)"""
     @app.context_processor
     def utility_processor():
         """Make utility functions available in templates"""
@@ -183,9 +312,3 @@ def create_app(config_name='development'):
     def get_status_badge_class_filter(status):
         from app.utils.helpers import get_status_badge_class
         return get_status_badge_class(status)
-
-    # Register CLI commands
-    from app.commands import register_commands
-    register_commands(app)
-
-    return app
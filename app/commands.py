@@ -63,12 +63,13 @@ def register_commands(app):
                 click.secho(f'Found {len(overdue_loans)} overdue loan(s):', fg='yellow')
                 click.echo('')
 
-                for loan in overdue_loans:
-                    days_overdue = (date.today() - loan.due_date).days
+                for loan, overdue_since, arrears in overdue_loans:
+                    days_overdue = (date.today() - overdue_since).days
                     click.echo(f'  Loan: {loan.loan_number}')
                     click.echo(f'  Borrower: {loan.member.full_name} ({loan.member.member_number})')
-                    click.echo(f'  Due Date: {loan.due_date.strftime("%d/%m/%Y")}')
+                    click.echo(f'  Oldest Unpaid Instalment: {overdue_since.strftime("%d/%m/%Y")}')
                     click.echo(f'  Days Overdue: {days_overdue}')
+                    click.echo(f'  Arrears: UGX {arrears:,.0f}')
                     click.echo(f'  Balance: UGX {loan.balance:,.0f}')
                     click.echo('')
 
@@ -90,19 +91,175 @@ def register_commands(app):
             if not upcoming_loans:
                 click.echo(f'No loans due in the next {days} days.')
             else:
-                click.echo(f'Found {len(upcoming_loans)} loan(s) due:')
+                click.echo(f'Found {len(upcoming_loans)} instalment(s) due:')
                 click.echo('')
 
-                for loan in upcoming_loans:
-                    days_until_due = (loan.due_date - date.today()).days
-                    click.echo(f'  Loan: {loan.loan_number}')
+                for instalment in upcoming_loans:
+                    loan = instalment.loan
+                    days_until_due = (instalment.due_date - date.today()).days
+                    click.echo(f'  Loan: {loan.loan_number} (instalment {instalment.instalment_number})')
                     click.echo(f'  Borrower: {loan.member.full_name} ({loan.member.member_number})')
-                    click.echo(f'  Due Date: {loan.due_date.strftime("%d/%m/%Y")} ({days_until_due} days)')
+                    click.echo(f'  Due Date: {instalment.due_date.strftime("%d/%m/%Y")} ({days_until_due} days)')
+                    click.echo(f'  Amount Due: UGX {instalment.outstanding:,.0f}')
                     click.echo(f'  Balance: UGX {loan.balance:,.0f}')
                     click.echo('')
 
         click.echo('=' * 60)
 
+    @app.cli.command('age-loans')
+    @click.option('--date', 'as_of', type=click.DateTime(formats=['%Y-%m-%d']),
+                  help='Aging date (YYYY-MM-DD, default today)')
+    @click.option('--default-days', type=int, help='Override the LOAN_DEFAULT_DAYS setting')
+    def age_loans_command(as_of, default_days):
+        """Age open loans, mark defaults and write the daily aging snapshot"""
+        from app.utils.loan_aging import age_loans
+
+        as_of = as_of.date() if as_of else date.today()
+        click.echo('=' * 60)
+        click.echo('Loan Aging')
+        click.echo('=' * 60)
+        click.echo(f'Date: {as_of.strftime("%d/%m/%Y")}')
+        click.echo('')
+
+        with app.app_context():
+            result = age_loans(as_of, default_days=default_days)
+
+            click.echo(f"Loans aged: {result['loans_aged']}")
+            click.echo(f"Default threshold: {result['default_days']} days past due")
+            if result['newly_defaulted']:
+                click.secho(f"Newly defaulted: {result['newly_defaulted']}", fg='red')
+            else:
+                click.echo('Newly defaulted: 0')
+            click.echo('')
+
+            click.echo(f"{'Bucket':<10}{'Loans':>8}{'Defaulted':>11}{'Outstanding':>16}{'Arrears':>16}")
+            for row in result['snapshot']:
+                click.echo(f'{row.bucket:<10}{row.loan_count:>8}{row.defaulted_count:>11}'
+                           f'{row.outstanding:>16,}{row.arrears:>16,}')
+
+        click.echo('')
+        click.secho('✓ Aging snapshot written', fg='green')
+        click.echo('=' * 60)
+
+    @app.cli.command('evaluate-membership')
+    @click.option('--date', 'as_of', type=click.DateTime(formats=['%Y-%m-%d']),
+                  help='Evaluation date (YYYY-MM-DD, default today)')
+    def evaluate_membership_command(as_of):
+        """Suspend and expel members past the missed-contribution thresholds"""
+        from app.utils.membership import evaluate_membership
+
+        as_of = as_of.date() if as_of else date.today()
+        click.echo('=' * 60)
+        click.echo('Membership Evaluation')
+        click.echo('=' * 60)
+        click.echo(f'Date: {as_of.strftime("%d/%m/%Y")}')
+        click.echo('')
+
+        with app.app_context():
+            result = evaluate_membership(as_of)
+            thresholds = result['thresholds']
+
+            click.echo(f"Members evaluated: {result['evaluated']}")
+            click.echo(f"Thresholds: suspend at {thresholds['suspension']}, expel at {thresholds['expulsion']} "
+                       f"missed months; qualify after {thresholds['qualification']} months")
+            click.echo(f"Qualification changes: {result['qualification_changes']}")
+            click.echo('')
+
+            for label, members, colour in (('Suspended', result['suspended'], 'yellow'),
+                                           ('Expelled', result['expelled'], 'red')):
+                if members:
+                    click.secho(f'{label}: {len(members)}', fg=colour)
+                    click.echo(f"  {', '.join(members)}")
+                else:
+                    click.echo(f'{label}: 0')
+
+        click.echo('')
+        click.secho('✓ Membership evaluated', fg='green')
+        click.echo('=' * 60)
+
+    @app.cli.command('rebuild-coverage')
+    def rebuild_coverage_command():
+        """Rebuild member contribution coverage bitmasks and streaks"""
+        from app.utils.coverage import rebuild_coverage
+
+        click.echo('=' * 60)
+        click.echo('Rebuild Contribution Coverage')
+        click.echo('=' * 60)
+
+        with app.app_context():
+            result = rebuild_coverage()
+
+        click.echo(f"Members: {result['members']}")
+        click.echo(f"Paid member-months: {result['months']}")
+        click.echo(f"Qualified for benefits: {result['qualified']}")
+        click.echo('')
+        click.secho('✓ Coverage rebuilt', fg='green')
+        click.echo('=' * 60)
+
+    @app.cli.command('build-assets')
+    @click.option('--source', type=click.Path(exists=True, file_okay=False),
+                  help='node_modules-style directory to vendor from instead of the CDN')
+    @click.option('--clean', is_flag=True, help='Remove earlier builds first')
+    def build_assets_command(source, clean):
+        """Vendor, minify, fingerprint and precompress static assets"""
+        from app.utils.assets import vendor_assets, build_assets, brotli
+
+        click.echo('=' * 60)
+        click.echo('Build Static Assets')
+        click.echo('=' * 60)
+
+        try:
+            vendored = vendor_assets(app.static_folder, source=source)
+        except RuntimeError as e:
+            click.secho(f'✗ {e}', fg='red')
+            raise SystemExit(1)
+        for dest in vendored:
+            click.echo(f'Vendored: {dest}')
+
+        result = build_assets(app.static_folder, clean=clean)
+        for logical, hashed in sorted(result['files'].items()):
+            click.echo(f'{logical} -> {hashed}')
+        click.echo('')
+        click.echo(f"Files: {len(result['files'])}")
+        click.echo(f"Size: {result['bytes'] / 1024:.1f} KB, "
+                   f"{result['compressed_bytes'] / 1024:.1f} KB compressed")
+        if brotli is None:
+            click.secho('brotli is not installed: only .gz variants were written', fg='yellow')
+        click.echo('')
+        click.secho('✓ Assets built (restart the app to serve them)', fg='green')
+        click.echo('=' * 60)
+
+    @app.cli.command('precompile-templates')
+    @click.option('--clear', is_flag=True, help='Empty the bytecode cache first')
+    def precompile_templates_command(clear):
+        """Compile every template into the Jinja bytecode cache"""
+        from app.utils.template_cache import precompile_templates
+
+        click.echo('=' * 60)
+        click.echo('Precompile Templates')
+        click.echo('=' * 60)
+
+        if app.config['APP_MODE'] != 'web':
+            click.secho('✗ Templates are only used in web mode (flask --app run)', fg='red')
+            raise SystemExit(1)
+        if app.jinja_env.bytecode_cache is None:
+            click.secho('✗ The bytecode cache is off (TEMPLATE_BYTECODE_CACHE=False)', fg='red')
+            raise SystemExit(1)
+
+        result = precompile_templates(app, clear=clear)
+
+        click.echo(f"Cache directory: {app.config['TEMPLATE_CACHE_DIR']}")
+        click.echo(f"Templates compiled: {len(result['compiled'])} in {result['ms']:.0f} ms")
+        for name, message in result['errors'].items():
+            click.secho(f'✗ {name}: {message}', fg='red')
+        click.echo('')
+        if result['errors']:
+            click.secho(f"✗ {len(result['errors'])} templates failed to compile", fg='red')
+            click.echo('=' * 60)
+            raise SystemExit(1)
+        click.secho('✓ Templates precompiled', fg='green')
+        click.echo('=' * 60)
+
     @app.cli.command('create-superadmin')
     @click.option('--username', prompt='Username', help='Admin username')
     @click.option('--phone', prompt='Phone number', help='Admin phone number')
@@ -196,7 +353,7 @@ def register_commands(app):
             from app.models.user import User
             from app.models.member import Member, NextOfKin
             from app.models.contribution import Contribution, Receipt
-            from app.models.loan import Loan, LoanRepayment
+            from app.models.loan import Loan, LoanRepayment, LoanInstalment, LoanGuarantor, LoanAgingSnapshot
             from app.models.welfare import WelfareRequest, WelfarePayment
             from app.models.meeting import Meeting, Attendance, Minutes, ActionItem
             from app.models.expense import Expense
@@ -263,32 +420,47 @@ def register_commands(app):
                 deleted_counts['Loan Repayments'] = count
                 click.echo(f'  - Deleted {count} loan repayments')
 
-                # 9. Delete loans
+                # 9. Delete loan instalment schedules
+                count = LoanInstalment.query.delete()
+                deleted_counts['Loan Instalments'] = count
+                click.echo(f'  - Deleted {count} loan instalments')
+
+                # 10. Delete loan guarantors (bulk deletes skip the Loan.guarantors cascade)
+                count = LoanGuarantor.query.delete()
+                deleted_counts['Loan Guarantors'] = count
+                click.echo(f'  - Deleted {count} loan guarantors')
+
+                # 11. Delete loan aging snapshots (totals of the deleted loans)
+                count = LoanAgingSnapshot.query.delete()
+                deleted_counts['Loan Aging Snapshots'] = count
+                click.echo(f'  - Deleted {count} loan aging snapshots')
+
+                # 12. Delete loans
                 count = Loan.query.delete()
                 deleted_counts['Loans'] = count
                 click.echo(f'  - Deleted {count} loans')
 
-                # 10. Delete welfare payments
+                # 13. Delete welfare payments
                 count = WelfarePayment.query.delete()
                 deleted_counts['Welfare Payments'] = count
                 click.echo(f'  - Deleted {count} welfare payments')
 
-                # 11. Delete welfare requests
+                # 14. Delete welfare requests
                 count = WelfareRequest.query.delete()
                 deleted_counts['Welfare Requests'] = count
                 click.echo(f'  - Deleted {count} welfare requests')
 
-                # 12. Delete receipts
+                # 15. Delete receipts
                 count = Receipt.query.delete()
                 deleted_counts['Receipts'] = count
                 click.echo(f'  - Deleted {count} receipts')
 
-                # 13. Delete contributions
+                # 16. Delete contributions
                 count = Contribution.query.delete()
                 deleted_counts['Contributions'] = count
                 click.echo(f'  - Deleted {count} contributions')
 
-                # 14. Delete users (except super admin)
+                # 17. Delete users (except super admin)
                 if keep_admin and super_admin_user:
                     count = User.query.filter(User.id != super_admin_user.id).delete()
                 else:
@@ -296,7 +468,7 @@ def register_commands(app):
                 deleted_counts['Users'] = count
                 click.echo(f'  - Deleted {count} users')
 
-                # 15. Delete members (except super admin's member)
+                # 18. Delete members (except super admin's member)
                 if keep_admin and super_admin_member_id:
                     # First, delete next of kin for non-admin members
                     count = NextOfKin.query.filter(NextOfKin.member_id != super_admin_member_id).delete()
@@ -309,7 +481,7 @@ def register_commands(app):
                     # Reset the admin member's data
                     admin_member = Member.query.get(super_admin_member_id)
                     if admin_member:
-                        admin_member.total_contributed = 0.00
+                        admin_member.total_contributed = 0
                         admin_member.consecutive_months_paid = 0
                         admin_member.last_contribution_date = None
                         admin_member.qualified_for_benefits = False
@@ -347,3 +519,217 @@ def register_commands(app):
                 click.echo(traceback.format_exc())
 
         click.echo('=' * 60)
+
+    @app.cli.command('seed-synthetic')
+    @click.option('--members', default=1000, show_default=True, help='Number of members to generate')
+    @click.option('--years', default=10, show_default=True, help='Years of history to generate')
+    @click.option('--seed', default=1, show_default=True, help='Random seed (same seed = same data)')
+    @click.option('--batch-size', default=50000, show_default=True, help='Rows per bulk INSERT')
+    def seed_synthetic_command(members, years, seed, batch_size):
+        """Fill an empty database with deterministic synthetic data"""
+        import time
+        from sqlalchemy import make_url
+        from app.utils.synthetic_data import generate_synthetic_data, SYNTHETIC_PASSWORD
+
+        click.echo('=' * 60)
+        click.echo('Synthetic Data Generator')
+        click.echo('=' * 60)
+        database = make_url(app.config['SQLALCHEMY_DATABASE_URI']).render_as_string(hide_password=True)
+        click.echo(f'Database: {database}')
+        click.echo(f'Members: {members}  Years: {years}  Seed: {seed}')
+        click.echo('')
+
+        with app.app_context():
+            started = time.perf_counter()
+            try:
+                counts = generate_synthetic_data(
+                    members=members,
+                    years=years,
+                    seed=seed,
+                    batch_size=batch_size,
+                    progress=lambda message: click.echo(f'  {message}')
+                )
+            except ValueError as e:
+                click.secho(f'✗ {e}', fg='red')
+                raise SystemExit(1)
+            except Exception as e:
+                click.secho(f'✗ Error generating data: {str(e)}', fg='red')
+                click.echo('  Rows written before the error were removed; the database is empty again')
+                raise SystemExit(1)
+
+            elapsed = time.perf_counter() - started
+
+            click.echo('')
+            click.echo('Rows inserted:')
+            for table, count in counts.items():
+                click.echo(f'  {table}: {count:,}')
+            click.echo('')
+            click.secho(f'✓ Generated {sum(counts.values()):,} rows in {elapsed:.1f}s', fg='green')
+            click.echo(f'  All users log in with their phone number and password "{SYNTHETIC_PASSWORD}"')
+            click.echo('  Super admin: member OT-001, executives: OT-002..OT-004, auditor: OT-005')
+
+        click.echo('=' * 60)
+
+    @app.cli.command('db-maintenance')
+    @click.option('--checkpoint', 'checkpoint_mode', default='TRUNCATE', show_default=True,
+                  type=click.Choice(['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'], case_sensitive=False),
+                  help='WAL checkpoint mode')
+    @click.option('--vacuum-pages', default=0, show_default=True, help='Free pages to release (0 = all)')
+    @click.option('--no-vacuum', is_flag=True, help='Skip the incremental vacuum')
+    @click.option('--backup', 'backup_to', default=None, help='Backup file or directory')
+    @click.option('--keep', default=14, show_default=True, help='Timestamped backups to keep in a backup directory')
+    @click.option('--verify', is_flag=True, help='Run an integrity check on the backup')
+    @click.option('--enable-incremental-vacuum', is_flag=True,
+                  help='One-off: convert the database to auto_vacuum=INCREMENTAL (full VACUUM)')
+    def db_maintenance_command(checkpoint_mode, vacuum_pages, no_vacuum, backup_to, keep, verify,
+                               enable_incremental_vacuum):
+        """Checkpoint the WAL, release free pages and take an online backup"""
+        import os
+        from app.utils import sqlite_profile
+
+        click.echo('=' * 60)
+        click.echo('SQLite Maintenance')
+        click.echo('=' * 60)
+
+        with app.app_context():
+            engine = db.engine
+            if engine.dialect.name != 'sqlite':
+                click.secho(f'✗ db-maintenance only supports SQLite (database is {engine.dialect.name})', fg='red')
+                return
+
+            def describe(stats):
+                return (f"db {stats['db_bytes'] / 1048576:.1f} MB, wal {stats['wal_bytes'] / 1048576:.1f} MB, "
+                        f"{stats['freelist_count']:,} free pages "
+                        f"(journal_mode={stats['journal_mode']}, auto_vacuum={stats['auto_vacuum']})")
+
+            try:
+                stats = sqlite_profile.database_stats(engine)
+                click.echo(f'Database: {sqlite_profile.database_path(engine)}')
+                click.echo(f'Before: {describe(stats)}')
+                click.echo('')
+
+                if enable_incremental_vacuum and stats['auto_vacuum'] != 'INCREMENTAL':
+                    click.echo('Converting to auto_vacuum=INCREMENTAL (full VACUUM)...')
+                    sqlite_profile.enable_incremental_vacuum(engine)
+                    click.secho('✓ Incremental vacuum enabled', fg='green')
+                    stats = sqlite_profile.database_stats(engine)
+
+                if stats['journal_mode'] == 'WAL':
+                    busy, frames, done = sqlite_profile.checkpoint(engine, checkpoint_mode)
+                    if busy:
+                        click.secho(f'! {checkpoint_mode.upper()} checkpoint incomplete: '
+                                    f'{done}/{frames} frames (database busy)', fg='yellow')
+                    else:
+                        click.secho(f'✓ {checkpoint_mode.upper()} checkpoint: {done} frames copied', fg='green')
+
+                if not no_vacuum:
+                    if stats['auto_vacuum'] == 'INCREMENTAL':
+                        released = sqlite_profile.incremental_vacuum(engine, vacuum_pages)
+                        click.secho(f'✓ Incremental vacuum released {released:,} pages', fg='green')
+                    elif stats['freelist_count']:
+                        click.secho('! auto_vacuum is not INCREMENTAL; run once with '
+                                    '--enable-incremental-vacuum to reclaim free pages', fg='yellow')
+
+                sqlite_profile.optimize(engine)
+                click.secho('✓ Planner statistics optimized', fg='green')
+
+                if backup_to:
+                    path = sqlite_profile.backup_database(engine, backup_to, verify=verify)
+                    size = os.path.getsize(path) / 1048576
+                    click.secho(f'✓ Backup written to {path} ({size:.1f} MB'
+                                f'{", integrity ok" if verify else ""})', fg='green')
+                    if os.path.isdir(backup_to):
+                        name = os.path.splitext(os.path.basename(sqlite_profile.database_path(engine)))[0]
+                        for removed in sqlite_profile.prune_backups(backup_to, name, keep):
+                            click.echo(f'  - Removed old backup {os.path.basename(removed)}')
+
+                click.echo('')
+                click.echo(f'After: {describe(sqlite_profile.database_stats(engine))}')
+            except Exception as e:
+                click.secho(f'✗ Maintenance failed: {str(e)}', fg='red')
+                click.echo('=' * 60)
+                raise SystemExit(1)
+
+        click.echo('=' * 60)
+
+    @app.cli.group('db')
+    def db_group():
+        """Schema migrations (versioned, stored in schema_version)"""
+
+    @db_group.command('upgrade')
+    @click.option('--revision', type=int, default=None, help='Revision to upgrade to (default: newest)')
+    def db_upgrade_command(revision):
+        """Apply pending schema migrations"""
+        from app import migrations
+
+        click.echo('=' * 60)
+        click.echo('Schema Upgrade')
+        click.echo('=' * 60)
+
+        with app.app_context():
+            try:
+                start, end = migrations.upgrade(revision, log=lambda message: click.echo(f'  {message}'))
+            except Exception as e:
+                click.secho(f'✗ Upgrade failed: {str(e)}', fg='red')
+                click.echo('=' * 60)
+                raise SystemExit(1)
+
+            if start == end:
+                click.secho(f'✓ Already at revision {end}', fg='green')
+            else:
+                click.secho(f'✓ Upgraded from revision {start} to {end}', fg='green')
+
+        click.echo('=' * 60)
+
+    @db_group.command('downgrade')
+    @click.option('--revision', type=int, default=None, help='Revision to downgrade to (default: one step back)')
+    @click.confirmation_option(prompt='Downgrading can drop columns and data. Continue?')
+    def db_downgrade_command(revision):
+        """Undo schema migrations"""
+        from app import migrations
+
+        click.echo('=' * 60)
+        click.echo('Schema Downgrade')
+        click.echo('=' * 60)
+
+        with app.app_context():
+            current = migrations.current_revision() or 0
+            target = current - 1 if revision is None else revision
+            try:
+                start, end = migrations.downgrade(target, log=lambda message: click.echo(f'  {message}'))
+            except Exception as e:
+                click.secho(f'✗ Downgrade failed: {str(e)}', fg='red')
+                click.echo('=' * 60)
+                raise SystemExit(1)
+
+            click.secho(f'✓ Downgraded from revision {start} to {end}', fg='green')
+
+        click.echo('=' * 60)
+
+    @db_group.command('current')
+    @click.option('--verbose', '-v', is_flag=True, help='List every applied revision')
+    def db_current_command(verbose):
+        """Show the database schema revision"""
+        from app import migrations
+
+        with app.app_context():
+            current = migrations.current_revision()
+            head = migrations.head_revision()
+
+            if current is None:
+                click.secho(f'Database is not versioned (newest revision: {head})', fg='yellow')
+                return
+
+            colour = 'green' if current == head else 'yellow'
+            click.secho(f'Revision {current} of {head}' + ('' if current == head else ' (run "flask db upgrade")'),
+                        fg=colour)
+
+            if verbose:
+                applied = {version: (description, applied_at)
+                           for version, description, applied_at in migrations.history()}
+                for module in migrations.migrations():
+                    if module.revision in applied:
+                        description, applied_at = applied[module.revision]
+                        click.echo(f'  {module.revision:>4}  {applied_at:%Y-%m-%d %H:%M}  {description}')
+                    else:
+                        click.echo(f'  {module.revision:>4}  {"pending":<16}  {module.description}')
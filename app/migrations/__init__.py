@@ -0,0 +1,256 @@
+"""
+Schema Migrations
+Versioned migration runner with a schema_version table
+
+Each module in app/migrations/versions defines:
+    revision: int, one higher than the previous migration
+    description: short text stored with the version row
+    upgrade(connection): apply the change
+    downgrade(connection): undo it (raise NotImplementedError if it can't be)
+
+Startup only reads MAX(version) from schema_version and compares it with
+the newest revision, instead of reflecting every table.
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+from sqlalchemy import Table, Column, Integer, String, DateTime, MetaData, select, func, inspect
+from sqlalchemy.exc import DBAPIError
+from app import db
+
+
+# Kept out of db.metadata so db.create_all() and DataVersion never see it
+_metadata = MetaData()
+schema_version = Table(
+    'schema_version', _metadata,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+_migrations = None
+
+
+def migrations():
+    """
+    Load migration modules ordered by revision
+
+    Raises:
+        RuntimeError: If revisions are not 1, 2, 3, ... without gaps
+    """
+    global _migrations
+    if _migrations is None:
+        from app.migrations import versions
+
+        modules = [
+            importlib.import_module(f'{versions.__name__}.{name}')
+            for _, name, _ in pkgutil.iter_modules(versions.__path__)
+        ]
+        modules.sort(key=lambda m: m.revision)
+        revisions = [m.revision for m in modules]
+        if revisions != list(range(1, len(modules) + 1)):
+            raise RuntimeError(f'Migration revisions must be 1..{len(modules)} without gaps, got {revisions}')
+        _migrations = modules
+    return _migrations
+
+
+def head_revision():
+    """Newest migration revision"""
+    return len(migrations())
+
+
+def current_revision(engine=None):
+    """
+    Read the stamped schema version with a single query
+
+    Returns:
+        int version, 0 for an empty stamp table, or None if the database
+        has never been stamped
+    """
+    engine = engine or db.engine
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except DBAPIError:
+        return None
+
+
+def history(engine=None):
+    """Applied versions as a list of (version, description, applied_at)"""
+    engine = engine or db.engine
+    if current_revision(engine) is None:
+        return []
+    with engine.connect() as connection:
+        return connection.execute(
+            select(schema_version.c.version, schema_version.c.description, schema_version.c.applied_at)
+            .order_by(schema_version.c.version)
+        ).all()
+
+
+def load_models():
+    """Import every module that maps a table so db.metadata is complete"""
+    import app.models
+    import app.models.expense
+    import app.utils.notifications  # NotificationLog
+
+
+def _stamp(connection, module):
+    connection.execute(schema_version.insert().values(
+        version=module.revision, description=module.description, applied_at=datetime.utcnow()
+    ))
+
+
+def upgrade(target=None, engine=None, log=None):
+    """
+    Bring the database to a revision (default: newest)
+
+    An empty database gets the current models via create_all() and is
+    stamped at head. A database from before versioning is upgraded from
+    revision 1, whose baseline migration is idempotent.
+
+    Args:
+        target: Revision to stop at
+        engine: Engine to migrate (default: db.engine)
+        log: Callable receiving progress messages
+
+    Returns:
+        Tuple (from_revision, to_revision)
+    """
+    from app.models.system import DataVersion
+
+    load_models()
+    engine = engine or db.engine
+    log = log or (lambda message: None)
+    modules = migrations()
+    target = head_revision() if target is None else target
+    current = current_revision(engine)
+
+    if target > head_revision() or target < 0:
+        raise ValueError(f'Unknown revision {target} (head is {head_revision()})')
+
+    if current is None:
+        schema_version.create(engine, checkfirst=True)
+        if not inspect(engine).has_table('members') and target == head_revision():
+            log('Empty database: creating tables from the models')
+            with engine.begin() as connection:
+                db.metadata.create_all(connection)
+                for module in modules:
+                    _stamp(connection, module)
+            DataVersion.initialize_defaults()
+            return 0, target
+        current = 0
+
+    start = current
+    for module in modules[current:target]:
+        log(f'Upgrading to {module.revision}: {module.description}')
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            _stamp(connection, module)
+        current = module.revision
+
+    if current != start:
+        DataVersion.initialize_defaults()
+    return start, current
+
+
+def downgrade(target, engine=None, log=None):
+    """
+    Undo migrations newer than target
+
+    Returns:
+        Tuple (from_revision, to_revision)
+    """
+    load_models()
+    engine = engine or db.engine
+    log = log or (lambda message: None)
+    current = current_revision(engine) or 0
+    if target < 0 or target > current:
+        raise ValueError(f'Cannot downgrade from {current} to {target}')
+
+    start = current
+    for module in reversed(migrations()[target:current]):
+        log(f'Downgrading {module.revision}: {module.description}')
+        with engine.begin() as connection:
+            module.downgrade(connection)
+            connection.execute(schema_version.delete().where(schema_version.c.version == module.revision))
+        current = module.revision - 1
+    return start, current
+
+
+def ensure_schema(app):
+    """
+    Check the schema version at startup
+
+    Runs in every process (web workers, cron jobs, `flask db ...`), so it
+    only creates an empty database; a stale schema is logged. Pending
+    migrations are applied by `flask db upgrade`, or by auto_upgrade() in
+    the gunicorn master when SCHEMA_AUTO_UPGRADE is on.
+    """
+    current = current_revision()
+    head = head_revision()
+    if current == head:
+        return
+
+    if current is None and not inspect(db.engine).has_table('members'):
+        upgrade(log=app.logger.info)
+        app.logger.info(f'Empty database created at revision {head}')
+        return
+
+    found = 'unversioned' if current is None else f'at revision {current}'
+    app.logger.warning(f'Database schema is {found}, code expects {head}; run "flask db upgrade"')
+
+
+def auto_upgrade(app, log=None):
+    """
+    Apply pending migrations when SCHEMA_AUTO_UPGRADE is on
+
+    Call it from one process before the others start (gunicorn's
+    when_ready), never from create_app.
+
+    Returns:
+        Tuple (from_revision, to_revision), or None when switched off
+    """
+    if not app.config['SCHEMA_AUTO_UPGRADE']:
+        return None
+    with app.app_context():
+        result = upgrade(log=log)
+        db.session.remove()
+        db.engine.dispose()
+    return result
+
+
+# ----------------------------------------------------------------------
+# Helpers for migration modules
+# ----------------------------------------------------------------------
+
+def add_missing_columns(connection, table_name, column_names):
+    """
+    ALTER TABLE ADD COLUMN for model columns the table does not have yet
+
+    The column type comes from the model definition.
+
+    Returns:
+        List of added column names
+    """
+    existing = {c['name'] for c in inspect(connection).get_columns(table_name)}
+    table = db.metadata.tables[table_name]
+    added = []
+    for name in column_names:
+        if name in existing:
+            continue
+        column_type = table.c[name].type.compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f'ALTER TABLE {table_name} ADD COLUMN {name} {column_type}')
+        added.append(name)
+    return added
+
+
+def create_missing_tables(connection, table_names):
+    """Create the given model tables if they do not exist"""
+    db.metadata.create_all(connection, tables=[db.metadata.tables[name] for name in table_names])
+
+
+def create_missing_indexes(connection, table_name, index_names):
+    """Create the given model indexes on an existing table if they do not exist"""
+    for index in db.metadata.tables[table_name].indexes:
+        if index.name in index_names:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,4 @@
+"""
+Migration Versions
+One module per schema revision (vNNNN_description.py)
+"""
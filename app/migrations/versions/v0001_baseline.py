@@ -0,0 +1,37 @@
+"""
+Baseline schema
+Brings a database from before versioning up to the schema of the first
+release with migrations: tables created by db.create_all() plus the
+columns the ad-hoc scripts in migrations/ and the *.sql files added
+"""
+from app.migrations import add_missing_columns, create_missing_tables
+
+revision = 1
+description = 'Baseline schema'
+
+BASELINE_TABLES = [
+    'members', 'next_of_kin', 'users', 'audit_logs', 'contributions', 'expenses', 'loans',
+    'meetings', 'notifications', 'system_settings', 'welfare_requests', 'action_items',
+    'attendance', 'loan_repayments', 'minutes', 'notification_logs', 'receipts',
+    'welfare_payments', 'data_versions',
+]
+
+LEGACY_COLUMNS = {
+    'loans': [
+        'due_date', 'disbursement_document_path',
+        'guarantor1_approval_date', 'guarantor2_approval_date',
+        'guarantor1_rejection_reason', 'guarantor2_rejection_reason',
+    ],
+    'receipts': ['transaction_reference'],
+    'welfare_payments': ['withdrawal_reference', 'withdrawal_document_path', 'beneficiary_receipt_path'],
+}
+
+
+def upgrade(connection):
+    create_missing_tables(connection, BASELINE_TABLES)
+    for table_name, columns in LEGACY_COLUMNS.items():
+        add_missing_columns(connection, table_name, columns)
+
+
+def downgrade(connection):
+    raise NotImplementedError('The baseline schema cannot be downgraded')
@@ -0,0 +1,45 @@
+"""
+Money columns as whole shillings
+Converts every amount column from NUMERIC(15, 2) to integer shillings
+
+SQLite cannot change a column's declared type without rebuilding the
+table, so there the values are rounded and stored as INTEGER in place
+(NUMERIC affinity keeps integers as integers). PostgreSQL columns are
+altered to BIGINT.
+"""
+revision = 2
+description = 'Money columns as whole shillings'
+
+MONEY_COLUMNS = {
+    'contributions': ['amount'],
+    'receipts': ['amount'],
+    'expenses': ['amount'],
+    'members': ['total_contributed', 'refund_amount'],
+    'welfare_requests': ['amount_requested', 'amount_approved'],
+    'welfare_payments': ['amount_paid'],
+    'loans': ['amount_requested', 'amount_approved', 'collateral_value', 'total_payable', 'total_paid', 'balance'],
+    'loan_repayments': ['amount_paid', 'principal_portion', 'interest_portion'],
+}
+
+
+def upgrade(connection):
+    for table_name, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            if connection.dialect.name == 'sqlite':
+                connection.exec_driver_sql(
+                    f"UPDATE {table_name} SET {column} = CAST(ROUND({column}) AS INTEGER) "
+                    f"WHERE typeof({column}) IN ('real', 'text')"
+                )
+            else:
+                connection.exec_driver_sql(
+                    f'ALTER TABLE {table_name} ALTER COLUMN {column} TYPE BIGINT USING ROUND({column})::bigint'
+                )
+
+
+def downgrade(connection):
+    # Whole numbers are valid NUMERIC(15, 2) values, so SQLite needs nothing
+    if connection.dialect.name == 'sqlite':
+        return
+    for table_name, columns in MONEY_COLUMNS.items():
+        for column in columns:
+            connection.exec_driver_sql(f'ALTER TABLE {table_name} ALTER COLUMN {column} TYPE NUMERIC(15, 2)')
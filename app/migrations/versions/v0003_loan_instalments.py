@@ -0,0 +1,102 @@
+"""
+Loan instalment schedule
+Creates loan_instalments and backfills schedules for loans already
+disbursed, replaying their repayments against the new rows (the recorded
+principal/interest portions of past repayments are left as they are)
+
+Reads and writes go through explicit columns as they were at this
+revision, never the mapped models, which gain columns in later revisions.
+"""
+from decimal import Decimal
+from types import SimpleNamespace
+from sqlalchemy import table, column, select, insert, exists, BigInteger, Integer, Date, Numeric
+from app.migrations import create_missing_tables
+
+revision = 3
+description = 'Loan instalment schedule'
+
+loans = table(
+    'loans',
+    column('id', Integer),
+    column('amount_approved', BigInteger),
+    column('interest_rate', Numeric(5, 2)),
+    column('repayment_period_months', Integer),
+    column('total_payable', BigInteger),
+    column('disbursed'),
+    column('disbursement_date', Date),
+)
+
+loan_repayments = table(
+    'loan_repayments',
+    column('id', Integer),
+    column('loan_id', Integer),
+    column('payment_date', Date),
+    column('amount_paid', BigInteger),
+)
+
+loan_instalments = table(
+    'loan_instalments',
+    column('loan_id', Integer),
+    column('instalment_number', Integer),
+    column('due_date', Date),
+    column('principal_due', BigInteger),
+    column('interest_due', BigInteger),
+    column('amount_due', BigInteger),
+    column('cumulative_due', BigInteger),
+    column('principal_paid', BigInteger),
+    column('interest_paid', BigInteger),
+    column('paid_date', Date),
+)
+
+INSTALMENT_COLUMNS = [c.name for c in loan_instalments.c]
+
+
+def _total_payable(row):
+    """total_payable, or the flat-interest total when it was never set"""
+    if row.total_payable is not None:
+        return row.total_payable
+    from app.models.types import to_money
+
+    principal = row.amount_approved
+    rate = Decimal(str(row.interest_rate or 0)) / 100
+    return principal + to_money(principal * rate * (row.repayment_period_months or 1))
+
+
+def upgrade(connection):
+    from app.utils.amortization import build_schedule, apply_payment
+
+    create_missing_tables(connection, ['loan_instalments'])
+
+    rows = connection.execute(select(
+        loans.c.id, loans.c.amount_approved, loans.c.interest_rate,
+        loans.c.repayment_period_months, loans.c.total_payable, loans.c.disbursement_date
+    ).where(
+        loans.c.disbursed == True,
+        loans.c.disbursement_date.is_not(None),
+        loans.c.amount_approved.is_not(None),
+        ~exists().where(loan_instalments.c.loan_id == loans.c.id)
+    )).all()
+
+    for row in rows:
+        loan = SimpleNamespace(
+            id=row.id,
+            amount_approved=row.amount_approved,
+            total_payable=_total_payable(row),
+            repayment_period_months=row.repayment_period_months,
+            disbursement_date=row.disbursement_date,
+        )
+        instalments = build_schedule(loan)
+        repayments = connection.execute(
+            select(loan_repayments.c.amount_paid, loan_repayments.c.payment_date)
+            .where(loan_repayments.c.loan_id == row.id)
+            .order_by(loan_repayments.c.payment_date, loan_repayments.c.id)
+        ).all()
+        for amount_paid, payment_date in repayments:
+            apply_payment([i for i in instalments if not i.paid_date], amount_paid, payment_date)
+        connection.execute(insert(loan_instalments), [
+            {name: getattr(instalment, name) for name in INSTALMENT_COLUMNS} for instalment in instalments
+        ])
+
+
+def downgrade(connection):
+    connection.exec_driver_sql('DROP TABLE loan_instalments')
@@ -0,0 +1,21 @@
+"""
+Loan aging
+Adds loans.days_past_due / arrears_amount (kept by `flask age-loans`)
+and the daily loan_aging_snapshots table
+"""
+from app.migrations import add_missing_columns, create_missing_tables
+
+revision = 4
+description = 'Loan aging columns and snapshots'
+
+
+def upgrade(connection):
+    add_missing_columns(connection, 'loans', ['days_past_due', 'arrears_amount'])
+    connection.exec_driver_sql('UPDATE loans SET days_past_due = 0, arrears_amount = 0 WHERE days_past_due IS NULL')
+    create_missing_tables(connection, ['loan_aging_snapshots'])
+
+
+def downgrade(connection):
+    connection.exec_driver_sql('DROP TABLE loan_aging_snapshots')
+    connection.exec_driver_sql('ALTER TABLE loans DROP COLUMN arrears_amount')
+    connection.exec_driver_sql('ALTER TABLE loans DROP COLUMN days_past_due')
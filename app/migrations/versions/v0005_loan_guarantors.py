@@ -0,0 +1,29 @@
+"""
+Loan guarantors association table
+Creates loan_guarantors and copies the guarantor1_*/guarantor2_* columns
+of existing loans into it (the columns stay, kept in sync by the models)
+"""
+from app.migrations import create_missing_tables
+
+revision = 5
+description = 'Loan guarantors table'
+
+
+def upgrade(connection):
+    create_missing_tables(connection, ['loan_guarantors'])
+    for slot in (1, 2):
+        connection.exec_driver_sql(f"""
+            INSERT INTO loan_guarantors (loan_id, member_id, slot, decision, decided_at)
+            SELECT id, guarantor{slot}_id, {slot},
+                   CASE WHEN guarantor{slot}_approved IS NULL THEN 'Pending'
+                        WHEN guarantor{slot}_approved THEN 'Approved'
+                        ELSE 'Declined' END,
+                   guarantor{slot}_approval_date
+            FROM loans
+            WHERE guarantor{slot}_id IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM loan_guarantors g WHERE g.loan_id = loans.id AND g.slot = {slot})
+        """)
+
+
+def downgrade(connection):
+    connection.exec_driver_sql('DROP TABLE loan_guarantors')
@@ -0,0 +1,20 @@
+"""
+Membership evaluation
+Adds members.months_missed (kept by `flask evaluate-membership`) and an
+index for the latest paid month per member
+"""
+from app.migrations import add_missing_columns, create_missing_indexes
+
+revision = 6
+description = 'Membership evaluation column and index'
+
+
+def upgrade(connection):
+    add_missing_columns(connection, 'members', ['months_missed'])
+    connection.exec_driver_sql('UPDATE members SET months_missed = 0 WHERE months_missed IS NULL')
+    create_missing_indexes(connection, 'contributions', ['ix_contributions_member_month'])
+
+
+def downgrade(connection):
+    connection.exec_driver_sql('DROP INDEX ix_contributions_member_month')
+    connection.exec_driver_sql('ALTER TABLE members DROP COLUMN months_missed')
@@ -0,0 +1,91 @@
+"""
+Contribution coverage
+Adds the per-member paid-months bitmask and fills it, with true
+consecutive_months_paid and qualified_for_benefits, from contributions
+
+Reads and writes go through explicit columns as they were at this
+revision, never the mapped models, which gain columns in later revisions.
+"""
+from flask import current_app
+from sqlalchemy import table, column, select, update, bindparam, Integer, Date, String, Boolean, Text
+from app.migrations import add_missing_columns
+from app.models.types import MonthBitmap
+
+revision = 7
+description = 'Contribution coverage bitmask'
+
+members = table(
+    'members',
+    column('id', Integer),
+    column('date_joined', Date),
+    column('status', String),
+    column('consecutive_months_paid', Integer),
+    column('qualified_for_benefits', Boolean),
+    column('coverage_start', Integer),
+    column('contribution_coverage', MonthBitmap),
+)
+
+contributions = table(
+    'contributions',
+    column('member_id', Integer),
+    column('contribution_month', String),
+)
+
+system_settings = table(
+    'system_settings',
+    column('setting_key', String),
+    column('setting_value', Text),
+)
+
+
+def _qualification_period(connection):
+    """QUALIFICATION_PERIOD as the settings service resolves it: row, app.config, 5"""
+    value = connection.execute(
+        select(system_settings.c.setting_value).where(system_settings.c.setting_key == 'QUALIFICATION_PERIOD')
+    ).scalar()
+    if value is not None:
+        return int(value)
+    return current_app.config.get('QUALIFICATION_PERIOD', 5)
+
+
+def upgrade(connection):
+    from app.utils.coverage import Coverage, qualifies
+
+    add_missing_columns(connection, 'members', ['coverage_start', 'contribution_coverage'])
+
+    period = _qualification_period(connection)
+    months = {}
+    for member_id, month in connection.execute(
+        select(contributions.c.member_id, contributions.c.contribution_month).distinct()
+    ):
+        months.setdefault(member_id, []).append(month)
+
+    values = []
+    for member_id, joined, status in connection.execute(
+        select(members.c.id, members.c.date_joined, members.c.status)
+    ):
+        coverage = Coverage.from_months(months.get(member_id, []), joined=joined)
+        streak = coverage.streak()
+        values.append({
+            'b_id': member_id,
+            'b_start': coverage.start,
+            'b_bits': coverage.bits,
+            'b_streak': streak,
+            'b_qualified': qualifies(status, streak, period),
+        })
+
+    if values:
+        connection.execute(
+            update(members).where(members.c.id == bindparam('b_id')).values(
+                coverage_start=bindparam('b_start'),
+                contribution_coverage=bindparam('b_bits'),
+                consecutive_months_paid=bindparam('b_streak'),
+                qualified_for_benefits=bindparam('b_qualified'),
+            ),
+            values
+        )
+
+
+def downgrade(connection):
+    connection.exec_driver_sql('ALTER TABLE members DROP COLUMN contribution_coverage')
+    connection.exec_driver_sql('ALTER TABLE members DROP COLUMN coverage_start')
@@ -5,11 +5,11 @@ from app.models.user import User
 from app.models.member import Member, NextOfKin
 from app.models.contribution import Contribution, Receipt
 from app.models.welfare import WelfareRequest, WelfarePayment
-from app.models.loan import Loan, LoanRepayment
+from app.models.loan import Loan, LoanRepayment, LoanInstalment, LoanGuarantor, LoanAgingSnapshot
 from app.models.meeting import Meeting, Attendance, Minutes, ActionItem
 from app.models.audit import AuditLog
 from app.models.notification import Notification
-from app.models.system import SystemSetting
+from app.models.system import SystemSetting, DataVersion
 
 __all__ = [
     'User',
@@ -21,11 +21,15 @@ __all__ = [
     'WelfarePayment',
     'Loan',
     'LoanRepayment',
+    'LoanInstalment',
+    'LoanGuarantor',
+    'LoanAgingSnapshot',
     'Meeting',
     'Attendance',
     'Minutes',
     'ActionItem',
     'AuditLog',
     'Notification',
-    'SystemSetting'
+    'SystemSetting',
+    'DataVersion'
 ]
@@ -3,6 +3,8 @@ Contribution and Receipt Models
 Tracks member contributions and generates receipts
 """
 from app import db
+from app.models.types import Money
+from app.utils.helpers import last_number_query
 from datetime import datetime
 from sqlalchemy import event, UniqueConstraint
 
@@ -13,10 +15,14 @@ class Contribution(db.Model):
     Tracks all member contributions (multiple contributions per month allowed)
     """
     __tablename__ = 'contributions'
+    __table_args__ = (
+        # Latest paid month per member (membership evaluation)
+        db.Index('ix_contributions_member_month', 'member_id', 'contribution_month'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
+    amount = db.Column(Money, nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
     contribution_month = db.Column(db.String(7), nullable=False)  # YYYY-MM
     payment_method = db.Column(db.String(20), nullable=False)  # Cash, MobileMoney, BankTransfer
@@ -48,7 +54,7 @@ class Receipt(db.Model):
     contribution_id = db.Column(db.Integer, db.ForeignKey('contributions.id'))
     receipt_type = db.Column(db.String(20), nullable=False)  # Contribution, MembershipFee, LoanRepayment
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
+    amount = db.Column(Money, nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
     payment_method = db.Column(db.String(20), nullable=False)
     transaction_reference = db.Column(db.String(50))
@@ -79,16 +85,7 @@ def generate_receipt_number(mapper, connection, target):
         prefix = f'OT-{year}-{month:02d}-'
 
         # Get the highest receipt number for this month
-        result = connection.execute(
-            db.select(db.func.max(Contribution.receipt_number)).where(
-                Contribution.receipt_number.like(f'{prefix}%')
-            )
-        ).scalar()
-
-        if result:
-            last_num = int(result.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        last_num = connection.execute(last_number_query(Contribution.receipt_number, prefix)).scalar()
+        new_num = (last_num or 0) + 1
 
         target.receipt_number = f'{prefix}{new_num:04d}'
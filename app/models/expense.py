@@ -3,6 +3,8 @@ Operational Expense Model
 Handles operational expenses like stationery, airtime, transport, etc.
 """
 from app import db
+from app.models.types import Money
+from app.utils.helpers import last_number_query
 from datetime import datetime
 
 
@@ -17,7 +19,7 @@ class Expense(db.Model):
     expense_number = db.Column(db.String(20), unique=True, nullable=False, index=True)
     expense_category = db.Column(db.String(50), nullable=False)  # Stationery, Airtime, Transport, Meetings, Other
     description = db.Column(db.Text, nullable=False)
-    amount = db.Column(db.Numeric(15, 2), nullable=False)
+    amount = db.Column(Money, nullable=False)
     expense_date = db.Column(db.Date, nullable=False, default=datetime.utcnow)
     payment_method = db.Column(db.String(50))  # Cash, Mobile Money, Bank Transfer
     reference_number = db.Column(db.String(100))  # Receipt/transaction reference
@@ -44,15 +46,7 @@ class Expense(db.Model):
         prefix = f"EXP{today.strftime('%Y%m')}"
 
         # Get the last expense number for this month
-        last_expense = Expense.query.filter(
-            Expense.expense_number.like(f"{prefix}%")
-        ).order_by(Expense.expense_number.desc()).first()
-
-        if last_expense:
-            # Extract the sequence number and increment
-            last_seq = int(last_expense.expense_number[-4:])
-            new_seq = last_seq + 1
-        else:
-            new_seq = 1
+        last_seq = db.session.execute(last_number_query(Expense.expense_number, prefix)).scalar()
+        new_seq = (last_seq or 0) + 1
 
         return f"{prefix}{new_seq:04d}"
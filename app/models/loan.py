@@ -3,7 +3,11 @@ Loan and Loan Repayment Models
 Handles loan applications, approvals, and repayments
 """
 from app import db
+from app.models.types import Money, to_money
 from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 
 
 class Loan(db.Model):
@@ -13,11 +17,14 @@ class Loan(db.Model):
     """
     __tablename__ = 'loans'
 
+    # Disbursed and not yet repaid: still owing, can take repayments and fall into arrears
+    OPEN_STATUSES = ('Active', 'Disbursed', 'Defaulted')
+
     id = db.Column(db.Integer, primary_key=True)
     loan_number = db.Column(db.String(20), unique=True, nullable=False)  # LN-YYYY-NNN
     member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
-    amount_requested = db.Column(db.Numeric(15, 2), nullable=False)
-    amount_approved = db.Column(db.Numeric(15, 2))
+    amount_requested = db.Column(Money, nullable=False)
+    amount_approved = db.Column(Money)
     purpose = db.Column(db.Text, nullable=False)
     repayment_period_months = db.Column(db.Integer, nullable=False)  # Max 2
     interest_rate = db.Column(db.Numeric(5, 2), nullable=False)  # 5.00%
@@ -25,7 +32,7 @@ class Loan(db.Model):
     # Security
     security_type = db.Column(db.String(20), nullable=False)  # Collateral, Guarantors
     collateral_description = db.Column(db.Text)
-    collateral_value = db.Column(db.Numeric(15, 2))
+    collateral_value = db.Column(Money)
     collateral_documents_path = db.Column(db.String(255))
     guarantor1_id = db.Column(db.Integer, db.ForeignKey('members.id'))
     guarantor2_id = db.Column(db.Integer, db.ForeignKey('members.id'))
@@ -53,13 +60,17 @@ class Loan(db.Model):
     disbursement_document_path = db.Column(db.String(255))  # Path to withdrawal slip/receipt
 
     # Repayment tracking
-    total_payable = db.Column(db.Numeric(15, 2))  # Principal + Interest
-    total_paid = db.Column(db.Numeric(15, 2), default=0.00)
-    balance = db.Column(db.Numeric(15, 2))
+    total_payable = db.Column(Money)  # Principal + Interest
+    total_paid = db.Column(Money, default=0)
+    balance = db.Column(Money)
     status = db.Column(db.String(30), default='Pending Guarantor Approval')  # Pending Guarantor Approval, Returned to Applicant, Pending Executive Approval, Approved, Rejected, Disbursed, Active, Completed, Defaulted
     default_date = db.Column(db.Date)
     recovery_notes = db.Column(db.Text)
 
+    # Set nightly by `flask age-loans`
+    days_past_due = db.Column(db.Integer, default=0)  # Days since the oldest unpaid instalment fell due
+    arrears_amount = db.Column(Money, default=0)  # Unpaid on instalments already due
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -70,6 +81,10 @@ class Loan(db.Model):
     secretary = db.relationship('User', foreign_keys=[approved_by_secretary])
     treasurer = db.relationship('User', foreign_keys=[approved_by_treasurer])
     repayments = db.relationship('LoanRepayment', backref='loan', lazy='dynamic')
+    instalments = db.relationship('LoanInstalment', backref='loan', lazy='dynamic',
+                                  order_by='LoanInstalment.instalment_number')
+    guarantors = db.relationship('LoanGuarantor', backref='loan', cascade='all, delete-orphan',
+                                 order_by='LoanGuarantor.slot')
 
     def __repr__(self):
         return f'<Loan {self.loan_number}>'
@@ -82,11 +97,11 @@ class Loan(db.Model):
         Example: UGX 300,000 at 5% monthly for 2 months = 300,000 + (300,000 × 0.05 × 2) = UGX 330,000
         """
         if self.amount_approved and self.interest_rate:
-            principal = float(self.amount_approved)
-            rate = float(self.interest_rate) / 100  # Convert percentage to decimal
+            principal = to_money(self.amount_approved)
+            rate = Decimal(str(self.interest_rate)) / 100  # Convert percentage to decimal
             months = self.repayment_period_months
-            # Calculate interest per month for total repayment period
-            total_interest = principal * rate * months
+            # Calculate interest per month for total repayment period (whole shillings)
+            total_interest = to_money(principal * rate * months)
             self.total_payable = principal + total_interest
             self.balance = self.total_payable
             return self.total_payable
@@ -110,6 +125,105 @@ class Loan(db.Model):
             return False  # Not applicable for collateral loans
         return (self.guarantor1_approved is None or self.guarantor2_approved is None) and not self.any_guarantor_rejected()
 
+    def sync_guarantors(self):
+        """Mirror the guarantor1/guarantor2 columns into loan_guarantors rows
+
+        Runs automatically before every flush that changes those columns,
+        so existing code that sets them keeps the new table current.
+        """
+        wanted = {}
+        for slot in (1, 2):
+            member_id = getattr(self, f'guarantor{slot}_id')
+            if member_id:
+                wanted[slot] = (
+                    member_id,
+                    LoanGuarantor.decision_for(getattr(self, f'guarantor{slot}_approved')),
+                    getattr(self, f'guarantor{slot}_approval_date'),
+                )
+
+        existing = {g.slot: g for g in self.guarantors}
+        for slot, guarantor in existing.items():
+            if slot not in wanted:
+                self.guarantors.remove(guarantor)
+        for slot, (member_id, decision, decided_at) in wanted.items():
+            guarantor = existing.get(slot)
+            if guarantor is None:
+                guarantor = LoanGuarantor(slot=slot)
+                self.guarantors.append(guarantor)
+            guarantor.member_id = member_id
+            guarantor.decision = decision
+            guarantor.decided_at = decided_at
+
+
+class LoanGuarantor(db.Model):
+    """
+    Loan Guarantor table
+    One row per guarantor per loan. Replaces the paired guarantor1_*/
+    guarantor2_* columns on loans, which are kept in sync during the
+    transition (see Loan.sync_guarantors)
+    """
+    __tablename__ = 'loan_guarantors'
+    __table_args__ = (
+        db.UniqueConstraint('loan_id', 'slot', name='uq_loan_guarantor_slot'),
+        # Pending requests and exposure per guarantor
+        db.Index('ix_loan_guarantors_member_decision', 'member_id', 'decision'),
+    )
+
+    DECISIONS = {None: 'Pending', True: 'Approved', False: 'Declined'}
+
+    id = db.Column(db.Integer, primary_key=True)
+    loan_id = db.Column(db.Integer, db.ForeignKey('loans.id'), nullable=False)
+    member_id = db.Column(db.Integer, db.ForeignKey('members.id'), nullable=False)
+    slot = db.Column(db.Integer, nullable=False)  # 1 or 2 (guarantor1 / guarantor2 on the loan)
+    decision = db.Column(db.String(10), nullable=False, default='Pending')  # Pending, Approved, Declined
+    decided_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<LoanGuarantor {self.loan_id}#{self.slot} member={self.member_id} {self.decision}>'
+
+    @staticmethod
+    def decision_for(approved):
+        """Decision for a guarantorN_approved value (None, True or False)"""
+        return LoanGuarantor.DECISIONS[approved]
+
+    @staticmethod
+    def pending_requests(member_id):
+        """Query of loans waiting for this member's decision as guarantor"""
+        return Loan.query.join(LoanGuarantor).filter(
+            LoanGuarantor.member_id == member_id,
+            LoanGuarantor.decision == 'Pending',
+            Loan.status.in_(['Pending Guarantor Approval', 'Returned to Applicant'])
+        )
+
+    @staticmethod
+    def exposure(member_id):
+        """Outstanding balance on open loans this member has agreed to guarantee
+
+        Returns:
+            int shillings
+        """
+        return int(db.session.query(db.func.coalesce(db.func.sum(Loan.balance), 0)).join(
+            LoanGuarantor, LoanGuarantor.loan_id == Loan.id
+        ).filter(
+            LoanGuarantor.member_id == member_id,
+            LoanGuarantor.decision == 'Approved',
+            Loan.status.in_(Loan.OPEN_STATUSES)
+        ).scalar())
+
+
+_GUARANTOR_COLUMNS = [f'guarantor{slot}_{name}' for slot in (1, 2) for name in ('id', 'approved', 'approval_date')]
+
+
+@event.listens_for(Session, 'before_flush')
+def sync_loan_guarantors(session, flush_context, instances):
+    """Keep loan_guarantors in step with the guarantor columns on loans"""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Loan):
+            continue
+        state = inspect(obj)
+        if state.pending or any(state.attrs[name].history.has_changes() for name in _GUARANTOR_COLUMNS):
+            obj.sync_guarantors()
+
 
 class LoanRepayment(db.Model):
     """
@@ -121,9 +235,9 @@ class LoanRepayment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     loan_id = db.Column(db.Integer, db.ForeignKey('loans.id'), nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
-    amount_paid = db.Column(db.Numeric(15, 2), nullable=False)
-    principal_portion = db.Column(db.Numeric(15, 2), nullable=False)
-    interest_portion = db.Column(db.Numeric(15, 2), nullable=False)
+    amount_paid = db.Column(Money, nullable=False)
+    principal_portion = db.Column(Money, nullable=False)
+    interest_portion = db.Column(Money, nullable=False)
     payment_method = db.Column(db.String(20), nullable=False)
     transaction_reference = db.Column(db.String(50))
     receipt_number = db.Column(db.String(20))
@@ -136,3 +250,77 @@ class LoanRepayment(db.Model):
 
     def __repr__(self):
         return f'<LoanRepayment {self.loan.loan_number} - {self.amount_paid}>'
+
+
+class LoanInstalment(db.Model):
+    """
+    Loan Instalment table
+    Amortization schedule written at disbursement; repayments are
+    allocated against it (oldest instalment first, interest before principal)
+    """
+    __tablename__ = 'loan_instalments'
+    __table_args__ = (
+        db.UniqueConstraint('loan_id', 'instalment_number', name='uq_loan_instalment_number'),
+        # Reminders, arrears and next-due lookups only look at unpaid rows
+        db.Index('ix_loan_instalments_unpaid_due', 'due_date', 'loan_id',
+                 sqlite_where=db.text('paid_date IS NULL'),
+                 postgresql_where=db.text('paid_date IS NULL')),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    loan_id = db.Column(db.Integer, db.ForeignKey('loans.id'), nullable=False)
+    instalment_number = db.Column(db.Integer, nullable=False)
+    due_date = db.Column(db.Date, nullable=False)
+    principal_due = db.Column(Money, nullable=False)
+    interest_due = db.Column(Money, nullable=False)
+    amount_due = db.Column(Money, nullable=False)
+    cumulative_due = db.Column(Money, nullable=False)  # Total due up to and including this instalment
+    principal_paid = db.Column(Money, nullable=False, default=0)
+    interest_paid = db.Column(Money, nullable=False, default=0)
+    paid_date = db.Column(db.Date)  # Set when the instalment is fully paid
+
+    def __repr__(self):
+        return f'<LoanInstalment {self.loan_id}#{self.instalment_number} {self.due_date}>'
+
+    @property
+    def amount_paid(self):
+        """Amount paid towards this instalment"""
+        return (self.principal_paid or 0) + (self.interest_paid or 0)
+
+    @property
+    def outstanding(self):
+        """Amount still due on this instalment"""
+        return self.amount_due - self.amount_paid
+
+    @property
+    def status(self):
+        """Paid, Partial or Pending"""
+        if self.paid_date:
+            return 'Paid'
+        return 'Partial' if self.amount_paid else 'Pending'
+
+
+class LoanAgingSnapshot(db.Model):
+    """
+    Loan Aging Snapshot table
+    One row per aging bucket per day, written by `flask age-loans`;
+    dashboards and reports read the latest day instead of recomputing
+    """
+    __tablename__ = 'loan_aging_snapshots'
+    __table_args__ = (
+        db.UniqueConstraint('snapshot_date', 'bucket', name='uq_loan_aging_snapshot_bucket'),
+    )
+
+    BUCKETS = ['Current', '1-30', '31-60', '61-90', '90+']
+
+    id = db.Column(db.Integer, primary_key=True)
+    snapshot_date = db.Column(db.Date, nullable=False, index=True)
+    bucket = db.Column(db.String(10), nullable=False)
+    loan_count = db.Column(db.Integer, nullable=False, default=0)
+    defaulted_count = db.Column(db.Integer, nullable=False, default=0)
+    outstanding = db.Column(Money, nullable=False, default=0)  # Sum of loan balances
+    arrears = db.Column(Money, nullable=False, default=0)  # Sum of overdue instalment amounts
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<LoanAgingSnapshot {self.snapshot_date} {self.bucket}: {self.loan_count}>'
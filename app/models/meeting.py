@@ -39,8 +39,8 @@ class Meeting(db.Model):
 
     def check_quorum(self):
         """Check if quorum is met (5 members per specification)"""
-        from flask import current_app
-        quorum_requirement = current_app.config.get('QUORUM_REQUIREMENT', 5)
+        from app.utils.settings import get_setting
+        quorum_requirement = get_setting('QUORUM_REQUIREMENT', 5)
         present_count = Attendance.query.filter_by(meeting_id=self.id, status='Present').count()
         self.total_attendance = present_count
         self.quorum_met = present_count >= quorum_requirement
@@ -3,6 +3,9 @@ Member and NextOfKin Models
 Core membership management
 """
 from app import db
+from app.models.types import Money, MonthBitmap
+from app.utils.helpers import last_number_query
+from app.utils.coverage import Coverage, qualifies
 from datetime import datetime
 from sqlalchemy import event
 
@@ -32,17 +35,20 @@ class Member(db.Model):
     membership_fee_date = db.Column(db.Date)
     membership_fee_receipt = db.Column(db.String(20))
     status = db.Column(db.String(20), default='Active')  # Active, Inactive, Suspended, Expelled, Deceased
-    total_contributed = db.Column(db.Numeric(15, 2), default=0.00)
+    total_contributed = db.Column(Money, default=0)
     consecutive_months_paid = db.Column(db.Integer, default=0)
     last_contribution_date = db.Column(db.Date)
     qualified_for_benefits = db.Column(db.Boolean, default=False)
+    coverage_start = db.Column(db.Integer)  # Month number (year * 12 + month - 1) of coverage bit 0
+    contribution_coverage = db.Column(MonthBitmap, default=0)  # Bit n set: month coverage_start + n is paid
 
     # Status tracking
     suspension_date = db.Column(db.Date)
     expulsion_date = db.Column(db.Date)
     expulsion_reason = db.Column(db.Text)
-    refund_amount = db.Column(db.Numeric(15, 2))
+    refund_amount = db.Column(Money)
     refund_paid = db.Column(db.Boolean, default=False)
+    months_missed = db.Column(db.Integer, default=0)  # Set by `flask evaluate-membership`
 
     # System fields
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -54,34 +60,50 @@ class Member(db.Model):
     contributions = db.relationship('Contribution', backref='member', lazy='dynamic')
     welfare_requests = db.relationship('WelfareRequest', backref='member', lazy='dynamic')
     loans = db.relationship('Loan', backref='member', lazy='dynamic', foreign_keys='Loan.member_id')
+    # Legacy per-column guarantor links; loan_guarantors rows (guarantees) are the indexed form
     loans_guaranteed1 = db.relationship('Loan', foreign_keys='Loan.guarantor1_id', lazy='dynamic')
     loans_guaranteed2 = db.relationship('Loan', foreign_keys='Loan.guarantor2_id', lazy='dynamic')
+    guarantees = db.relationship('LoanGuarantor', backref='member', lazy='dynamic')
 
     def __repr__(self):
         return f'<Member {self.member_number} - {self.full_name}>'
 
-    def update_contribution_stats(self):
-        """Update total contributed and consecutive months"""
+    def update_contribution_stats(self, as_of=None):
+        """Update total contributed, coverage and consecutive months"""
         from app.models.contribution import Contribution
         from sqlalchemy import func
 
         # Calculate total contributed
         total = db.session.query(func.sum(Contribution.amount)).filter_by(member_id=self.id).scalar()
-        self.total_contributed = total or 0.00
+        self.total_contributed = total or 0
 
         # Update last contribution date
         last_contribution = Contribution.query.filter_by(member_id=self.id).order_by(Contribution.payment_date.desc()).first()
         if last_contribution:
             self.last_contribution_date = last_contribution.payment_date
 
-        # Calculate consecutive months (simplified - full logic would check month gaps)
-        contribution_count = Contribution.query.filter_by(member_id=self.id).count()
-        self.consecutive_months_paid = contribution_count
+        # Rebuild the paid-months bitmask (edits and deletes can clear months too)
+        months = [row[0] for row in db.session.query(Contribution.contribution_month).filter_by(
+            member_id=self.id).distinct()]
+        self.coverage = Coverage.from_months(months, joined=self.date_joined)
 
-        # Update qualification status (5 consecutive months per specification)
-        from flask import current_app
-        qualification_period = current_app.config.get('QUALIFICATION_PERIOD', 5)
-        self.qualified_for_benefits = self.consecutive_months_paid >= qualification_period
+        # Consecutive months paid up to this month (or last month if this one is not paid yet)
+        self.consecutive_months_paid = self.coverage.streak(as_of)
+
+        # Update qualification status (Active, 5 consecutive months per specification)
+        from app.utils.settings import get_setting
+        qualification_period = get_setting('QUALIFICATION_PERIOD', 5)
+        self.qualified_for_benefits = qualifies(self.status, self.consecutive_months_paid, qualification_period)
+
+    @property
+    def coverage(self):
+        """Paid months as a Coverage bitmask"""
+        return Coverage(self.coverage_start, self.contribution_coverage)
+
+    @coverage.setter
+    def coverage(self, coverage):
+        self.coverage_start = coverage.start
+        self.contribution_coverage = coverage.bits
 
     def is_active(self):
         """Check if member is active"""
@@ -123,16 +145,8 @@ class NextOfKin(db.Model):
 def generate_member_number(mapper, connection, target):
     """Auto-generate member number if not provided"""
     if not target.member_number:
-        # Get the highest member number
-        result = connection.execute(
-            db.select(db.func.max(Member.member_number))
-        ).scalar()
-
-        if result:
-            # Extract number and increment
-            last_num = int(result.split('-')[1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        # Get the highest member number (compared as a number: 'OT-1000' > 'OT-999')
+        last_num = connection.execute(last_number_query(Member.member_number, 'OT-')).scalar()
+        new_num = (last_num or 0) + 1
 
         target.member_number = f'OT-{new_num:03d}'
@@ -4,6 +4,8 @@ Configurable system parameters and constants
 """
 from app import db
 from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 
 
 class SystemSetting(db.Model):
@@ -68,13 +70,15 @@ class SystemSetting(db.Model):
         self.updated_at = datetime.utcnow()
         db.session.commit()
 
+        # This worker sees the change at once; others at their next version check
+        from app.utils.settings import get_settings
+        get_settings().invalidate()
+
     @staticmethod
     def get_setting(key, default=None):
-        """Get setting value by key"""
-        setting = SystemSetting.query.filter_by(setting_key=key).first()
-        if setting:
-            return setting.get_value()
-        return default
+        """Get setting value by key (from the settings snapshot, then app.config)"""
+        from app.utils.settings import get_setting
+        return get_setting(key, default)
 
     @staticmethod
     def update_setting(key, value, user_id):
@@ -152,6 +156,30 @@ class SystemSetting(db.Model):
                 'description': 'Consecutive months required to qualify for benefits',
                 'is_editable': True
             },
+            {
+                'setting_key': 'SUSPENSION_THRESHOLD',
+                'setting_value': '3',
+                'setting_type': 'Integer',
+                'category': 'Membership',
+                'description': 'Consecutive months missed before suspension',
+                'is_editable': True
+            },
+            {
+                'setting_key': 'EXPULSION_THRESHOLD',
+                'setting_value': '6',
+                'setting_type': 'Integer',
+                'category': 'Membership',
+                'description': 'Consecutive months missed before expulsion',
+                'is_editable': True
+            },
+            {
+                'setting_key': 'EXPELLED_REFUND_PERCENTAGE',
+                'setting_value': '80',
+                'setting_type': 'Integer',
+                'category': 'Membership',
+                'description': 'Percentage of contributions refunded on expulsion',
+                'is_editable': True
+            },
             {
                 'setting_key': 'QUORUM_REQUIREMENT',
                 'setting_value': '5',
@@ -219,3 +247,120 @@ class SystemSetting(db.Model):
                 db.session.add(setting)
 
         db.session.commit()
+
+
+class DataVersion(db.Model):
+    """
+    Data Version table
+    Change counter per table, bumped in the same transaction as the change.
+    Used to key caches and validators that must be consistent across workers.
+    """
+    __tablename__ = 'data_versions'
+
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    # Versions over some columns only, for caches that read nothing else:
+    # name -> {table: columns}. Inserts, deletes, bulk and Core writes to
+    # the table bump them too.
+    COLUMN_VERSIONS = {
+        'member_directory': {
+            'members': {'member_number', 'full_name', 'status', 'qualified_for_benefits', 'phone_primary'},
+            'users': {'member_id'},
+        },
+    }
+
+    # Bookkeeping columns whose changes alone leave the table version as it
+    # is, so a login does not invalidate everything keyed on users
+    UNVERSIONED_COLUMNS = {
+        'users': {'last_login', 'failed_login_attempts', 'account_locked_until'},
+    }
+
+    def __repr__(self):
+        return f'<DataVersion {self.table_name}={self.version}>'
+
+    @staticmethod
+    def get_versions(*table_names):
+        """
+        Get current versions for the given tables in a single query
+
+        Returns:
+            dict: table name -> version (0 for tables never changed)
+        """
+        rows = db.session.query(DataVersion.table_name, DataVersion.version).filter(
+            DataVersion.table_name.in_(table_names)
+        ).all()
+        versions = dict.fromkeys(table_names, 0)
+        versions.update(dict(rows))
+        return versions
+
+    @staticmethod
+    def covering(table_names):
+        """Names of the column versions over any of the given tables"""
+        return [name for name, tables in DataVersion.COLUMN_VERSIONS.items() if tables.keys() & set(table_names)]
+
+    @staticmethod
+    def bump(connection, table_names):
+        """Increment versions for the given tables on an open connection"""
+        table = DataVersion.__table__
+        for name in table_names:
+            result = connection.execute(
+                table.update().where(table.c.table_name == name).values(version=table.c.version + 1)
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(table_name=name, version=1))
+
+    @staticmethod
+    def initialize_defaults():
+        """
+        Create a version row for every mapped table
+        Seeding up front avoids concurrent first inserts of the same key
+        """
+        existing = {row[0] for row in db.session.query(DataVersion.table_name).all()}
+        for name in [*db.metadata.tables, *DataVersion.COLUMN_VERSIONS]:
+            if name not in existing:
+                db.session.add(DataVersion(table_name=name, version=0))
+        db.session.commit()
+
+
+@event.listens_for(Session, 'after_flush')
+def bump_data_versions(session, flush_context):
+    """
+    Bump the version of every table written by this flush
+
+    Updates bump the column versions only when one of their columns
+    changed, and the table version unless only UNVERSIONED_COLUMNS did.
+    """
+    tables = set()
+    for obj in session.new | session.deleted:
+        tables.add(obj.__table__.name)
+        tables.update(DataVersion.covering([obj.__table__.name]))
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        name = obj.__table__.name
+        state = inspect(obj)
+        changed = {prop.key for prop in state.mapper.column_attrs if state.attrs[prop.key].history.has_changes()}
+        if not changed or changed - DataVersion.UNVERSIONED_COLUMNS.get(name, set()):
+            tables.add(name)
+        for version, columns in DataVersion.COLUMN_VERSIONS.items():
+            if changed & columns.get(name, set()):
+                tables.add(version)
+    tables.discard(DataVersion.__tablename__)
+
+    if tables:
+        DataVersion.bump(session.connection(), sorted(tables))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def bump_data_versions_bulk(orm_execute_state):
+    """Bump the version of tables changed by bulk query.update()/delete()"""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table.name == DataVersion.__tablename__:
+        return
+
+    name = mapper.local_table.name
+    DataVersion.bump(orm_execute_state.session.connection(), [name, *DataVersion.covering([name])])
@@ -0,0 +1,67 @@
+"""
+Column Types
+Custom SQLAlchemy types shared by the models
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from sqlalchemy import BigInteger, LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+def to_money(value):
+    """
+    Convert an amount to whole Uganda shillings
+
+    Accepts int, Decimal, float or numeric strings (form input); fractions
+    are rounded half up.
+
+    Raises:
+        ValueError: If the value is not a number
+    """
+    if isinstance(value, int):
+        return value
+    try:
+        amount = Decimal(str(value).strip().replace(',', ''))
+        return int(amount.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f'Invalid amount: {value!r}')
+
+
+class Money(TypeDecorator):
+    """
+    Amount in whole shillings, stored as an integer
+
+    Values come back as Python ints, so SUM() and other aggregates are
+    exact integer arithmetic in the database, on SQLite and PostgreSQL.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return to_money(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return int(value)
+
+
+class MonthBitmap(TypeDecorator):
+    """
+    Set of months as a Python int bitmask, stored as little-endian bytes
+
+    Bytes rather than BIGINT so the mask is not limited to 64 months.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return int.from_bytes(value, 'little')
@@ -77,5 +77,5 @@ class User(UserMixin, db.Model):
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID for Flask-Login"""
-    return User.query.get(int(user_id))
+    """Load user by ID for Flask-Login, with the member the navbar names"""
+    return db.session.get(User, int(user_id), options=[db.joinedload(User.member)])
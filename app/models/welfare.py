@@ -3,6 +3,7 @@ Welfare Request and Payment Models
 Handles bereavement, medical support, and celebrations
 """
 from app import db
+from app.models.types import Money
 from datetime import datetime
 
 
@@ -21,7 +22,7 @@ class WelfareRequest(db.Model):
     relationship = db.Column(db.String(50))  # Spouse, Child, Parent
     incident_date = db.Column(db.Date, nullable=False)
     description = db.Column(db.Text, nullable=False)
-    amount_requested = db.Column(db.Numeric(15, 2))
+    amount_requested = db.Column(Money)
     documents_path = db.Column(db.String(255))
 
     # Status and workflow
@@ -37,7 +38,7 @@ class WelfareRequest(db.Model):
     approved_by_chairman = db.Column(db.Integer, db.ForeignKey('users.id'))
     chairman_approval_date = db.Column(db.DateTime)
     chairman_notes = db.Column(db.Text)
-    amount_approved = db.Column(db.Numeric(15, 2))
+    amount_approved = db.Column(Money)
     rejection_reason = db.Column(db.Text)
     payment_voucher_number = db.Column(db.String(20))
 
@@ -63,7 +64,7 @@ class WelfarePayment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     welfare_request_id = db.Column(db.Integer, db.ForeignKey('welfare_requests.id'), nullable=False)
     payment_voucher_number = db.Column(db.String(20), unique=True, nullable=False)
-    amount_paid = db.Column(db.Numeric(15, 2), nullable=False)
+    amount_paid = db.Column(Money, nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
     payment_method = db.Column(db.String(50), nullable=False)
     withdrawal_reference = db.Column(db.String(50))  # Bank withdrawal reference
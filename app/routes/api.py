@@ -0,0 +1,468 @@
+"""
+Mobile API Routes
+Versioned read-only JSON API (/api/v1) for the mobile app: compact
+payloads with field selection, cursor pagination and ETags
+"""
+import base64
+import binascii
+from datetime import date, datetime, timedelta
+from functools import wraps
+from flask import Blueprint, jsonify, request, abort
+from flask_login import current_user
+from sqlalchemy import or_
+from sqlalchemy.orm import contains_eager
+from werkzeug.exceptions import HTTPException
+from app.models.member import Member
+from app.models.contribution import Contribution
+from app.models.loan import Loan, LoanGuarantor, LoanRepayment
+from app.models.welfare import WelfareRequest
+from app.models.notification import Notification
+from app.utils.conditional import conditional_page
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# A sync token never runs closer than this to the clock, so rows stamped
+# just before a sync but committed just after it are sent next time
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _iso(value):
+    """ISO 8601 string for a date or datetime (Flask would send RFC 822)"""
+    return value.isoformat() if value is not None else None
+
+
+# Field getters per resource, in output order. ?fields= picks a subset.
+CONTRIBUTION_FIELDS = {
+    'id': lambda c: c.id,
+    'member_id': lambda c: c.member_id,
+    'member_number': lambda c: c.member.member_number,
+    'amount': lambda c: c.amount,
+    'month': lambda c: c.contribution_month,
+    'payment_date': lambda c: _iso(c.payment_date),
+    'payment_method': lambda c: c.payment_method,
+    'receipt_number': lambda c: c.receipt_number,
+    'transaction_reference': lambda c: c.transaction_reference,
+}
+
+LOAN_FIELDS = {
+    'id': lambda l: l.id,
+    'loan_number': lambda l: l.loan_number,
+    'member_id': lambda l: l.member_id,
+    'member_number': lambda l: l.member.member_number,
+    'amount_requested': lambda l: l.amount_requested,
+    'amount_approved': lambda l: l.amount_approved,
+    'interest_rate': lambda l: str(l.interest_rate),
+    'repayment_period_months': lambda l: l.repayment_period_months,
+    'status': lambda l: l.status,
+    'disbursement_date': lambda l: _iso(l.disbursement_date),
+    'due_date': lambda l: _iso(l.due_date),
+    'total_payable': lambda l: l.total_payable,
+    'total_paid': lambda l: l.total_paid,
+    'balance': lambda l: l.balance,
+    'days_past_due': lambda l: l.days_past_due,
+    'arrears_amount': lambda l: l.arrears_amount,
+}
+
+NOTIFICATION_FIELDS = {
+    'id': lambda n: n.id,
+    'type': lambda n: n.notification_type,
+    'category': lambda n: n.category,
+    'title': lambda n: n.title,
+    'message': lambda n: n.message,
+    'link_url': lambda n: n.link_url,
+    'priority': lambda n: n.priority,
+    'is_read': lambda n: n.is_read,
+    'created_at': lambda n: _iso(n.created_at),
+}
+
+REPAYMENT_FIELDS = {
+    'id': lambda r: r.id,
+    'loan_id': lambda r: r.loan_id,
+    'payment_date': lambda r: _iso(r.payment_date),
+    'amount_paid': lambda r: r.amount_paid,
+    'principal_portion': lambda r: r.principal_portion,
+    'interest_portion': lambda r: r.interest_portion,
+    'receipt_number': lambda r: r.receipt_number,
+}
+
+WELFARE_FIELDS = {
+    'id': lambda w: w.id,
+    'request_number': lambda w: w.request_number,
+    'type': lambda w: w.request_type,
+    'status': lambda w: w.status,
+    'amount_requested': lambda w: w.amount_requested,
+    'amount_approved': lambda w: w.amount_approved,
+    'submitted_date': lambda w: _iso(w.submitted_date),
+}
+
+
+@api.errorhandler(HTTPException)
+def handle_http_error(e):
+    """JSON errors for API clients instead of the HTML error pages"""
+    return jsonify(error=e.description), e.code
+
+
+def api_login_required(f):
+    """
+    Require a logged-in user who has set their own password
+
+    Same session as the web app; answers 401/403 JSON instead of
+    redirecting to the login or password change pages.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            abort(401, 'Authentication required.')
+        if current_user.must_change_password:
+            abort(403, 'You must change your password before continuing.')
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def api_member_or_self_required(f):
+    """Own data, or Executive/SuperAdmin/Auditor (as member_or_self_required)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not (current_user.member_id == kwargs.get('member_id') or
+                current_user.is_executive() or
+                current_user.is_super_admin() or
+                current_user.is_auditor()):
+            abort(403, 'You do not have permission to access this resource.')
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _can_view_all():
+    """Auditor, Executive or Super Admin (as auditor_required)"""
+    return current_user.is_auditor() or current_user.is_executive() or current_user.is_super_admin()
+
+
+def _scope_to_member(query, model):
+    """
+    Limit a list query to the member the user may see
+
+    Members only ever get their own rows; other roles see everything and
+    can narrow it with ?member_id=.
+    """
+    if _can_view_all():
+        member_id = request.args.get('member_id', type=int)
+    else:
+        member_id = current_user.member_id
+    if member_id is not None:
+        query = query.filter(model.member_id == member_id)
+    return query
+
+
+def _selected_fields(getters):
+    """Field getters named in ?fields=a,b,c (all fields when absent)"""
+    names = request.args.get('fields')
+    if not names:
+        return getters
+    selected = {}
+    for name in names.split(','):
+        name = name.strip()
+        if name not in getters:
+            abort(400, f"Unknown field '{name}'. Available: {', '.join(getters)}.")
+        selected[name] = getters[name]
+    return selected
+
+
+def encode_cursor(value):
+    """Opaque cursor for the row after which the next page starts"""
+    return base64.urlsafe_b64encode(str(value).encode('ascii')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Row id from a cursor made by encode_cursor"""
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        abort(400, 'Invalid cursor.')
+
+
+def encode_sync_token(user_id, stamp):
+    """Opaque sync token: the user and the latest change they have seen"""
+    return encode_cursor(f'{user_id}:{stamp.isoformat()}')
+
+
+def decode_sync_token(token):
+    """
+    Change timestamp from a sync token
+
+    Returns:
+        datetime, or None when the token belongs to another user (the
+        client then gets a full sync)
+    """
+    try:
+        user_id, stamp = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('ascii').split(':', 1)
+        stamp = datetime.fromisoformat(stamp)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        abort(400, 'Invalid sync token.')
+    return stamp if user_id == str(current_user.id) else None
+
+
+def paginate(query, model, getters):
+    """
+    One page of a list query as {"data": [...], "next_cursor": ...}
+
+    Keyset pagination on the primary key, newest first: a page costs the
+    same however deep the client scrolls, and rows added while paging do
+    not shift later pages. next_cursor is null on the last page.
+
+    Query args:
+        limit: Rows per page (default 50, at most 200)
+        cursor: next_cursor from the previous page
+        fields: Comma-separated field names
+    """
+    getters = _selected_fields(getters)
+    limit = min(max(request.args.get('limit', DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    cursor = request.args.get('cursor')
+    if cursor:
+        query = query.filter(model.id < decode_cursor(cursor))
+
+    rows = query.order_by(model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return jsonify(
+        data=[{name: get(row) for name, get in getters.items()} for row in rows[:limit]],
+        next_cursor=next_cursor
+    )
+
+
+@api.route('/dashboard')
+@api_login_required
+@conditional_page('members', 'contributions', 'loans', 'loan_guarantors',
+                  'loan_aging_snapshots', 'welfare_requests', 'welfare_payments')
+def dashboard():
+    """Dashboard figures for the user's role"""
+    from app.routes.main import member_stats, action_stats, auditor_stats
+
+    unread = Notification.get_unread_count(current_user.id)
+    if current_user.is_super_admin() or current_user.is_executive():
+        stats = action_stats()
+        arrears = stats.pop('loan_arrears')
+        if arrears:
+            arrears['snapshot_date'] = _iso(arrears['snapshot_date'])
+        return jsonify(role='executive',
+                       **member_stats(date.today().strftime('%Y-%m')),
+                       **stats,
+                       loan_arrears=arrears,
+                       unread_notifications=unread)
+    if current_user.is_auditor():
+        return jsonify(role='auditor',
+                       **auditor_stats(date.today().year),
+                       unread_notifications=unread)
+
+    return jsonify(role='member', **_member_summary(current_user.member), unread_notifications=unread)
+
+
+def _member_summary(member):
+    """A member's own dashboard figures (member dashboard and sync)"""
+    active_loans = Loan.query.filter(
+        Loan.member_id == member.id,
+        Loan.status.in_(Loan.OPEN_STATUSES)
+    ).with_entities(Loan.balance).all()
+    return {
+        'member_id': member.id,
+        'member_number': member.member_number,
+        'full_name': member.full_name,
+        'status': member.status,
+        'total_contributed': member.total_contributed,
+        'consecutive_months': member.consecutive_months_paid,
+        'qualified': member.qualified_for_benefits,
+        'paid_this_month': member.coverage.is_paid(date.today().strftime('%Y-%m')),
+        'months_in_arrears': member.coverage.months_in_arrears(),
+        'active_loans': len(active_loans),
+        'loan_balance': sum(balance or 0 for (balance,) in active_loans),
+        'guarantor_requests': LoanGuarantor.pending_requests(member.id).count(),
+        'guarantee_exposure': LoanGuarantor.exposure(member.id),
+    }
+
+
+@api.route('/members/<int:member_id>/statement')
+@api_login_required
+@api_member_or_self_required
+@conditional_page('members', 'receipts', 'contributions', 'loans', 'welfare_requests')
+def member_statement(member_id):
+    """
+    Member statement for a period (default: this year to date)
+
+    Query args:
+        start_date, end_date: YYYY-MM-DD
+    """
+    from app.routes.reports import statement_data
+
+    member = Member.query.get_or_404(member_id)
+    try:
+        start_date = datetime.strptime(request.args.get('start_date', ''), '%Y-%m-%d').date() \
+            if request.args.get('start_date') else date(date.today().year, 1, 1)
+        end_date = datetime.strptime(request.args.get('end_date', ''), '%Y-%m-%d').date() \
+            if request.args.get('end_date') else date.today()
+    except ValueError:
+        abort(400, 'Dates must be YYYY-MM-DD.')
+
+    data = statement_data(member_id, start_date, end_date)
+    fee = data['membership_fee']
+    return jsonify(
+        member={
+            'id': member.id,
+            'member_number': member.member_number,
+            'full_name': member.full_name,
+            'status': member.status,
+        },
+        start_date=_iso(start_date),
+        end_date=_iso(end_date),
+        membership_fee={
+            'receipt_number': fee.receipt_number,
+            'amount': fee.amount,
+            'payment_date': _iso(fee.payment_date),
+        } if fee else None,
+        contributions=[
+            [c.contribution_month, _iso(c.payment_date), c.amount, c.receipt_number]
+            for c in data['contributions']
+        ],
+        contributions_total=data['contributions_total'],
+        loans=[
+            {name: LOAN_FIELDS[name](l) for name in ('loan_number', 'status', 'amount_approved', 'total_paid', 'balance')}
+            for l in data['loans']
+        ],
+        loans_total_borrowed=data['loans_total_borrowed'],
+        loans_total_repaid=data['loans_total_repaid'],
+        loans_balance=data['loans_balance'],
+        welfare=[
+            {'request_number': w.request_number, 'type': w.request_type, 'status': w.status,
+             'amount_approved': w.amount_approved}
+            for w in data['welfare_requests']
+        ],
+        welfare_total=data['welfare_total']
+    )
+
+
+@api.route('/contributions')
+@api_login_required
+@conditional_page('contributions', 'members')
+def contributions():
+    """
+    Contributions, newest first (members: their own)
+
+    Query args:
+        member_id: Filter by member (executives and auditors)
+        month: Filter by contribution month (YYYY-MM)
+    """
+    query = _scope_to_member(
+        Contribution.query.join(Member).options(contains_eager(Contribution.member)), Contribution
+    )
+    if request.args.get('month'):
+        query = query.filter(Contribution.contribution_month == request.args['month'])
+    return paginate(query, Contribution, CONTRIBUTION_FIELDS)
+
+
+@api.route('/loans')
+@api_login_required
+@conditional_page('loans', 'members')
+def loans():
+    """
+    Loans, newest first (members: their own)
+
+    Query args:
+        member_id: Filter by member (executives and auditors)
+        status: Filter by loan status
+    """
+    query = _scope_to_member(
+        Loan.query.join(Member, Loan.member_id == Member.id).options(contains_eager(Loan.member)), Loan
+    )
+    if request.args.get('status'):
+        query = query.filter(Loan.status == request.args['status'])
+    return paginate(query, Loan, LOAN_FIELDS)
+
+
+@api.route('/notifications')
+@api_login_required
+@conditional_page()
+def notifications():
+    """
+    The user's notifications, newest first
+
+    Query args:
+        unread: 1 for unread only
+    """
+    query = Notification.query.filter_by(user_id=current_user.id)
+    if request.args.get('unread') in ('1', 'true'):
+        query = query.filter_by(is_read=False)
+    return paginate(query, Notification, NOTIFICATION_FIELDS)
+
+
+# What /sync sends for each resource: the model, the columns stamped on
+# insert or change, and the fields of each row
+SYNC_RESOURCES = {
+    'contributions': (Contribution, ('created_at', 'updated_at'),
+                      ('id', 'month', 'payment_date', 'amount', 'payment_method', 'receipt_number'), CONTRIBUTION_FIELDS),
+    'loans': (Loan, ('created_at', 'updated_at'),
+              tuple(name for name in LOAN_FIELDS if name not in ('member_id', 'member_number')), LOAN_FIELDS),
+    'repayments': (LoanRepayment, ('created_at',), tuple(REPAYMENT_FIELDS), REPAYMENT_FIELDS),
+    'welfare': (WelfareRequest, ('created_at', 'updated_at'), tuple(WELFARE_FIELDS), WELFARE_FIELDS),
+    'notifications': (Notification, ('created_at', 'read_at'), tuple(NOTIFICATION_FIELDS), NOTIFICATION_FIELDS),
+}
+
+
+def _sync_query(resource, member_id):
+    """The current user's rows of a sync resource"""
+    if resource == 'repayments':
+        return LoanRepayment.query.join(Loan).filter(Loan.member_id == member_id)
+    if resource == 'notifications':
+        return Notification.query.filter_by(user_id=current_user.id)
+    model = SYNC_RESOURCES[resource][0]
+    return model.query.filter(model.member_id == member_id)
+
+
+@api.route('/sync')
+@api_login_required
+@conditional_page('members', 'contributions', 'loans', 'loan_repayments', 'loan_guarantors', 'welfare_requests')
+def sync():
+    """
+    The user's own rows changed since their last sync (offline member app)
+
+    Without a token (or with another user's token) every row is sent and
+    full is true, and the client replaces what it holds. Otherwise only
+    rows created or changed since the token are sent, and the client
+    merges them by id. The summary is always sent. Contributions are the
+    only synced rows that can be deleted, so contribution_ids lists the
+    ones that still exist.
+
+    The new token is the latest change the client has now seen (but no
+    later than SYNC_OVERLAP ago), so it stays the same while nothing
+    changes and the repeat request is answered 304 from its ETag.
+
+    Query args:
+        since: token from the previous sync
+    """
+    since = decode_sync_token(request.args['since']) if request.args.get('since') else None
+    member_id = current_user.member_id
+    cutoff = datetime.utcnow() - SYNC_OVERLAP
+    latest = since
+
+    payload = {}
+    for resource, (model, stamp_names, names, getters) in SYNC_RESOURCES.items():
+        stamps = [getattr(model, name) for name in stamp_names]
+        query = _sync_query(resource, member_id)
+        if since is not None:
+            query = query.filter(or_(*(stamp > since for stamp in stamps)))
+        rows = query.order_by(model.id).all()
+        for row in rows:
+            stamp = max((value for value in (getattr(row, name) for name in stamp_names) if value), default=None)
+            if stamp and (latest is None or stamp > latest):
+                latest = stamp
+        payload[resource] = [{name: getters[name](row) for name in names} for row in rows]
+
+    payload['contribution_ids'] = [
+        row_id for (row_id,) in _sync_query('contributions', member_id).with_entities(Contribution.id)
+    ]
+    return jsonify(
+        token=encode_sync_token(current_user.id, min(latest or cutoff, cutoff)),
+        full=since is None,
+        summary=dict(_member_summary(current_user.member),
+                     unread_notifications=Notification.get_unread_count(current_user.id)),
+        **payload
+    )
@@ -69,9 +69,9 @@ def login():
                 user.failed_login_attempts += 1
 
                 # Lock account after max attempts
-                from flask import current_app
-                max_attempts = current_app.config.get('MAX_LOGIN_ATTEMPTS', 5)
-                lock_duration = current_app.config.get('ACCOUNT_LOCK_DURATION', 30)
+                from app.utils.settings import get_setting
+                max_attempts = get_setting('MAX_LOGIN_ATTEMPTS', 5)
+                lock_duration = get_setting('ACCOUNT_LOCK_DURATION', 30)
 
                 if user.failed_login_attempts >= max_attempts:
                     user.account_locked_until = datetime.utcnow() + timedelta(minutes=lock_duration)
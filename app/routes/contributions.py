@@ -7,17 +7,12 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.member import Member
 from app.models.contribution import Contribution, Receipt
+from app.models.types import to_money
 from app.utils.decorators import executive_required
+from app.utils.read_routing import read_only
 from datetime import datetime, date
-from sqlalchemy import extract, func
-from decimal import Decimal
+from sqlalchemy import func
 import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
 
 contributions = Blueprint('contributions', __name__, url_prefix='/contributions')
 
@@ -116,7 +111,7 @@ def add_contribution():
 
         # Parse amount
         try:
-            amount = Decimal(request.form.get('amount', '0'))
+            amount = to_money(request.form.get('amount', '0'))
             if amount <= 0:
                 flash('Amount must be greater than zero!', 'danger')
                 return redirect(url_for('contributions.add_contribution'))
@@ -156,10 +151,8 @@ def add_contribution():
     # Get current month as default
     current_month = date.today().strftime('%Y-%m')
 
-    # Get all active members for dropdown
-    members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
-
-    return render_template('contributions/add.html', current_month=current_month, members=members)
+    # Member dropdown is filled client-side from the cached member directory
+    return render_template('contributions/add.html', current_month=current_month)
 
 
 @contributions.route('/<int:id>')
@@ -195,7 +188,7 @@ def edit_contribution(id):
 
         # Parse amount
         try:
-            amount = Decimal(request.form.get('amount', '0'))
+            amount = to_money(request.form.get('amount', '0'))
             if amount <= 0:
                 flash('Amount must be greater than zero!', 'danger')
                 return redirect(url_for('contributions.edit_contribution', id=id))
@@ -304,7 +297,7 @@ def batch_contributions():
 
             # Parse amount
             try:
-                amount = Decimal(amounts[i])
+                amount = to_money(amounts[i])
                 if amount <= 0:
                     errors.append(f'{member.member_number}: Invalid amount')
                     error_count += 1
@@ -355,18 +348,24 @@ def batch_contributions():
         return redirect(url_for('contributions.list_contributions', month=contribution_month))
 
     # GET request - show batch form
-    # Get all active members
-    members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
+    # Member rows are rendered client-side from the cached member directory
     current_month = date.today().strftime('%Y-%m')
 
-    return render_template('contributions/batch.html', members=members, current_month=current_month)
+    return render_template('contributions/batch.html', current_month=current_month)
 
 
 @contributions.route('/<int:id>/receipt')
 @login_required
 @executive_required
+@read_only()
 def generate_receipt(id):
     """Generate PDF receipt for a contribution"""
+    # reportlab is imported on first use (~100 ms at startup otherwise)
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from app.utils.pdf import receipt_styles
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
     contribution = Contribution.query.get_or_404(id)
 
     # Create PDF in memory
@@ -377,7 +376,7 @@ def generate_receipt(id):
     elements = []
 
     # Styles
-    styles = getSampleStyleSheet()
+    styles = receipt_styles()
     title_style = styles['Title']
     heading_style = styles['Heading2']
     normal_style = styles['Normal']
@@ -448,7 +447,7 @@ def contributions_summary():
         func.count(Contribution.id).label('count'),
         func.sum(Contribution.amount).label('total')
     ).filter(
-        extract('year', func.cast(Contribution.contribution_month + '-01', db.Date)) == year
+        Contribution.contribution_month.between(f'{year}-01', f'{year}-12')
     ).group_by(
         Contribution.contribution_month
     ).order_by(
@@ -463,7 +462,7 @@ def contributions_summary():
     ).join(
         Contribution, Member.id == Contribution.member_id
     ).filter(
-        extract('year', func.cast(Contribution.contribution_month + '-01', db.Date)) == year
+        Contribution.contribution_month.between(f'{year}-01', f'{year}-12')
     ).group_by(
         Member.id
     ).order_by(
@@ -476,7 +475,7 @@ def contributions_summary():
         func.count(Contribution.id).label('count'),
         func.sum(Contribution.amount).label('total')
     ).filter(
-        extract('year', func.cast(Contribution.contribution_month + '-01', db.Date)) == year
+        Contribution.contribution_month.between(f'{year}-01', f'{year}-12')
     ).group_by(
         Contribution.payment_method
     ).all()
@@ -486,7 +485,7 @@ def contributions_summary():
         func.count(Contribution.id),
         func.sum(Contribution.amount)
     ).filter(
-        extract('year', func.cast(Contribution.contribution_month + '-01', db.Date)) == year
+        Contribution.contribution_month.between(f'{year}-01', f'{year}-12')
     ).first()
 
     return render_template('contributions/summary.html',
@@ -7,9 +7,9 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.expense import Expense
 from app.models.audit import AuditLog
+from app.models.types import to_money
 from app.utils.decorators import executive_required
 from datetime import datetime, date
-from decimal import Decimal
 from sqlalchemy import func, extract
 from werkzeug.utils import secure_filename
 import os
@@ -43,7 +43,7 @@ def list_expenses():
     expenses_list = query.order_by(Expense.expense_date.desc()).all()
 
     # Calculate statistics
-    total_expenses = sum(e.amount for e in expenses_list)
+    total_expenses = query.with_entities(func.coalesce(func.sum(Expense.amount), 0)).scalar()
 
     # Group by category
     category_totals = db.session.query(
@@ -81,7 +81,7 @@ def record_expense():
             return redirect(url_for('expenses.record_expense'))
 
         try:
-            amount = Decimal(request.form.get('amount'))
+            amount = to_money(request.form.get('amount'))
             if amount <= 0:
                 flash('Amount must be greater than zero!', 'danger')
                 return redirect(url_for('expenses.record_expense'))
@@ -180,7 +180,7 @@ def edit_expense(id):
         expense.notes = request.form.get('notes')
 
         try:
-            expense.amount = Decimal(request.form.get('amount'))
+            expense.amount = to_money(request.form.get('amount'))
             if expense.amount <= 0:
                 flash('Amount must be greater than zero!', 'danger')
                 return redirect(url_for('expenses.edit_expense', id=id))
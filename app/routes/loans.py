@@ -7,7 +7,11 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.loan import Loan, LoanRepayment
 from app.models.member import Member
+from app.models.types import to_money
 from app.utils.decorators import executive_required
+from app.utils.amortization import create_schedule, allocate_repayment, arrears
+from app.utils.helpers import last_number_query
+from app.utils.settings import get_setting
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy import func, extract
@@ -36,11 +40,11 @@ def list_loans():
 
     # Calculate statistics
     total_disbursed = db.session.query(func.sum(Loan.amount_approved)).filter(
-        Loan.status.in_(['Disbursed', 'Active', 'Completed'])
+        Loan.status.in_([*Loan.OPEN_STATUSES, 'Completed'])
     ).scalar() or 0
 
     total_outstanding = db.session.query(func.sum(Loan.balance)).filter(
-        Loan.status == 'Active'
+        Loan.status.in_(Loan.OPEN_STATUSES)
     ).scalar() or 0
 
     active_loans_count = Loan.query.filter_by(status='Active').count()
@@ -80,7 +84,7 @@ def apply():
             return redirect(url_for('loans.view_loan', id=existing_loan.id))
 
         try:
-            amount_requested = Decimal(request.form.get('amount_requested'))
+            amount_requested = to_money(request.form.get('amount_requested'))
             if amount_requested <= 0:
                 flash('Loan amount must be greater than zero!', 'danger')
                 return redirect(url_for('loans.apply'))
@@ -125,7 +129,7 @@ def apply():
                 return redirect(url_for('loans.apply'))
 
             try:
-                collateral_value = Decimal(request.form.get('collateral_value', '0'))
+                collateral_value = to_money(request.form.get('collateral_value', '0'))
                 if collateral_value < amount_requested:
                     flash('Collateral value must be at least equal to the loan amount!', 'danger')
                     return redirect(url_for('loans.apply'))
@@ -162,17 +166,8 @@ def apply():
         year = today.year
         prefix = f'LN-{year}-'
 
-        result = db.session.execute(
-            db.select(func.max(Loan.loan_number)).where(
-                Loan.loan_number.like(f'{prefix}%')
-            )
-        ).scalar()
-
-        if result:
-            last_num = int(result.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        last_num = db.session.execute(last_number_query(Loan.loan_number, prefix)).scalar()
+        new_num = (last_num or 0) + 1
 
         loan_number = f'{prefix}{new_num:04d}'
 
@@ -183,7 +178,7 @@ def apply():
             amount_requested=amount_requested,
             purpose=request.form.get('purpose'),
             repayment_period_months=int(request.form.get('repayment_period_months', 2)),
-            interest_rate=Decimal(current_app.config.get('LOAN_INTEREST_RATE', '5.00')),
+            interest_rate=Decimal(str(get_setting('LOAN_INTEREST_RATE', '5.00'))),
             security_type=security_type,
             guarantor1_id=int(guarantor1_id) if guarantor1_id else None,
             guarantor2_id=int(guarantor2_id) if guarantor2_id else None,
@@ -216,19 +211,9 @@ def apply():
         return redirect(url_for('loans.view_loan', id=loan.id))
 
     # GET request - show application form
-    # For executive users, show all active members; for regular members, show only themselves
-    if current_user.is_executive() or current_user.is_super_admin():
-        members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
-        # Only qualified members can be guarantors
-        guarantors = Member.query.filter_by(status='Active', qualified_for_benefits=True).order_by(Member.member_number).all()
-    else:
-        members = [current_user.member] if hasattr(current_user, 'member') else []
-        # Only qualified members (excluding self) can be guarantors
-        guarantors = Member.query.filter_by(status='Active', qualified_for_benefits=True).filter(
-            Member.id != current_user.member.id
-        ).order_by(Member.member_number).all() if hasattr(current_user, 'member') else []
-
-    return render_template('loans/apply.html', members=members, guarantors=guarantors)
+    # Member and guarantor dropdowns are filled client-side from the cached member directory
+    # (executives pick any active member; only qualified members, excluding self, can be guarantors)
+    return render_template('loans/apply.html')
 
 
 @loans.route('/<int:id>')
@@ -259,7 +244,13 @@ def view_loan(id):
     from datetime import date
     today = date.today()
 
-    return render_template('loans/view.html', loan=loan, repayments=repayments, today=today)
+    # Instalment schedule (loans disbursed before schedules existed have none)
+    instalments = loan.instalments.all()
+    next_due = next((i for i in instalments if not i.paid_date), None)
+    arrears_amount = sum(i.outstanding for i in instalments if not i.paid_date and i.due_date < today)
+
+    return render_template('loans/view.html', loan=loan, repayments=repayments, today=today,
+                           instalments=instalments, next_due=next_due, arrears_amount=arrears_amount)
 
 
 @loans.route('/<int:id>/approve', methods=['POST'])
@@ -292,7 +283,7 @@ def approve_loan(id):
         return redirect(url_for('loans.view_loan', id=id))
 
     try:
-        loan.amount_approved = Decimal(amount_approved)
+        loan.amount_approved = to_money(amount_approved)
     except (ValueError, TypeError):
         flash('Invalid approved amount!', 'danger')
         return redirect(url_for('loans.view_loan', id=id))
@@ -388,9 +379,8 @@ def disburse_loan(id):
         loan.disbursed = True
         loan.status = 'Active'
 
-        # Calculate due date: disbursement_date + repayment_period_months
-        from dateutil.relativedelta import relativedelta
-        loan.due_date = disbursement_date + relativedelta(months=loan.repayment_period_months)
+        # Write the instalment schedule; due_date is the final instalment's
+        create_schedule(loan)
 
         db.session.commit()
 
@@ -407,13 +397,13 @@ def record_repayment(id):
     """Record loan repayment"""
     loan = Loan.query.get_or_404(id)
 
-    if loan.status not in ['Active', 'Disbursed']:
+    if loan.status not in Loan.OPEN_STATUSES:
         flash('Cannot record repayment for this loan!', 'warning')
         return redirect(url_for('loans.view_loan', id=id))
 
     if request.method == 'POST':
         try:
-            amount = Decimal(request.form.get('amount'))
+            amount = to_money(request.form.get('amount'))
             if amount <= 0:
                 flash('Repayment amount must be greater than zero!', 'danger')
                 return redirect(url_for('loans.record_repayment', id=id))
@@ -446,17 +436,8 @@ def record_repayment(id):
 
         receipt_number = f'{prefix}{new_num:04d}'
 
-        # Calculate principal and interest portions
-        # Simple calculation: proportional split
-        total_payable = float(loan.total_payable)
-        principal = float(loan.amount_approved)
-        interest_total = total_payable - principal
-
-        principal_ratio = principal / total_payable
-        interest_ratio = interest_total / total_payable
-
-        principal_portion = amount * Decimal(str(principal_ratio))
-        interest_portion = amount * Decimal(str(interest_ratio))
+        # Allocate against the schedule: oldest instalment first, interest before principal
+        principal_portion, interest_portion = allocate_repayment(loan, amount, payment_date)
 
         # Create repayment record
         repayment = LoanRepayment(
@@ -480,6 +461,12 @@ def record_repayment(id):
 
         if loan.balance <= 0:
             loan.status = 'Completed'
+        elif loan.status == 'Defaulted' and arrears(loan, max(payment_date, date.today())) == 0:
+            # Caught up on every overdue instalment: back in good standing
+            # (default_date stays as the record of the default)
+            loan.status = 'Active'
+            loan.days_past_due = 0
+            loan.arrears_amount = 0
 
         db.session.commit()
 
@@ -510,7 +497,7 @@ def approve_as_guarantor(id):
 
     # Check if guarantor is qualified for benefits
     if not current_user.member.is_qualified():
-        qualification_period = current_app.config.get('QUALIFICATION_PERIOD', 5)
+        qualification_period = get_setting('QUALIFICATION_PERIOD', 5)
         flash(f'You must be qualified to act as a guarantor! Please complete {qualification_period} consecutive months of contributions first.', 'danger')
         return redirect(url_for('loans.view_loan', id=id))
 
@@ -584,7 +571,7 @@ def decline_as_guarantor(id):
 
     # Check if guarantor is qualified for benefits
     if not current_user.member.is_qualified():
-        qualification_period = current_app.config.get('QUALIFICATION_PERIOD', 5)
+        qualification_period = get_setting('QUALIFICATION_PERIOD', 5)
         flash(f'You must be qualified to act as a guarantor! Please complete {qualification_period} consecutive months of contributions first.', 'danger')
         return redirect(url_for('loans.view_loan', id=id))
 
@@ -673,7 +660,7 @@ def edit_loan(id):
             return redirect(url_for('loans.edit_loan', id=id))
 
         # Update loan details
-        loan.amount_requested = Decimal(amount_requested)
+        loan.amount_requested = to_money(amount_requested)
         loan.purpose = purpose
         loan.repayment_period_months = int(repayment_period)
         loan.security_type = security_type
@@ -721,7 +708,7 @@ def edit_loan(id):
 
             # Update collateral
             loan.collateral_description = collateral_description
-            loan.collateral_value = Decimal(collateral_value)
+            loan.collateral_value = to_money(collateral_value)
 
             # Reset guarantor fields
             loan.guarantor1_id = None
@@ -765,12 +752,9 @@ def edit_loan(id):
         return redirect(url_for('loans.view_loan', id=id))
 
     # GET request - show edit form
-    # Get only qualified members for guarantor selection (excluding the applicant)
-    members = Member.query.filter_by(status='Active', qualified_for_benefits=True).filter(
-        Member.id != loan.member_id
-    ).order_by(Member.member_number).all()
-
-    return render_template('loans/edit.html', loan=loan, members=members)
+    # Guarantor dropdowns (qualified members, excluding the applicant) are filled
+    # client-side from the cached member directory
+    return render_template('loans/edit.html', loan=loan)
 
 
 @loans.route('/<int:id>/cancel', methods=['POST'])
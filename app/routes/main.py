@@ -2,12 +2,13 @@
 Main Routes
 Dashboard and home page routes
 """
-from flask import Blueprint, render_template, redirect, url_for, request, abort
+import os
+from flask import Blueprint, render_template, redirect, url_for, request, abort, current_app, send_from_directory
 from flask_login import login_required, current_user
 from app import db
 from app.models.member import Member
 from app.models.contribution import Contribution
-from app.models.loan import Loan
+from app.models.loan import Loan, LoanGuarantor
 from app.models.welfare import WelfareRequest
 from app.models.meeting import Meeting
 from app.models.notification import Notification
@@ -26,6 +27,26 @@ def index():
     return redirect(url_for('auth.login'))
 
 
+@main.route('/app/')
+def member_app():
+    """
+    Offline member app shell
+
+    The same HTML for everyone (no login needed to load it), so the
+    service worker can cache it. Member data comes from /api/v1/sync.
+    """
+    return render_template('dashboard/member_app.html')
+
+
+@main.route('/sw.js')
+def service_worker():
+    """Member app service worker, served from the root so it may control /app/"""
+    response = send_from_directory(os.path.join(current_app.static_folder, 'js'), 'sw.js',
+                                   mimetype='text/javascript', max_age=0)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
 @main.route('/dashboard')
 @login_required
 @password_change_required
@@ -39,33 +60,44 @@ def dashboard():
         return member_dashboard()
 
 
-def executive_dashboard():
-    """Dashboard for Executive and Super Admin users"""
-    # Summary statistics
-    total_members = Member.query.filter_by(status='Active').count()
-    active_members = Member.query.filter(
-        Member.status == 'Active',
-        Member.qualified_for_benefits == True
-    ).count()
-
-    # Current month contributions
-    current_month = date.today().strftime('%Y-%m')
-    month_contributions = Contribution.query.filter_by(contribution_month=current_month).count()
+def member_stats(current_month):
+    """
+    Member and contribution figures for the executive dashboard cards
 
-    # Total contributed this month
+    Called from the template inside a {% cache %} fragment, so the
+    queries only run when the fragment is rebuilt.
+    """
     from sqlalchemy import func
-    month_total = db.session.query(func.sum(Contribution.amount)).filter_by(
-        contribution_month=current_month
-    ).scalar() or 0
 
-    # Pending welfare requests
-    pending_welfare = WelfareRequest.query.filter_by(status='Submitted').count()
+    return {
+        'total_members': Member.query.filter_by(status='Active').count(),
+        'active_members': Member.query.filter(
+            Member.status == 'Active',
+            Member.qualified_for_benefits == True
+        ).count(),
+        'month_contributions': Contribution.query.filter_by(contribution_month=current_month).count(),
+        'month_total': db.session.query(func.sum(Contribution.amount)).filter_by(
+            contribution_month=current_month
+        ).scalar() or 0,
+    }
+
 
-    # Pending loan applications
-    pending_loans = Loan.query.filter_by(status='Pending').count()
+def action_stats():
+    """Pending work and loans in arrears for the executive dashboard (cached fragment)"""
+    from app.utils.loan_aging import arrears_summary
 
-    # Active loans
-    active_loans = Loan.query.filter(Loan.status.in_(['Disbursed', 'Repaying'])).count()
+    return {
+        'pending_welfare': WelfareRequest.query.filter_by(status='Submitted').count(),
+        'pending_loans': Loan.query.filter_by(status='Pending').count(),
+        'active_loans': Loan.query.filter(Loan.status.in_(['Disbursed', 'Repaying'])).count(),
+        # From the nightly aging snapshot
+        'loan_arrears': arrears_summary(),
+    }
+
+
+def executive_dashboard():
+    """Dashboard for Executive and Super Admin users"""
+    current_month = date.today().strftime('%Y-%m')
 
     # Upcoming meetings
     upcoming_meetings = Meeting.query.filter(
@@ -81,57 +113,57 @@ def executive_dashboard():
     # Unread notifications
     unread_notifications = Notification.get_unread_count(current_user.id)
 
+    # Statistics cards and action counts are computed inside cached fragments
     return render_template('dashboard/executive.html',
-                         total_members=total_members,
-                         active_members=active_members,
-                         month_contributions=month_contributions,
-                         month_total=month_total,
-                         pending_welfare=pending_welfare,
-                         pending_loans=pending_loans,
-                         active_loans=active_loans,
+                         current_month=current_month,
+                         member_stats=member_stats,
+                         action_stats=action_stats,
                          upcoming_meetings=upcoming_meetings,
                          recent_contributions=recent_contributions,
                          unread_notifications=unread_notifications)
 
 
-def auditor_dashboard():
-    """Dashboard for Auditor users"""
-    # Summary statistics (read-only view)
-    total_members = Member.query.count()
-    active_members = Member.query.filter_by(status='Active').count()
+def auditor_stats(current_year):
+    """
+    Member counts and this year's money in and out, for the auditor dashboard
 
-    # Financial summary
-    from sqlalchemy import func, extract
-    current_year = date.today().year
+    Returns:
+        Dict with total_members, active_members, year_contributions,
+        year_welfare and year_loans
+    """
+    from app.models.welfare import WelfarePayment
 
-    # Total contributions this year
-    year_contributions = db.session.query(func.sum(Contribution.amount)).filter(
-        extract('year', Contribution.payment_date) == current_year
-    ).scalar() or 0
+    return {
+        'total_members': Member.query.count(),
+        'active_members': Member.query.filter_by(status='Active').count(),
+        # Total contributions this year
+        'year_contributions': db.session.query(func.sum(Contribution.amount)).filter(
+            extract('year', Contribution.payment_date) == current_year
+        ).scalar() or 0,
+        # Total welfare paid this year
+        'year_welfare': db.session.query(func.sum(WelfarePayment.amount_paid)).filter(
+            extract('year', WelfarePayment.payment_date) == current_year
+        ).scalar() or 0,
+        # Total loans disbursed this year
+        'year_loans': db.session.query(func.sum(Loan.amount_approved)).filter(
+            extract('year', Loan.disbursement_date) == current_year,
+            Loan.disbursed == True
+        ).scalar() or 0,
+    }
 
-    # Total welfare paid this year
-    from app.models.welfare import WelfarePayment
-    year_welfare = db.session.query(func.sum(WelfarePayment.amount_paid)).filter(
-        extract('year', WelfarePayment.payment_date) == current_year
-    ).scalar() or 0
 
-    # Total loans disbursed this year
-    year_loans = db.session.query(func.sum(Loan.amount_approved)).filter(
-        extract('year', Loan.disbursement_date) == current_year,
-        Loan.disbursed == True
-    ).scalar() or 0
+def auditor_dashboard():
+    """Dashboard for Auditor users"""
+    # Summary statistics (read-only view)
+    stats = auditor_stats(date.today().year)
 
     # Recent audit logs
     from app.models.audit import AuditLog
     recent_logs = AuditLog.query.order_by(AuditLog.timestamp.desc()).limit(10).all()
 
     return render_template('dashboard/auditor.html',
-                         total_members=total_members,
-                         active_members=active_members,
-                         year_contributions=year_contributions,
-                         year_welfare=year_welfare,
-                         year_loans=year_loans,
-                         recent_logs=recent_logs)
+                         recent_logs=recent_logs,
+                         **stats)
 
 
 def member_dashboard():
@@ -161,14 +193,9 @@ def member_dashboard():
         Loan.status.in_(['Pending Guarantor Approval', 'Returned to Applicant', 'Pending Executive Approval', 'Approved', 'Active', 'Disbursed'])
     ).order_by(Loan.created_at.desc()).all()
 
-    # Loans where member is a guarantor and approval is pending
-    guarantor_requests = Loan.query.filter(
-        db.or_(
-            db.and_(Loan.guarantor1_id == member.id, Loan.guarantor1_approved == None),
-            db.and_(Loan.guarantor2_id == member.id, Loan.guarantor2_approved == None)
-        ),
-        Loan.status.in_(['Pending Guarantor Approval', 'Returned to Applicant'])
-    ).order_by(Loan.created_at.desc()).all()
+    # Loans where member is a guarantor and approval is pending (indexed on loan_guarantors)
+    guarantor_requests = LoanGuarantor.pending_requests(member.id).order_by(Loan.created_at.desc()).all()
+    guarantee_exposure = LoanGuarantor.exposure(member.id)
 
     # All welfare requests (including pending for tracking)
     welfare_requests = WelfareRequest.query.filter_by(
@@ -194,6 +221,7 @@ def member_dashboard():
                          recent_contributions=recent_contributions,
                          active_loans=active_loans,
                          guarantor_requests=guarantor_requests,
+                         guarantee_exposure=guarantee_exposure,
                          welfare_requests=welfare_requests,
                          upcoming_meetings=upcoming_meetings,
                          unread_notifications=unread_notifications)
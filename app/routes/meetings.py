@@ -160,16 +160,18 @@ def record_attendance(id):
         return redirect(url_for('meetings.view_meeting', id=id))
 
     # GET request - show attendance form
-    members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
+    # Member rows are rendered client-side from the cached member directory
 
     # Get existing attendance
     existing_attendance = {}
     for att in Attendance.query.filter_by(meeting_id=id).all():
-        existing_attendance[att.member_id] = att
+        existing_attendance[att.member_id] = {
+            'status': att.status,
+            'arrival_time': att.arrival_time.strftime('%H:%M') if att.arrival_time else None
+        }
 
     return render_template('meetings/attendance.html',
                          meeting=meeting,
-                         members=members,
                          existing_attendance=existing_attendance)
 
 
@@ -2,7 +2,7 @@
 Member Management Routes
 Handles member CRUD operations and next of kin management
 """
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, Response
 from flask_login import login_required, current_user
 from app import db
 from app.models.member import Member, NextOfKin
@@ -52,6 +52,24 @@ def list_members():
                          search=search)
 
 
+@members.route('/directory.json')
+@login_required
+def directory():
+    """
+    Compact member directory for client-side member pickers
+    Cached per data version and validated with an ETag. Users who are not
+    executives only get Active members' numbers, names and qualification.
+    """
+    from app.utils.member_directory import get_member_directory
+
+    etag, body = get_member_directory(full=current_user.is_executive() or current_user.is_super_admin())
+
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+
 @members.route('/<int:id>')
 @login_required
 @member_or_self_required
@@ -83,7 +101,8 @@ def view_member(id):
                          user_account=user_account,
                          next_of_kin=next_of_kin,
                          contributions=contributions,
-                         active_loans=active_loans)
+                         active_loans=active_loans,
+                         current_month=date.today().strftime('%Y-%m'))
 
 
 @members.route('/add', methods=['GET', 'POST'])
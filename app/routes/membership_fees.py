@@ -2,14 +2,16 @@
 Membership Fees Management Routes
 Handles one-time membership fee payments of UGX 20,000
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, abort
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models.member import Member
 from app.models.contribution import Receipt
 from app.utils.decorators import executive_required
+from app.utils.helpers import last_number_query
+from app.utils.read_routing import read_only
+from app.utils.settings import get_setting
 from datetime import datetime, date
-from decimal import Decimal
 
 membership_fees = Blueprint('membership_fees', __name__, url_prefix='/membership-fees')
 
@@ -63,7 +65,7 @@ def list_members():
                          total_collected=total_collected,
                          status_filter=status_filter,
                          search=search,
-                         membership_fee=current_app.config['MEMBERSHIP_FEE'])
+                         membership_fee=get_setting('MEMBERSHIP_FEE'))
 
 
 @membership_fees.route('/record/<int:member_id>', methods=['GET', 'POST'])
@@ -98,7 +100,7 @@ def record_payment(member_id):
             return redirect(url_for('membership_fees.record_payment', member_id=member_id))
 
         # Get membership fee amount
-        membership_fee = current_app.config['MEMBERSHIP_FEE']
+        membership_fee = get_setting('MEMBERSHIP_FEE')
 
         # Generate receipt number
         today = date.today()
@@ -107,17 +109,8 @@ def record_payment(member_id):
         prefix = f'MF-{year}-{month:02d}-'
 
         # Get the highest receipt number for this month
-        result = db.session.execute(
-            db.select(db.func.max(Receipt.receipt_number)).where(
-                Receipt.receipt_number.like(f'{prefix}%')
-            )
-        ).scalar()
-
-        if result:
-            last_num = int(result.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        last_num = db.session.execute(last_number_query(Receipt.receipt_number, prefix)).scalar()
+        new_num = (last_num or 0) + 1
 
         receipt_number = f'{prefix}{new_num:04d}'
 
@@ -148,7 +141,7 @@ def record_payment(member_id):
     # GET request - show form
     return render_template('membership_fees/record.html',
                          member=member,
-                         membership_fee=current_app.config['MEMBERSHIP_FEE'])
+                         membership_fee=get_setting('MEMBERSHIP_FEE'))
 
 
 @membership_fees.route('/edit/<string:receipt_number>', methods=['GET', 'POST'])
@@ -190,7 +183,7 @@ def edit_payment(receipt_number):
     return render_template('membership_fees/edit.html',
                          receipt=receipt,
                          member=member,
-                         membership_fee=current_app.config['MEMBERSHIP_FEE'])
+                         membership_fee=get_setting('MEMBERSHIP_FEE'))
 
 
 @membership_fees.route('/receipt/<string:receipt_number>')
@@ -211,6 +204,7 @@ def view_receipt(receipt_number):
 @membership_fees.route('/receipt/<string:receipt_number>/download')
 @login_required
 @executive_required
+@read_only()
 def download_receipt(receipt_number):
     """Generate and download PDF receipt"""
     from flask import send_file
@@ -218,7 +212,7 @@ def download_receipt(receipt_number):
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.units import inch
     from reportlab.pdfgen import canvas
-    from reportlab.lib.styles import getSampleStyleSheet
+    from app.utils.pdf import receipt_styles
     from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
     from reportlab.lib import colors
 
@@ -236,7 +230,7 @@ def download_receipt(receipt_number):
     elements = []
 
     # Styles
-    styles = getSampleStyleSheet()
+    styles = receipt_styles()
     title_style = styles['Title']
     heading_style = styles['Heading2']
     normal_style = styles['Normal']
@@ -307,4 +301,4 @@ def unpaid_members():
 
     return render_template('membership_fees/unpaid.html',
                          members=members_paginated,
-                         membership_fee=current_app.config['MEMBERSHIP_FEE'])
+                         membership_fee=get_setting('MEMBERSHIP_FEE'))
@@ -0,0 +1,58 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint and SuperAdmin performance page
+"""
+import hmac
+from datetime import datetime
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, abort, Response
+from flask_login import login_required, current_user
+from app.utils.decorators import super_admin_required
+from app.utils.metrics import BUCKETS
+
+metrics = Blueprint('metrics', __name__)
+
+
+def _has_scrape_token():
+    """Check Authorization: Bearer <METRICS_TOKEN> for Prometheus scrapers"""
+    token = current_app.config.get('METRICS_TOKEN')
+    auth_header = request.headers.get('Authorization', '')
+    if not token or not auth_header.startswith('Bearer '):
+        return False
+    return hmac.compare_digest(auth_header[7:].strip(), token)
+
+
+@metrics.route('/metrics')
+def prometheus():
+    """Prometheus text format (SuperAdmin session or scrape token)"""
+    if not _has_scrape_token():
+        if not current_user.is_authenticated or not current_user.is_super_admin():
+            abort(403)
+
+    body = current_app.extensions['metrics'].render_prometheus()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+@metrics.route('/admin/metrics')
+@login_required
+@super_admin_required
+def dashboard():
+    """Per-endpoint latency breakdown"""
+    registry = current_app.extensions['metrics']
+    endpoints, outbound = registry.snapshot()
+
+    return render_template('metrics/dashboard.html',
+                         endpoints=endpoints,
+                         outbound=outbound,
+                         buckets=BUCKETS,
+                         started_at=datetime.fromtimestamp(registry.started_at),
+                         metrics_enabled=current_app.config['METRICS_ENABLED'])
+
+
+@metrics.route('/admin/metrics/reset', methods=['POST'])
+@login_required
+@super_admin_required
+def reset():
+    """Clear counters in this worker"""
+    current_app.extensions['metrics'].reset()
+    flash('Metrics counters have been reset.', 'success')
+    return redirect(url_for('metrics.dashboard'))
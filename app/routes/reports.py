@@ -12,9 +12,11 @@ from app.models.welfare import WelfareRequest, WelfarePayment
 from app.models.meeting import Meeting, Attendance
 from app.models.expense import Expense
 from app.utils.decorators import executive_required
+from app.utils.loan_aging import aging_snapshot
+from app.utils.settings import get_setting
+from app.utils.conditional import conditional_page
 from datetime import datetime, date
-from sqlalchemy import func, extract, and_, or_
-from decimal import Decimal
+from sqlalchemy import func, extract, and_, or_, case
 
 reports = Blueprint('reports', __name__, url_prefix='/reports')
 
@@ -28,6 +30,7 @@ def reports_index():
 
 @reports.route('/financial-summary')
 @login_required
+@conditional_page('contributions', 'receipts', 'loans', 'loan_repayments', 'welfare_requests', 'welfare_payments', 'expenses')
 def financial_summary():
     """Financial summary report - accessible to Executives and Members"""
     # Get date filters
@@ -141,6 +144,7 @@ def financial_summary():
 
 @reports.route('/member-statement/<int:member_id>')
 @login_required
+@conditional_page('members', 'receipts', 'contributions', 'loans', 'welfare_requests')
 def member_statement(member_id):
     """Individual member statement"""
     member = Member.query.get_or_404(member_id)
@@ -165,6 +169,27 @@ def member_statement(member_id):
     else:
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
 
+    return render_template('reports/member_statement.html',
+                         member=member,
+                         start_date=start_date,
+                         end_date=end_date,
+                         **statement_data(member_id, start_date, end_date))
+
+
+def statement_data(member_id, start_date, end_date):
+    """
+    Figures for a member statement (also served by the JSON API)
+
+    Args:
+        member_id: Member id
+        start_date: First payment date included
+        end_date: Last payment date included
+
+    Returns:
+        Dict with membership_fee, contributions, contributions_total, loans,
+        loans_total_borrowed, loans_total_repaid, loans_balance,
+        welfare_requests and welfare_total
+    """
     # Membership Fee (from Receipt table)
     membership_fee = Receipt.query.filter_by(
         member_id=member_id,
@@ -180,35 +205,43 @@ def member_statement(member_id):
         )
     ).order_by(Contribution.payment_date.desc()).all()
 
-    contributions_total = sum(c.amount for c in contributions)
+    contributions_total = db.session.query(func.coalesce(func.sum(Contribution.amount), 0)).filter(
+        Contribution.member_id == member_id,
+        Contribution.payment_date >= start_date,
+        Contribution.payment_date <= end_date
+    ).scalar()
 
     # Loans
     loans = Loan.query.filter_by(member_id=member_id).all()
-    loans_total_borrowed = sum(l.amount_approved for l in loans if l.amount_approved)
-    loans_total_repaid = sum(l.total_paid for l in loans)
-    loans_balance = sum(l.balance for l in loans if l.status == 'Active')
+    loans_total_borrowed, loans_total_repaid, loans_balance = db.session.query(
+        func.coalesce(func.sum(Loan.amount_approved), 0),
+        func.coalesce(func.sum(Loan.total_paid), 0),
+        func.coalesce(func.sum(case((Loan.status.in_(Loan.OPEN_STATUSES), Loan.balance), else_=0)), 0)
+    ).filter(Loan.member_id == member_id).one()
 
     # Welfare
     welfare_requests = WelfareRequest.query.filter_by(member_id=member_id).all()
-    welfare_total = sum(w.amount_approved or 0 for w in welfare_requests if w.status == 'Approved')
-
-    return render_template('reports/member_statement.html',
-                         member=member,
-                         start_date=start_date,
-                         end_date=end_date,
-                         membership_fee=membership_fee,
-                         contributions=contributions,
-                         contributions_total=contributions_total,
-                         loans=loans,
-                         loans_total_borrowed=loans_total_borrowed,
-                         loans_total_repaid=loans_total_repaid,
-                         loans_balance=loans_balance,
-                         welfare_requests=welfare_requests,
-                         welfare_total=welfare_total)
+    welfare_total = db.session.query(func.coalesce(func.sum(WelfareRequest.amount_approved), 0)).filter(
+        WelfareRequest.member_id == member_id,
+        WelfareRequest.status == 'Approved'
+    ).scalar()
+
+    return {
+        'membership_fee': membership_fee,
+        'contributions': contributions,
+        'contributions_total': contributions_total,
+        'loans': loans,
+        'loans_total_borrowed': loans_total_borrowed,
+        'loans_total_repaid': loans_total_repaid,
+        'loans_balance': loans_balance,
+        'welfare_requests': welfare_requests,
+        'welfare_total': welfare_total,
+    }
 
 
 @reports.route('/contributions')
 @login_required
+@conditional_page('contributions', 'members')
 def contributions_report():
     """Contributions report - Auditors have read-only access"""
     if not (current_user.is_executive() or current_user.is_super_admin() or current_user.is_auditor()):
@@ -232,15 +265,15 @@ def contributions_report():
         query = query.filter(Contribution.contribution_month.like(f"{year}-%"))
 
     contributions = query.order_by(Contribution.payment_date.desc()).all()
+    total_received = query.with_entities(func.coalesce(func.sum(Contribution.amount), 0)).scalar()
 
     # Summary statistics
-    total_expected = len(Member.query.filter_by(status='Active').all()) * current_app.config['MONTHLY_CONTRIBUTION']
+    total_expected = len(Member.query.filter_by(status='Active').all()) * get_setting('MONTHLY_CONTRIBUTION')
     if month:
         total_expected = total_expected  # For selected month
     else:
         total_expected = total_expected * 12  # For entire year
 
-    total_received = sum(c.amount for c in contributions)
     total_outstanding = total_expected - total_received
     collection_rate = (total_received / total_expected * 100) if total_expected > 0 else 0
 
@@ -269,6 +302,7 @@ def contributions_report():
 
 @reports.route('/loans')
 @login_required
+@conditional_page('loans', 'members', 'loan_aging_snapshots')
 def loans_report():
     """Loans report - Auditors have read-only access"""
     if not (current_user.is_executive() or current_user.is_super_admin() or current_user.is_auditor()):
@@ -282,15 +316,21 @@ def loans_report():
 
     loans = query.order_by(Loan.created_at.desc()).all()
 
-    # Summary statistics
-    total_disbursed = sum(l.amount_approved for l in loans if l.disbursed and l.amount_approved)
-    total_repaid = sum(l.total_paid for l in loans)
-    total_outstanding = sum(l.balance for l in loans if l.status == 'Active')
-    total_interest_earned = sum(l.total_paid - (l.amount_approved or 0) for l in loans if l.total_paid > (l.amount_approved or 0))
+    # Summary statistics (integer sums in SQL)
+    approved = func.coalesce(Loan.amount_approved, 0)
+    total_disbursed, total_repaid, total_outstanding, total_interest_earned = query.with_entities(
+        func.coalesce(func.sum(case((Loan.disbursed == True, approved), else_=0)), 0),
+        func.coalesce(func.sum(Loan.total_paid), 0),
+        func.coalesce(func.sum(case((Loan.status.in_(Loan.OPEN_STATUSES), Loan.balance), else_=0)), 0),
+        func.coalesce(func.sum(case((Loan.total_paid > approved, Loan.total_paid - approved), else_=0)), 0)
+    ).one()
 
     active_loans = [l for l in loans if l.status == 'Active']
     defaulted_loans = [l for l in loans if l.status == 'Defaulted']
 
+    # Aging buckets from the latest nightly snapshot
+    aging = aging_snapshot()
+
     return render_template('reports/loans.html',
                          loans=loans,
                          status_filter=status_filter,
@@ -299,11 +339,13 @@ def loans_report():
                          total_outstanding=total_outstanding,
                          total_interest_earned=total_interest_earned,
                          active_loans_count=len(active_loans),
-                         defaulted_loans_count=len(defaulted_loans))
+                         defaulted_loans_count=len(defaulted_loans),
+                         aging=aging)
 
 
 @reports.route('/welfare')
 @login_required
+@conditional_page('welfare_requests', 'welfare_payments', 'members')
 def welfare_report():
     """Welfare report - Auditors have read-only access"""
     if not (current_user.is_executive() or current_user.is_super_admin() or current_user.is_auditor()):
@@ -324,13 +366,15 @@ def welfare_report():
     pending_requests = [r for r in requests if r.status == 'Pending']
     rejected_requests = [r for r in requests if r.status == 'Rejected']
 
-    total_approved_amount = sum(r.amount_approved or 0 for r in approved_requests)
+    total_approved_amount = db.session.query(func.coalesce(func.sum(WelfareRequest.amount_approved), 0)).filter(
+        extract('year', WelfareRequest.created_at) == year,
+        WelfareRequest.status == 'Approved'
+    ).scalar()
 
     # Get payments
-    payments = WelfarePayment.query.filter(
+    total_paid = db.session.query(func.coalesce(func.sum(WelfarePayment.amount_paid), 0)).filter(
         extract('year', WelfarePayment.payment_date) == year
-    ).all()
-    total_paid = sum(p.amount_paid for p in payments)
+    ).scalar()
 
     return render_template('reports/welfare.html',
                          year=year,
@@ -345,6 +389,7 @@ def welfare_report():
 
 @reports.route('/meetings')
 @login_required
+@conditional_page('meetings', 'attendance')
 def meetings_report():
     """Meetings report - accessible to Executives and Members"""
     year = request.args.get('year', type=int)
@@ -120,15 +120,8 @@ def create_user():
         return redirect(url_for('users.view_user', id=user.id))
 
     # GET request - show form
-    members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
-
-    # Filter out members who already have user accounts
-    available_members = []
-    for member in members:
-        if not User.query.filter_by(member_id=member.id).first():
-            available_members.append(member)
-
-    return render_template('users/create.html', members=available_members)
+    # Members without user accounts are listed client-side from the cached member directory
+    return render_template('users/create.html')
 
 
 @users.route('/<int:id>')
@@ -191,18 +184,9 @@ def edit_user(id):
         return redirect(url_for('users.view_user', id=id))
 
     # GET request
-    members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
-
-    # Filter out members who already have user accounts (except this user's member)
-    available_members = []
-    for member in members:
-        existing_user = User.query.filter_by(member_id=member.id).first()
-        if not existing_user or existing_user.id == user.id:
-            available_members.append(member)
-
-    return render_template('users/edit.html',
-                         user=user,
-                         members=available_members)
+    # Members without user accounts (plus this user's member) are listed client-side
+    # from the cached member directory
+    return render_template('users/edit.html', user=user)
 
 
 @users.route('/<int:id>/reset-password', methods=['POST'])
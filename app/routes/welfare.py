@@ -7,9 +7,10 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.welfare import WelfareRequest, WelfarePayment
 from app.models.member import Member
+from app.models.types import to_money
 from app.utils.decorators import executive_required
+from app.utils.helpers import last_number_query
 from datetime import datetime, date
-from decimal import Decimal
 from sqlalchemy import func
 
 welfare = Blueprint('welfare', __name__, url_prefix='/welfare')
@@ -84,17 +85,8 @@ def submit_request():
         year = today.year
         prefix = f'WR-{year}-'
 
-        result = db.session.execute(
-            db.select(func.max(WelfareRequest.request_number)).where(
-                WelfareRequest.request_number.like(f'{prefix}%')
-            )
-        ).scalar()
-
-        if result:
-            last_num = int(result.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        last_num = db.session.execute(last_number_query(WelfareRequest.request_number, prefix)).scalar()
+        new_num = (last_num or 0) + 1
 
         request_number = f'{prefix}{new_num:04d}'
 
@@ -102,7 +94,7 @@ def submit_request():
         amount_requested = None
         if request.form.get('amount_requested'):
             try:
-                amount_requested = Decimal(request.form.get('amount_requested'))
+                amount_requested = to_money(request.form.get('amount_requested'))
             except (ValueError, TypeError):
                 pass
 
@@ -127,12 +119,8 @@ def submit_request():
         return redirect(url_for('welfare.view_request', id=welfare_request.id))
 
     # GET request - show form
-    if current_user.is_executive() or current_user.is_super_admin():
-        members = Member.query.filter_by(status='Active').order_by(Member.member_number).all()
-    else:
-        members = [current_user.member] if hasattr(current_user, 'member') else []
-
-    return render_template('welfare/request.html', members=members)
+    # Executives pick the member client-side from the cached member directory
+    return render_template('welfare/request.html')
 
 
 @welfare.route('/<int:id>')
@@ -184,7 +172,7 @@ def approve_request(id):
         return redirect(url_for('welfare.view_request', id=id))
 
     try:
-        amount_approved = Decimal(request.form.get('amount_approved'))
+        amount_approved = to_money(request.form.get('amount_approved'))
         if amount_approved <= 0:
             flash('Approved amount must be greater than zero!', 'danger')
             return redirect(url_for('welfare.view_request', id=id))
@@ -243,7 +231,7 @@ def record_payment(id):
 
     if request.method == 'POST':
         try:
-            amount_paid = Decimal(request.form.get('amount_paid'))
+            amount_paid = to_money(request.form.get('amount_paid'))
             if amount_paid <= 0:
                 flash('Payment amount must be greater than zero!', 'danger')
                 return redirect(url_for('welfare.record_payment', id=id))
@@ -281,17 +269,8 @@ def record_payment(id):
         year = payment_date.year
         prefix = f'WV-{year}-'
 
-        result = db.session.execute(
-            db.select(func.max(WelfarePayment.payment_voucher_number)).where(
-                WelfarePayment.payment_voucher_number.like(f'{prefix}%')
-            )
-        ).scalar()
-
-        if result:
-            last_num = int(result.split('-')[-1])
-            new_num = last_num + 1
-        else:
-            new_num = 1
+        last_num = db.session.execute(last_number_query(WelfarePayment.payment_voucher_number, prefix)).scalar()
+        new_num = (last_num or 0) + 1
 
         voucher_number = f'{prefix}{new_num:04d}'
 
@@ -0,0 +1,201 @@
+/*
+ * Member App
+ * Offline member dashboard. Keeps the member's rows in localStorage and
+ * brings them up to date from /api/v1/sync, which sends only the rows
+ * changed since the stored token (or 304 when nothing changed).
+ *
+ * Offline, the last synced data is shown. A 401/403 from the server
+ * clears it, so the next person on a shared phone never sees it.
+ *
+ * The script tag carries:
+ *   data-sync-url   /api/v1/sync
+ *   data-sw-url     service worker script (served from the site root)
+ *   data-scope      the app's URL, the service worker's scope
+ */
+(function () {
+    'use strict';
+
+    const script = document.currentScript;
+    const SYNC_URL = script.dataset.syncUrl;
+    const STORAGE_KEY = 'member-app';
+    const RESOURCES = ['contributions', 'loans', 'repayments', 'welfare', 'notifications'];
+
+    function escapeHtml(value) {
+        return String(value == null ? '' : value)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;')
+            .replace(/'/g, '&#39;');
+    }
+
+    function money(amount) {
+        return 'UGX ' + Number(amount || 0).toLocaleString('en-US');
+    }
+
+    function day(iso) {
+        // dd/mm/yyyy, as format_date on the server
+        return iso ? iso.slice(8, 10) + '/' + iso.slice(5, 7) + '/' + iso.slice(0, 4) : '-';
+    }
+
+    function load() {
+        try {
+            return JSON.parse(localStorage.getItem(STORAGE_KEY));
+        } catch (e) {
+            return null;
+        }
+    }
+
+    function save(state) {
+        localStorage.setItem(STORAGE_KEY, JSON.stringify(state));
+    }
+
+    function merge(state, data) {
+        if (data.full || !state) {
+            state = {rows: {}};
+            RESOURCES.forEach(name => { state.rows[name] = {}; });
+        }
+        RESOURCES.forEach(name => {
+            data[name].forEach(row => { state.rows[name][row.id] = row; });
+        });
+        // Contributions can be deleted; drop any the server no longer has
+        const existing = new Set(data.contribution_ids.map(String));
+        Object.keys(state.rows.contributions).forEach(id => {
+            if (!existing.has(id)) {
+                delete state.rows.contributions[id];
+            }
+        });
+        state.summary = data.summary;
+        state.token = data.token;
+        state.syncedAt = new Date().toISOString();
+        return state;
+    }
+
+    function newestFirst(rows, key) {
+        return Object.values(rows).sort((a, b) => (b[key] || '').localeCompare(a[key] || '') || b.id - a.id);
+    }
+
+    function fillRows(id, rows, columns, empty) {
+        document.getElementById(id).innerHTML = rows.length
+            ? rows.map(row => '<tr>' + columns.map(col => col(row)).join('') + '</tr>').join('')
+            : '<tr><td colspan="' + columns.length + '" class="text-muted">' + empty + '</td></tr>';
+    }
+
+    function card(label, value, extra) {
+        return '<div class="col-6 col-md-3"><div class="card h-100"><div class="card-body p-2">' +
+            '<small class="text-muted">' + label + '</small>' +
+            '<div class="fw-bold">' + escapeHtml(value) + '</div>' + (extra || '') +
+            '</div></div></div>';
+    }
+
+    function render(state) {
+        document.getElementById('memberData').classList.toggle('d-none', !state);
+        if (!state) {
+            return;
+        }
+        const s = state.summary;
+        document.getElementById('memberName').textContent = s.full_name;
+        document.getElementById('memberNumber').textContent = s.member_number + ' - ' + s.status;
+
+        document.getElementById('summaryCards').innerHTML = [
+            card('Total Contributed', money(s.total_contributed),
+                 s.paid_this_month ? '<small class="text-success">Paid this month</small>'
+                                   : '<small class="text-warning">Not paid this month</small>'),
+            card('Consecutive Months', s.consecutive_months,
+                 '<small class="' + (s.qualified ? 'text-success">Qualified' : 'text-muted">Not yet qualified') + '</small>'),
+            card('Months in Arrears', s.months_in_arrears),
+            card('Loan Balance', money(s.loan_balance),
+                 '<small class="text-muted">' + s.active_loans + ' active</small>'),
+            card('Guarantee Exposure', money(s.guarantee_exposure),
+                 s.guarantor_requests ? '<small class="text-danger">' + s.guarantor_requests + ' request(s) waiting</small>' : ''),
+            card('Unread Notifications', s.unread_notifications)
+        ].join('');
+
+        const notifications = newestFirst(state.rows.notifications, 'created_at').slice(0, 10);
+        document.getElementById('notificationList').innerHTML = notifications.length
+            ? notifications.map(n => '<li class="list-group-item' + (n.is_read ? '' : ' fw-bold') + '">' +
+                escapeHtml(n.title) + '<br><small class="text-muted fw-normal">' + escapeHtml(n.message) + '</small></li>').join('')
+            : '<li class="list-group-item text-muted">No notifications</li>';
+
+        const loans = state.rows.loans;
+        fillRows('loanRows', newestFirst(loans, 'disbursement_date'), [
+            l => '<td>' + escapeHtml(l.loan_number) + '</td>',
+            l => '<td>' + escapeHtml(l.status) + (l.days_past_due ? ' <span class="badge bg-danger">' + l.days_past_due + 'd late</span>' : '') + '</td>',
+            l => '<td class="text-end">' + money(l.balance) + '</td>',
+            l => '<td>' + day(l.due_date) + '</td>'
+        ], 'No loans');
+
+        fillRows('repaymentRows', newestFirst(state.rows.repayments, 'payment_date'), [
+            r => '<td>' + day(r.payment_date) + '</td>',
+            r => '<td>' + escapeHtml(loans[r.loan_id] ? loans[r.loan_id].loan_number : '') + '</td>',
+            r => '<td class="text-end">' + money(r.amount_paid) + '</td>',
+            r => '<td>' + escapeHtml(r.receipt_number || '-') + '</td>'
+        ], 'No repayments');
+
+        fillRows('contributionRows', newestFirst(state.rows.contributions, 'month'), [
+            c => '<td>' + escapeHtml(c.month) + '</td>',
+            c => '<td>' + day(c.payment_date) + '</td>',
+            c => '<td class="text-end">' + money(c.amount) + '</td>',
+            c => '<td>' + escapeHtml(c.receipt_number || '-') + '</td>'
+        ], 'No contributions');
+
+        fillRows('welfareRows', newestFirst(state.rows.welfare, 'submitted_date'), [
+            w => '<td>' + escapeHtml(w.request_number) + '</td>',
+            w => '<td>' + escapeHtml(w.type) + '</td>',
+            w => '<td>' + escapeHtml(w.status) + '</td>',
+            w => '<td class="text-end">' + money(w.amount_approved) + '</td>'
+        ], 'No welfare requests');
+    }
+
+    function setStatus(text, style) {
+        const badge = document.getElementById('syncStatus');
+        badge.textContent = text;
+        badge.className = 'badge bg-' + style;
+    }
+
+    function syncedLabel(state) {
+        const at = new Date(state.syncedAt);
+        return 'Offline - synced ' + at.toLocaleDateString() + ' ' + at.toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
+    }
+
+    async function sync() {
+        const state = load();
+        const url = SYNC_URL + (state && state.token ? '?since=' + encodeURIComponent(state.token) : '');
+        let response;
+        try {
+            // The browser revalidates with If-None-Match; a 304 comes back as the cached 200
+            response = await fetch(url, {credentials: 'same-origin', headers: {'Accept': 'application/json'}});
+        } catch (e) {
+            setStatus(state ? syncedLabel(state) : 'Offline', 'secondary');
+            return;
+        }
+        if (response.status === 401 || response.status === 403) {
+            localStorage.removeItem(STORAGE_KEY);
+            render(null);
+            document.getElementById('loginPrompt').classList.remove('d-none');
+            setStatus('Logged out', 'secondary');
+            return;
+        }
+        if (!response.ok) {
+            setStatus(state ? syncedLabel(state) : 'Sync failed', 'warning');
+            return;
+        }
+        const next = merge(state, await response.json());
+        save(next);
+        render(next);
+        setStatus('Up to date', 'success');
+    }
+
+    render(load());
+    sync();
+    window.addEventListener('online', sync);
+    document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'visible') {
+            sync();
+        }
+    });
+
+    if ('serviceWorker' in navigator) {
+        navigator.serviceWorker.register(script.dataset.swUrl, {scope: script.dataset.scope});
+    }
+})();
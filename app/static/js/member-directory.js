@@ -0,0 +1,116 @@
+/*
+ * Member Directory
+ * Populates member pickers from the cached /members/directory.json snapshot.
+ *
+ * <select data-member-directory> options are filtered with:
+ *   data-status="Active"       only members with this status
+ *   data-qualified="true"      only members qualified for benefits
+ *   data-has-user="false"      only members without a user account
+ *   data-exclude="12"          skip this member id
+ *   data-include="7"           always keep this member id (e.g. current link)
+ *   data-selected="7"          preselect this member id
+ *
+ * Users other than executives get a basic directory: Active members only,
+ * without status, has_user and phone. data-status passes for it;
+ * data-has-user filters belong on executive pages.
+ *
+ * <tbody data-member-directory data-template="rowTemplate"> is filled by
+ * cloning the <template> for each member, replacing {id}, {number}, {name},
+ * {phone} and {index}. A "member-directory:loaded" event fires on the
+ * document once every picker has been filled.
+ */
+(function () {
+    'use strict';
+
+    const DIRECTORY_URL = document.currentScript.dataset.url;
+
+    function escapeHtml(value) {
+        return String(value == null ? '' : value)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;')
+            .replace(/'/g, '&#39;');
+    }
+
+    function matches(member, el) {
+        const d = el.dataset;
+        if (d.include && String(member.id) === d.include) {
+            return true;
+        }
+        if (d.exclude && String(member.id) === d.exclude) {
+            return false;
+        }
+        if (d.status && member.status !== undefined && member.status !== d.status) {
+            return false;
+        }
+        if (d.qualified && String(member.qualified) !== d.qualified) {
+            return false;
+        }
+        if (d.hasUser && String(member.has_user) !== d.hasUser) {
+            return false;
+        }
+        return true;
+    }
+
+    function fillSelect(select, members) {
+        const fragment = document.createDocumentFragment();
+        members.filter(m => matches(m, select)).forEach(member => {
+            const option = document.createElement('option');
+            option.value = member.id;
+            option.textContent = member.number + ' - ' + member.name;
+            if (select.dataset.selected && String(member.id) === select.dataset.selected) {
+                option.selected = true;
+            }
+            fragment.appendChild(option);
+        });
+        select.appendChild(fragment);
+    }
+
+    function fillTable(tbody, members) {
+        const template = document.getElementById(tbody.dataset.template);
+        const html = [];
+        members.filter(m => matches(m, tbody)).forEach((member, i) => {
+            html.push(template.innerHTML
+                .replace(/\{id\}/g, member.id)
+                .replace(/\{number\}/g, escapeHtml(member.number))
+                .replace(/\{name\}/g, escapeHtml(member.name))
+                .replace(/\{phone\}/g, escapeHtml(member.phone))
+                .replace(/\{index\}/g, i + 1));
+        });
+        tbody.innerHTML = html.join('');
+    }
+
+    function load() {
+        const pickers = document.querySelectorAll('[data-member-directory]');
+        if (!pickers.length) {
+            return;
+        }
+
+        // no-cache + ETag: the browser revalidates and usually gets a 304
+        fetch(DIRECTORY_URL, {credentials: 'same-origin', cache: 'no-cache'})
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('Member directory unavailable (' + response.status + ')');
+                }
+                return response.json();
+            })
+            .then(directory => {
+                pickers.forEach(el => {
+                    if (el.tagName === 'SELECT') {
+                        fillSelect(el, directory.members);
+                    } else {
+                        fillTable(el, directory.members);
+                    }
+                });
+                document.dispatchEvent(new CustomEvent('member-directory:loaded', {detail: directory}));
+            })
+            .catch(error => console.error(error));
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', load);
+    } else {
+        load();
+    }
+})();
@@ -0,0 +1,79 @@
+/*
+ * Member App Service Worker
+ * Registered by member-app.js with the app's URL as its scope, so it only
+ * sees the app shell and the assets the shell loads.
+ *
+ *   App shell      network first, cached copy when offline
+ *   /static/dist/  cache first (fingerprinted, never change)
+ *   Other CSS/JS/fonts  cached copy at once, refreshed in the background
+ *
+ * API requests are not touched: the app keeps its data in localStorage,
+ * and the browser's HTTP cache revalidates /api/v1/sync with its ETag.
+ */
+'use strict';
+
+const CACHE = 'member-app-v1';
+const SHELL_URL = self.registration.scope;
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE)
+            .then(cache => cache.add(SHELL_URL))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function shell(request) {
+    return fetch(request).then(response => {
+        // A redirect means the login page, not the shell
+        if (response.ok && !response.redirected) {
+            const copy = response.clone();
+            caches.open(CACHE).then(cache => cache.put(SHELL_URL, copy));
+        }
+        return response;
+    }).catch(() => caches.match(SHELL_URL));
+}
+
+function store(request, response) {
+    if (response.ok || response.type === 'opaque') {
+        const copy = response.clone();
+        caches.open(CACHE).then(cache => cache.put(request, copy));
+    }
+    return response;
+}
+
+function asset(request, immutable) {
+    return caches.match(request).then(cached => {
+        if (cached && immutable) {
+            return cached;
+        }
+        const network = fetch(request).then(response => store(request, response));
+        if (cached) {
+            network.catch(() => null);
+            return cached;
+        }
+        return network;
+    });
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    if (request.mode === 'navigate' && url.href.split('?')[0] === SHELL_URL) {
+        event.respondWith(shell(request));
+    } else if (['style', 'script', 'font'].includes(request.destination)) {
+        const immutable = url.origin === self.location.origin && url.pathname.startsWith('/static/dist/');
+        event.respondWith(asset(request, immutable));
+    }
+});
@@ -0,0 +1,192 @@
+"""
+Loan Amortization
+Builds the instalment schedule at disbursement and allocates repayments
+against it, so arrears and next-due amounts are read from schedule rows
+"""
+from datetime import date
+from decimal import Decimal
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
+from app import db
+from app.models.loan import Loan, LoanInstalment
+from app.models.types import to_money
+
+
+def build_schedule(loan):
+    """
+    Build (unsaved) instalments for a disbursed loan
+
+    Interest is flat, as in Loan.calculate_total_payable(), and both
+    principal and interest are spread evenly over the repayment months
+    in whole shillings; the last instalment takes the remainders.
+    Instalment n falls due n months after disbursement.
+
+    Args:
+        loan: Loan with amount_approved, total_payable and disbursement_date
+
+    Returns:
+        List of LoanInstalment objects
+    """
+    if loan.total_payable is None:
+        loan.calculate_total_payable()
+
+    months = max(loan.repayment_period_months or 1, 1)
+    principal = loan.amount_approved
+    interest = loan.total_payable - principal
+
+    instalments = []
+    cumulative = 0
+    for number in range(1, months + 1):
+        principal_due = principal // months
+        interest_due = interest // months
+        if number == months:
+            principal_due += principal % months
+            interest_due += interest % months
+        cumulative += principal_due + interest_due
+        instalments.append(LoanInstalment(
+            loan_id=loan.id,
+            instalment_number=number,
+            due_date=loan.disbursement_date + relativedelta(months=number),
+            principal_due=principal_due,
+            interest_due=interest_due,
+            amount_due=principal_due + interest_due,
+            cumulative_due=cumulative,
+            principal_paid=0,
+            interest_paid=0,
+        ))
+    return instalments
+
+
+def create_schedule(loan):
+    """
+    Write the schedule for a loan being disbursed (replaces any existing one)
+
+    Also sets loan.due_date to the final instalment's due date.
+
+    Returns:
+        List of LoanInstalment objects added to the session
+    """
+    LoanInstalment.query.filter_by(loan_id=loan.id).delete()
+    instalments = build_schedule(loan)
+    db.session.add_all(instalments)
+    loan.due_date = instalments[-1].due_date
+    return instalments
+
+
+def apply_payment(instalments, amount, payment_date):
+    """
+    Allocate a payment over instalments in order, interest before principal
+
+    Fully paid instalments get paid_date. Anything left once every
+    instalment is paid (an overpayment) counts as principal.
+
+    Args:
+        instalments: Unpaid instalments, oldest first
+        amount: Whole shillings paid
+        payment_date: Date of the payment
+
+    Returns:
+        Tuple (principal_portion, interest_portion)
+    """
+    remaining = amount
+    principal_portion = interest_portion = 0
+    for instalment in instalments:
+        if remaining <= 0:
+            break
+        interest = min(remaining, instalment.interest_due - instalment.interest_paid)
+        instalment.interest_paid += interest
+        remaining -= interest
+        principal = min(remaining, instalment.principal_due - instalment.principal_paid)
+        instalment.principal_paid += principal
+        remaining -= principal
+        interest_portion += interest
+        principal_portion += principal
+        if instalment.outstanding <= 0:
+            instalment.paid_date = payment_date
+    return principal_portion + remaining, interest_portion
+
+
+def allocate_repayment(loan, amount, payment_date):
+    """
+    Allocate a repayment against the loan's schedule
+
+    Loans disbursed before schedules existed have none; their repayment is
+    split in proportion to principal and interest in total_payable.
+
+    Returns:
+        Tuple (principal_portion, interest_portion)
+    """
+    if not db.session.query(LoanInstalment.query.filter_by(loan_id=loan.id).exists()).scalar():
+        principal_portion = to_money(Decimal(amount * loan.amount_approved) / loan.total_payable)
+        return principal_portion, amount - principal_portion
+
+    unpaid = LoanInstalment.query.filter(
+        LoanInstalment.loan_id == loan.id,
+        LoanInstalment.paid_date.is_(None)
+    ).order_by(LoanInstalment.instalment_number).all()
+    return apply_payment(unpaid, amount, payment_date)
+
+
+def arrears(loan, as_of=None):
+    """
+    Amount overdue on a loan (unpaid on instalments due before as_of)
+
+    Returns:
+        int shillings
+    """
+    as_of = as_of or date.today()
+    outstanding = LoanInstalment.amount_due - LoanInstalment.principal_paid - LoanInstalment.interest_paid
+    return int(db.session.query(func.coalesce(func.sum(outstanding), 0)).filter(
+        LoanInstalment.loan_id == loan.id,
+        LoanInstalment.paid_date.is_(None),
+        LoanInstalment.due_date < as_of
+    ).scalar())
+
+
+def unpaid_instalments_due(start, end):
+    """
+    Unpaid instalments of open loans (defaulted included) due between start and end (inclusive)
+
+    Args:
+        start: First due date, or None for no lower bound
+        end: Last due date
+
+    Returns:
+        Query of LoanInstalment ordered by due date, with loans loaded
+    """
+    query = LoanInstalment.query.join(Loan).filter(
+        LoanInstalment.paid_date.is_(None),
+        LoanInstalment.due_date <= end,
+        Loan.status.in_(Loan.OPEN_STATUSES),
+        Loan.balance > 0
+    )
+    if start is not None:
+        query = query.filter(LoanInstalment.due_date >= start)
+    return query.options(contains_eager(LoanInstalment.loan)).order_by(
+        LoanInstalment.due_date, LoanInstalment.loan_id
+    )
+
+
+def overdue_loans(as_of=None):
+    """
+    Open loans (defaulted included) with instalments due before as_of, from one grouped query
+
+    Returns:
+        List of (loan, oldest overdue due date, arrears) tuples, oldest first
+    """
+    as_of = as_of or date.today()
+    outstanding = LoanInstalment.amount_due - LoanInstalment.principal_paid - LoanInstalment.interest_paid
+    rows = db.session.query(
+        LoanInstalment.loan_id,
+        func.min(LoanInstalment.due_date),
+        func.sum(outstanding)
+    ).join(Loan).filter(
+        LoanInstalment.paid_date.is_(None),
+        LoanInstalment.due_date < as_of,
+        Loan.status.in_(Loan.OPEN_STATUSES),
+        Loan.balance > 0
+    ).group_by(LoanInstalment.loan_id).order_by(func.min(LoanInstalment.due_date)).all()
+
+    loans = {loan.id: loan for loan in Loan.query.filter(Loan.id.in_([r[0] for r in rows]))}
+    return [(loans[loan_id], since, int(amount)) for loan_id, since, amount in rows]
@@ -0,0 +1,294 @@
+"""
+Static Asset Pipeline
+Vendors Bootstrap and bootstrap-icons into app/static, minifies our CSS,
+writes content-hashed copies with .gz/.br variants to app/static/dist and
+serves those with far-future immutable caching
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz variants are written without it
+    brotli = None
+
+
+CDN_URL = 'https://cdn.jsdelivr.net/npm'
+
+# (package, version, path in the package, destination under app/static)
+VENDOR_ASSETS = [
+    ('bootstrap', '5.3.0', 'dist/css/bootstrap.min.css', 'vendor/bootstrap/css/bootstrap.min.css'),
+    ('bootstrap', '5.3.0', 'dist/js/bootstrap.bundle.min.js', 'vendor/bootstrap/js/bootstrap.bundle.min.js'),
+    ('bootstrap-icons', '1.10.0', 'font/bootstrap-icons.css', 'vendor/bootstrap-icons/bootstrap-icons.css'),
+    ('bootstrap-icons', '1.10.0', 'font/fonts/bootstrap-icons.woff2', 'vendor/bootstrap-icons/fonts/bootstrap-icons.woff2'),
+    ('bootstrap-icons', '1.10.0', 'font/fonts/bootstrap-icons.woff', 'vendor/bootstrap-icons/fonts/bootstrap-icons.woff'),
+]
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Directories under app/static that are never bundled
+SKIP_DIRS = {'uploads', DIST_DIR}
+
+BUNDLED_EXTENSIONS = {'.css', '.js', '.woff', '.woff2', '.ttf', '.svg', '.png', '.jpg', '.ico', '.webp'}
+
+# Formats worth precompressing (fonts and images are compressed already)
+COMPRESSED_EXTENSIONS = {'.css', '.js', '.svg', '.ttf'}
+
+# (Accept-Encoding token, file suffix), preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_SOURCE_MAP = re.compile(r'/[*/]# sourceMappingURL=[^\n]*?(\*/)?$', re.MULTILINE)
+
+
+def cdn_url(package, version, path):
+    """jsDelivr URL of a file in an npm package"""
+    return f'{CDN_URL}/{package}@{version}/{path}'
+
+
+def vendor_assets(static_folder, source=None, fetch=True):
+    """
+    Copy the vendored files into app/static/vendor
+
+    Files already present are kept.
+
+    Args:
+        static_folder: The app's static folder
+        source: A node_modules-style directory to copy from instead of the CDN
+            (<source>/<package>/<path>), for servers without internet access
+        fetch: Download missing files from the CDN when no source is given
+
+    Returns:
+        List of destination paths written
+
+    Raises:
+        RuntimeError: If a file is missing and cannot be copied or downloaded
+    """
+    written = []
+    for package, version, path, dest in VENDOR_ASSETS:
+        target = os.path.join(static_folder, dest)
+        if os.path.exists(target):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if source:
+            origin = os.path.join(source, package, path)
+            if not os.path.exists(origin):
+                raise RuntimeError(f'{origin} not found (expected {package}@{version})')
+            shutil.copyfile(origin, target)
+        elif fetch:
+            import requests
+            url = cdn_url(package, version, path)
+            try:
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                raise RuntimeError(f'Could not download {url}: {e}')
+            with open(target, 'wb') as f:
+                f.write(response.content)
+        else:
+            raise RuntimeError(f'{dest} is not vendored yet')
+        written.append(dest)
+    return written
+
+
+def minify_css(css):
+    """
+    Conservative CSS minifier: comments and insignificant whitespace
+
+    Spaces before ':' are kept, since 'a :hover' and 'a:hover' differ.
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def _hashed_name(logical, content):
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    stem, ext = os.path.splitext(logical)
+    return f'{DIST_DIR}/{stem}.{digest}{ext}'
+
+
+def _rewrite_css_urls(css, logical, manifest):
+    """Point url() references at the fingerprinted files"""
+    base = posixpath.dirname(logical)
+    dist_base = posixpath.join(DIST_DIR, base)
+
+    def replace(match):
+        quote, ref = match.groups()
+        if ref.startswith(('data:', 'http:', 'https:', '/', '#')):
+            return match.group(0)
+        path, _, suffix = ref.partition('#')
+        path = path.split('?', 1)[0]
+        hashed = manifest.get(posixpath.normpath(posixpath.join(base, path)))
+        if hashed is None:
+            return match.group(0)
+        new = posixpath.relpath(hashed, dist_base) + (f'#{suffix}' if suffix else '')
+        return f'url({quote}{new}{quote})'
+
+    return _CSS_URL.sub(replace, css)
+
+
+def _source_files(static_folder):
+    """Logical names (relative to static, '/' separated) of bundled files"""
+    names = []
+    for root, dirs, files in os.walk(static_folder):
+        rel = os.path.relpath(root, static_folder)
+        if rel == '.':
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        dirs.sort()
+        for name in sorted(files):
+            if name.startswith('.') or os.path.splitext(name)[1] not in BUNDLED_EXTENSIONS:
+                continue
+            names.append(posixpath.normpath(posixpath.join(rel.replace(os.sep, '/'), name)))
+    return names
+
+
+def _write_variants(path, content):
+    """Write .gz (and .br when brotli is installed) next to path, if smaller"""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            with open(path + suffix, 'wb') as f:
+                f.write(data)
+
+
+def build_assets(static_folder, clean=False):
+    """
+    Fingerprint every static asset into app/static/dist
+
+    Fonts and images are hashed first so CSS url() references can be
+    rewritten to their new names before the CSS itself is hashed. Our own
+    CSS is minified (files already named .min.css are left alone) and
+    source map comments are dropped, since maps are not vendored.
+
+    Args:
+        static_folder: The app's static folder
+        clean: Remove earlier builds first (by default they are kept so
+            pages rendered before a deploy can still load their assets)
+
+    Returns:
+        Dict with files (logical -> fingerprinted), bytes and compressed_bytes
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    if clean and os.path.isdir(dist):
+        shutil.rmtree(dist)
+
+    names = _source_files(static_folder)
+    # CSS last: it refers to fonts and images
+    names.sort(key=lambda name: name.endswith('.css'))
+
+    manifest = {}
+    total = compressed = 0
+    for logical in names:
+        with open(os.path.join(static_folder, logical), 'rb') as f:
+            content = f.read()
+        ext = os.path.splitext(logical)[1]
+        if ext in ('.css', '.js'):
+            text = _SOURCE_MAP.sub('', content.decode('utf-8'))
+            if ext == '.css':
+                text = _rewrite_css_urls(text, logical, manifest)
+                if not logical.endswith('.min.css'):
+                    text = minify_css(text)
+            content = text.encode('utf-8')
+
+        hashed = _hashed_name(logical, content)
+        target = os.path.join(static_folder, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+        if ext in COMPRESSED_EXTENSIONS:
+            _write_variants(target, content)
+        manifest[logical] = hashed
+
+        total += len(content)
+        smallest = [len(content)] + [os.path.getsize(target + s) for _, s in ENCODINGS if os.path.exists(target + s)]
+        compressed += min(smallest)
+
+    with open(os.path.join(dist, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return {'files': manifest, 'bytes': total, 'compressed_bytes': compressed}
+
+
+class _Assets:
+    """Manifest and precompressed variants loaded at startup"""
+
+    def __init__(self, static_folder, manifest, max_age):
+        self.static_folder = static_folder
+        self.manifest = manifest
+        self.max_age = max_age
+        self.fingerprinted = set(manifest.values())
+        self.variants = {
+            hashed: [(encoding, suffix) for encoding, suffix in ENCODINGS
+                     if os.path.exists(os.path.join(static_folder, hashed + suffix))]
+            for hashed in self.fingerprinted
+        }
+        # Vendored files not copied in yet are loaded from the CDN
+        self.cdn_fallbacks = {
+            dest: cdn_url(package, version, path) for package, version, path, dest in VENDOR_ASSETS
+            if not os.path.exists(os.path.join(static_folder, dest))
+        }
+
+
+def init_assets(app):
+    """
+    Serve fingerprinted assets (web mode only)
+
+    With ASSETS_FINGERPRINT on and a built manifest, url_for('static',
+    filename=...) returns the fingerprinted name, and those files are
+    served with Cache-Control: immutable and, when the browser accepts
+    them, as their .br/.gz variants. Everything else under static (uploads
+    included) is served as before.
+    """
+    static_folder = app.static_folder
+    manifest = {}
+    manifest_path = os.path.join(static_folder, DIST_DIR, MANIFEST_NAME)
+    if app.config['ASSETS_FINGERPRINT'] and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    assets = _Assets(static_folder, manifest, app.config['ASSETS_MAX_AGE'])
+    app.extensions['assets'] = assets
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == 'static':
+            hashed = assets.manifest.get(values.get('filename'))
+            if hashed:
+                values['filename'] = hashed
+
+    def send_static(filename):
+        if filename not in assets.fingerprinted:
+            return app.send_static_file(filename)
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        for encoding, suffix in assets.variants[filename]:
+            if request.accept_encodings[encoding]:
+                response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype,
+                                               max_age=assets.max_age)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(static_folder, filename, mimetype=mimetype, max_age=assets.max_age)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = send_static
+
+    @app.template_global()
+    def vendor_url(dest):
+        """Static URL of a vendored file, or its CDN URL until it is vendored"""
+        return assets.cdn_fallbacks.get(dest) or url_for('static', filename=dest)
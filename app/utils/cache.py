@@ -0,0 +1,92 @@
+"""
+In-Process Cache
+Small thread-safe cache used for snapshots keyed by data versions
+"""
+import threading
+import time
+from flask import current_app
+
+
+class SimpleCache:
+    """
+    Thread-safe in-process cache with optional per-key expiry
+
+    Entries keyed by a data version never go stale, so most callers
+    can rely on version keys rather than short timeouts.
+    """
+
+    def __init__(self, default_timeout=300, max_entries=1000):
+        self.default_timeout = default_timeout
+        self.max_entries = max_entries
+        self._store = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Register cache on the Flask app"""
+        self.default_timeout = app.config.get('CACHE_DEFAULT_TIMEOUT', self.default_timeout)
+        self.max_entries = app.config.get('CACHE_MAX_ENTRIES', self.max_entries)
+        app.extensions['cache'] = self
+
+    def get(self, key):
+        """Get cached value or None if missing/expired"""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires and expires < time.monotonic():
+                del self._store[key]
+                return None
+            return value
+
+    def set(self, key, value, timeout=None):
+        """
+        Store value
+
+        Args:
+            key: Cache key (any hashable)
+            value: Value to store
+            timeout: Seconds to keep the value (0 = no expiry, None = default)
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        expires = time.monotonic() + timeout if timeout else 0
+
+        with self._lock:
+            if len(self._store) >= self.max_entries and key not in self._store:
+                self._prune()
+            self._store[key] = (expires, value)
+
+    def delete(self, key):
+        """Remove a key if present"""
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self):
+        """Remove all keys"""
+        with self._lock:
+            self._store.clear()
+
+    def get_or_set(self, key, factory, timeout=None):
+        """Get cached value, building it with factory() on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value, timeout)
+        return value
+
+    def _prune(self):
+        """Drop expired entries, then the oldest ones if still full (lock held)"""
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._store.items() if expires and expires < now]:
+            del self._store[key]
+
+        overflow = len(self._store) - self.max_entries + 1
+        if overflow > 0:
+            for key in list(self._store)[:overflow]:
+                del self._store[key]
+
+
+def get_cache():
+    """Get the cache registered on the current app"""
+    return current_app.extensions['cache']
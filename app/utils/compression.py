@@ -0,0 +1,107 @@
+"""
+Response Compression
+WSGI middleware that gzip/brotli-compresses text responses above a size
+threshold, according to the client's Accept-Encoding
+"""
+import gzip
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+
+# Content types worth compressing (images, fonts, PDFs are compressed already)
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/javascript', 'application/json', 'application/xml', 'image/svg+xml',
+}
+
+
+class CompressionMiddleware:
+    """
+    Compress responses for clients that accept it
+
+    Only responses that are all of the following are buffered and compressed:
+    - 200 status
+    - a compressible Content-Type
+    - a Content-Length of at least min_size
+    - no Content-Encoding yet
+
+    Streamed responses (no Content-Length), precompressed static files and
+    small responses pass straight through. Brotli is preferred when the
+    client accepts it and the brotli package is installed. A strong ETag
+    becomes weak, since the compressed bytes differ from the uncompressed
+    ones.
+
+    Usage:
+        app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=1024)
+    """
+
+    def __init__(self, wsgi_app, min_size=1024, gzip_level=6, brotli_quality=5):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding(self, environ):
+        accept = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is not None and accept['br']:
+            return 'br'
+        if accept['gzip']:
+            return 'gzip'
+        return None
+
+    def _compressible(self, status, headers):
+        if not status.startswith('200') or 'Content-Encoding' in headers:
+            return False
+        if headers.get('Content-Type', '').split(';')[0].strip() not in COMPRESSIBLE_TYPES:
+            return False
+        length = headers.get('Content-Length', type=int)
+        return length is not None and length >= self.min_size
+
+    def compress(self, data, encoding):
+        """Compress a body with the given encoding"""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def __call__(self, environ, start_response):
+        encoding = self._encoding(environ)
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.wsgi_app(environ, start_response)
+
+        captured = {}
+        chunks = []
+
+        def capture(status, headers, exc_info=None):
+            headers = Headers(headers)
+            if not self._compressible(status, headers):
+                return start_response(status, headers.to_wsgi_list(), exc_info)
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return chunks.append
+
+        app_iter = self.wsgi_app(environ, capture)
+        if not captured:
+            return app_iter
+
+        try:
+            chunks.extend(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        body = self.compress(b''.join(chunks), encoding)
+        headers = captured['headers']
+        headers['Content-Encoding'] = encoding
+        headers['Content-Length'] = str(len(body))
+        vary = [v.strip() for v in headers.get('Vary', '').split(',') if v.strip()]
+        if 'accept-encoding' not in (v.lower() for v in vary):
+            headers['Vary'] = ', '.join(vary + ['Accept-Encoding'])
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f'W/{etag}'
+        start_response(captured['status'], headers.to_wsgi_list(), captured['exc_info'])
+        return [body]
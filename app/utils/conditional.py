@@ -0,0 +1,103 @@
+"""
+Conditional Pages
+Weak ETags for read-only pages, derived from data versions, so a revisit
+with unchanged data is answered 304 Not Modified without rendering
+"""
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+
+
+# Tables every page depends on: the navbar's notification count and amounts
+# taken from system settings. The navbar's user is keyed on its own row
+# (see page_etag), not the users table, which changes with anyone's account.
+PAGE_TABLES = ('notifications', 'system_settings')
+
+
+def _templates_stamp():
+    """Latest template modification time, so a deploy changes every ETag"""
+    stamp = current_app.extensions.get('templates_stamp')
+    if stamp is None:
+        stamp = 0
+        for root, _, files in os.walk(os.path.join(current_app.root_path, current_app.template_folder)):
+            for name in files:
+                stamp = max(stamp, os.path.getmtime(os.path.join(root, name)))
+        current_app.extensions['templates_stamp'] = stamp
+    return stamp
+
+
+def _row_stamp(row):
+    """updated_at of a loaded row, or '' for none (anonymous users)"""
+    stamp = getattr(row, 'updated_at', None)
+    return stamp.isoformat() if stamp else ''
+
+
+def page_etag(*tables):
+    """
+    Weak ETag for the current request
+
+    Built from the data versions of the page's tables and PAGE_TABLES (one
+    query), the user and their member record (id and updated_at, already
+    loaded by the user loader), the full URL, today's date (pages default
+    their date ranges to it) and the templates' modification time.
+
+    Returns:
+        ETag value (without quotes or W/ prefix)
+    """
+    from app.models.system import DataVersion
+
+    names = sorted(set(tables) | set(PAGE_TABLES))
+    versions = DataVersion.get_versions(*names)
+    parts = [
+        request.full_path,
+        str(current_user.get_id()),
+        _row_stamp(current_user),
+        _row_stamp(getattr(current_user, 'member', None)),
+        date.today().isoformat(),
+        str(_templates_stamp()),
+    ] + [f'{name}={versions[name]}' for name in names]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def conditional_page(*tables):
+    """
+    Answer 304 when the page's data has not changed since the client's copy
+
+    The ETag is checked before the view runs, so an unchanged page costs
+    one data_versions query. Pages with flashed messages waiting are
+    always rendered (the messages would otherwise be lost). Responses are
+    marked 'private, no-cache' so browsers revalidate on every visit.
+
+    Place it below @login_required and any role decorator.
+
+    Args:
+        *tables: Tables the page reads
+
+    Usage:
+        @reports.route('/loans')
+        @login_required
+        @conditional_page('loans', 'members')
+        def loans_report():
+            pass
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config['CONDITIONAL_PAGES_ENABLED'] or session.get('_flashes'):
+                return f(*args, **kwargs)
+
+            etag = page_etag(*tables)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,191 @@
+"""
+Contribution Coverage
+Which months a member has paid, as a bitmask: bit n is set when month
+start + n has at least one contribution. Streaks, gaps, arrears and
+"paid this month" are bit operations on the mask instead of queries
+"""
+from datetime import date
+
+
+def month_index(value):
+    """Month number for a 'YYYY-MM' string or a date (Jan 2025 = 2025 * 12)"""
+    if isinstance(value, str):
+        return int(value[:4]) * 12 + int(value[5:7]) - 1
+    return value.year * 12 + value.month - 1
+
+
+def month_label(index):
+    """'YYYY-MM' for a month number"""
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def _longest_run(bits):
+    """Length of the longest run of set bits"""
+    length = 0
+    while bits:
+        bits &= bits << 1
+        length += 1
+    return length
+
+
+class Coverage:
+    """
+    Paid months of one member
+
+    Args:
+        start: Month number of bit 0 (None when nothing is tracked yet)
+        bits: int bitmask of paid months
+    """
+
+    def __init__(self, start=None, bits=0):
+        self.start = start
+        self.bits = bits or 0
+
+    @classmethod
+    def from_months(cls, months, joined=None):
+        """
+        Build from contribution months ('YYYY-MM'); duplicates are ignored
+
+        Bit 0 is the joining month, or the first paid month if earlier.
+        """
+        indexes = {month_index(m) for m in months}
+        if joined is not None:
+            start = min(indexes | {month_index(joined)})
+        else:
+            start = min(indexes) if indexes else None
+        coverage = cls(start)
+        for index in indexes:
+            coverage.bits |= 1 << (index - start)
+        return coverage
+
+    def add(self, month):
+        """Mark a month paid, moving bit 0 back if the month is earlier"""
+        index = month_index(month)
+        if self.start is None:
+            self.start = index
+        elif index < self.start:
+            self.bits <<= self.start - index
+            self.start = index
+        self.bits |= 1 << (index - self.start)
+
+    def is_paid(self, month):
+        """True if the month has a contribution"""
+        if self.start is None:
+            return False
+        offset = month_index(month) - self.start
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def _mask(self, through):
+        """(paid bits, all bits) from bit 0 up to and including month `through`"""
+        if self.start is None:
+            return 0, 0
+        width = month_index(through) - self.start + 1
+        if width <= 0:
+            return 0, 0
+        window = (1 << width) - 1
+        return self.bits & window, window
+
+    @property
+    def paid_months(self):
+        """Number of distinct months paid"""
+        return self.bits.bit_count()
+
+    def streak(self, as_of=None):
+        """
+        Consecutive months paid, ending this month if it is paid, otherwise
+        ending last month (the month in progress is not a missed month)
+        """
+        as_of = as_of or date.today()
+        through = month_index(as_of) - (0 if self.is_paid(as_of) else 1)
+        paid, window = self._mask(month_label(through))
+        if not window:
+            return 0
+        unpaid = window & ~paid
+        # Set bits above the highest unpaid month are the streak
+        return window.bit_length() - unpaid.bit_length()
+
+    def months_missed(self, as_of=None):
+        """Unpaid months after the latest paid month, up to last month"""
+        if self.start is None:
+            return 0
+        as_of = as_of or date.today()
+        latest = self.start + self.bits.bit_length() - 1
+        return max(month_index(as_of) - 1 - latest, 0)
+
+    def months_in_arrears(self, as_of=None):
+        """All unpaid months from bit 0 up to last month"""
+        as_of = as_of or date.today()
+        paid, window = self._mask(month_label(month_index(as_of) - 1))
+        return (window & ~paid).bit_count()
+
+    def longest_gap(self, as_of=None):
+        """Longest run of unpaid months from bit 0 up to last month"""
+        as_of = as_of or date.today()
+        paid, window = self._mask(month_label(month_index(as_of) - 1))
+        return _longest_run(window & ~paid)
+
+
+def qualifies(status, streak, qualification_period):
+    """Benefits rule: Active members with qualification_period consecutive months paid"""
+    return status == 'Active' and (streak or 0) >= qualification_period
+
+
+def coverage_values(session, as_of=None, qualification_period=5):
+    """
+    Coverage, streak and qualification for every member, from contributions
+
+    Reads all distinct (member, month) pairs in one query; qualification
+    follows qualifies().
+
+    Returns:
+        List of dicts keyed by Member attribute (id first), ready for a
+        bulk UPDATE by primary key
+    """
+    from app.models.member import Member
+    from app.models.contribution import Contribution
+
+    months = {}
+    rows = session.query(Contribution.member_id, Contribution.contribution_month).distinct()
+    for member_id, month in rows:
+        months.setdefault(member_id, []).append(month)
+
+    values = []
+    for member_id, joined, status in session.query(Member.id, Member.date_joined, Member.status):
+        coverage = Coverage.from_months(months.get(member_id, []), joined=joined)
+        streak = coverage.streak(as_of)
+        values.append({
+            'id': member_id,
+            'coverage_start': coverage.start,
+            'contribution_coverage': coverage.bits,
+            'consecutive_months_paid': streak,
+            'qualified_for_benefits': qualifies(status, streak, qualification_period),
+        })
+    return values
+
+
+def rebuild_coverage(as_of=None):
+    """
+    Rebuild every member's coverage bitmask from the contributions table
+
+    Writes the masks, consecutive_months_paid and qualified_for_benefits
+    with one bulk UPDATE: the values Member.update_contribution_stats()
+    would set, for all members at once.
+
+    Returns:
+        Dict with members, months (distinct member-months) and qualified counts
+    """
+    from sqlalchemy import update
+    from app import db
+    from app.models.member import Member
+    from app.utils.settings import get_setting
+
+    values = coverage_values(db.session, as_of, get_setting('QUALIFICATION_PERIOD', 5))
+    if values:
+        db.session.execute(update(Member), values)
+    db.session.commit()
+
+    return {
+        'members': len(values),
+        'months': sum(Coverage(v['coverage_start'], v['contribution_coverage']).paid_months for v in values),
+        'qualified': sum(1 for v in values if v['qualified_for_benefits']),
+    }
@@ -0,0 +1,74 @@
+"""
+Database Engine Options
+Connection pool settings shared by SQLite and PostgreSQL deployments
+"""
+from sqlalchemy import text
+
+
+def pool_options(app, url=None):
+    """
+    Build pool options for an engine URL
+
+    In-memory SQLite uses a single static connection, so it gets none.
+
+    Args:
+        app: Flask app (DB_POOL_* config)
+        url: Database URL (default: SQLALCHEMY_DATABASE_URI)
+
+    Returns:
+        Dict of create_engine keyword arguments
+    """
+    from app.utils.sqlite_profile import is_sqlite_file_url
+
+    url = url or app.config['SQLALCHEMY_DATABASE_URI']
+    if url.startswith('sqlite') and not is_sqlite_file_url(url):
+        return {}
+
+    return {
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        'pool_recycle': app.config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': app.config['DB_POOL_PRE_PING'],
+    }
+
+
+def engine_options(app):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS for the primary engine
+
+    Config:
+        DB_POOL_SIZE: Connections kept open per process
+        DB_MAX_OVERFLOW: Extra connections allowed under load
+        DB_POOL_TIMEOUT: Seconds to wait for a free connection
+        DB_POOL_RECYCLE: Reconnect connections older than this (-1 = never)
+        DB_POOL_PRE_PING: Test connections on checkout (drops stale server connections)
+    """
+    from app.utils.sqlite_profile import sqlite_engine_options
+
+    options = pool_options(app)
+    options.update(sqlite_engine_options(app))
+    return options
+
+
+def reset_sequences(connection, tables):
+    """
+    Move PostgreSQL id sequences past rows inserted with explicit ids
+
+    Bulk loads that assign ids themselves leave the SERIAL sequence at 1,
+    so the next ORM insert would collide. No-op on other backends.
+
+    Args:
+        connection: Connection the rows were inserted on
+        tables: Table objects with an integer 'id' primary key
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    quote = connection.dialect.identifier_preparer.quote
+    for table in tables:
+        if 'id' not in table.c:
+            continue
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{quote(table.name)}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {quote(table.name)}), 0) + 1, false)"
+        ))
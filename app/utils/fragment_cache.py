@@ -0,0 +1,73 @@
+"""
+Fragment Cache
+Jinja {% cache %} tag that stores rendered template fragments in the
+app's cache, so unchanged fragments skip their template logic and the
+queries behind it
+"""
+from jinja2 import nodes
+from jinja2.ext import Extension
+from flask import current_app
+from markupsafe import Markup
+from app.utils.cache import get_cache
+
+
+class FragmentCacheExtension(Extension):
+    """
+    {% cache key[, timeout] %} ... {% endcache %}
+
+    The key is any hashable expression, usually a tuple, and is combined
+    with the template name. Put everything the fragment depends on into
+    it: the user's role, a record id, data_version(...) for the tables it
+    reads. timeout is in seconds: 0 never expires (for keys that include a
+    data version) and the default is CACHE_DEFAULT_TIMEOUT.
+
+    Usage:
+        {% cache ('navbar', current_user.role), 0 %}
+            ...
+        {% endcache %}
+
+        {% cache ('member_status', member.id, data_version('members')), 0 %}
+            ...
+        {% endcache %}
+    """
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [nodes.Const(parser.name), parser.parse_expression()]
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args), [], [], body).set_lineno(lineno)
+
+    def _render(self, template_name, key, timeout, caller):
+        if not current_app.config['FRAGMENT_CACHE_ENABLED']:
+            return caller()
+        cache = get_cache()
+        cache_key = ('fragment', template_name, key)
+        html = cache.get(cache_key)
+        if html is None:
+            html = caller()
+            cache.set(cache_key, html, timeout)
+        return Markup(html)
+
+
+def data_version(*tables):
+    """
+    Version tag for fragment cache keys, from one data_versions query
+
+    Returns:
+        String like "12.4", changing whenever any of the tables changes
+    """
+    from app.models.system import DataVersion
+
+    versions = DataVersion.get_versions(*tables)
+    return '.'.join(str(versions[name]) for name in tables)
+
+
+def init_fragment_cache(app):
+    """Add the {% cache %} tag and data_version() to the Jinja environment"""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.globals['data_version'] = data_version
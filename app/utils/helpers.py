@@ -4,8 +4,8 @@ Common formatting and utility functions used throughout the application
 """
 from datetime import datetime
 import pytz
-import phonenumbers
 from flask import current_app
+from sqlalchemy import select, func, cast, Integer
 
 
 def format_currency(amount):
@@ -20,6 +20,9 @@ def format_currency(amount):
     """
     if amount is None:
         return "UGX 0"
+    if isinstance(amount, int):
+        # Money columns hold whole shillings
+        return f"UGX {amount:,}"
 
     try:
         amount = float(amount)
@@ -88,6 +91,9 @@ def format_phone(phone_number, country_code='UG'):
     if not phone_number:
         return ""
 
+    # Imported on first use; its metadata costs ~20 ms at startup
+    import phonenumbers
+
     try:
         parsed = phonenumbers.parse(phone_number, country_code)
         return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
@@ -109,6 +115,8 @@ def parse_phone(phone_number, country_code='UG'):
     if not phone_number:
         return False, None, "Phone number is required"
 
+    import phonenumbers
+
     try:
         parsed = phonenumbers.parse(phone_number, country_code)
         if phonenumbers.is_valid_number(parsed):
@@ -162,6 +170,25 @@ def get_contribution_month(date_value=None):
     return date_value.strftime('%Y-%m')
 
 
+def last_number_query(column, prefix):
+    """
+    Build a SELECT for the highest numeric suffix of numbers like 'LN-2024-0042'
+
+    The suffix is compared as an integer, so the result does not depend on
+    the database's string collation or on the suffix width.
+
+    Args:
+        column: String column holding the numbers
+        prefix: Fixed part before the sequence, e.g. 'LN-2024-'
+
+    Returns:
+        Select returning the highest sequence (None if there are none yet)
+    """
+    return select(
+        func.max(cast(func.substr(column, len(prefix) + 1), Integer))
+    ).where(column.like(f'{prefix}%'))
+
+
 def calculate_age(date_of_birth):
     """
     Calculate age from date of birth
@@ -0,0 +1,145 @@
+"""
+Loan Aging
+Nightly set-based job: days past due and arrears for every open loan,
+defaults past the LOAN_DEFAULT_DAYS setting, and a daily aging snapshot
+"""
+from datetime import date, datetime
+from sqlalchemy import select, update, delete, insert, func, case, cast, and_, literal, literal_column, Integer, Date, DateTime
+from app import db
+from app.models.loan import Loan, LoanInstalment, LoanAgingSnapshot
+from app.utils.settings import get_setting
+
+
+# Loans that can still fall into (or stay in) arrears
+OPEN_STATUSES = Loan.OPEN_STATUSES
+
+# Upper bound of each bucket in days past due (last bucket is open-ended)
+_BUCKET_LIMITS = [(0, 'Current'), (30, '1-30'), (60, '31-60'), (90, '61-90')]
+
+
+def _days_since(day, as_of):
+    """Whole days from a date expression to as_of, per backend"""
+    if db.engine.dialect.name == 'sqlite':
+        return cast(func.julianday(literal(as_of, Date)) - func.julianday(day), Integer)
+    return literal(as_of, Date) - day
+
+
+def _bucket(days):
+    # Literal SQL (not bind parameters) so GROUP BY matches the select list on PostgreSQL
+    return case(
+        *[(days <= literal_column(str(limit)), literal_column(f"'{name}'")) for limit, name in _BUCKET_LIMITS],
+        else_=literal_column("'90+'")
+    )
+
+
+def age_loans(as_of=None, default_days=None):
+    """
+    Age every open loan and write the day's snapshot
+
+    Runs four set-based statements in one transaction:
+    1. UPDATE loans: days_past_due and arrears_amount from unpaid instalments
+    2. UPDATE loans: status 'Defaulted' and default_date when days_past_due
+       reaches the threshold
+    3. DELETE any snapshot already written for as_of (re-runs replace it)
+    4. INSERT ... SELECT: counts, balances and arrears per aging bucket
+
+    Args:
+        as_of: Aging date (default today)
+        default_days: Days past due before default (default: LOAN_DEFAULT_DAYS setting)
+
+    Returns:
+        Dict with loans_aged, newly_defaulted, default_days and the snapshot rows
+    """
+    as_of = as_of or date.today()
+    if default_days is None:
+        default_days = int(get_setting('LOAN_DEFAULT_DAYS', 30))
+
+    overdue = and_(
+        LoanInstalment.loan_id == Loan.id,
+        LoanInstalment.paid_date.is_(None),
+        LoanInstalment.due_date < as_of
+    )
+    oldest_due = select(func.min(LoanInstalment.due_date)).where(overdue).scalar_subquery()
+    unpaid = LoanInstalment.amount_due - LoanInstalment.principal_paid - LoanInstalment.interest_paid
+    overdue_amount = select(func.coalesce(func.sum(unpaid), 0)).where(overdue).scalar_subquery()
+    no_sync = {'synchronize_session': False}
+
+    aged = db.session.execute(
+        update(Loan).where(Loan.disbursed == True, Loan.status.in_(OPEN_STATUSES)).values(
+            days_past_due=func.coalesce(_days_since(oldest_due, as_of), 0),
+            arrears_amount=overdue_amount
+        ),
+        execution_options=no_sync
+    ).rowcount
+
+    defaulted = db.session.execute(
+        update(Loan).where(
+            Loan.status.in_(('Active', 'Disbursed')),
+            Loan.days_past_due >= default_days
+        ).values(status='Defaulted', default_date=as_of),
+        execution_options=no_sync
+    ).rowcount
+
+    db.session.execute(delete(LoanAgingSnapshot).where(LoanAgingSnapshot.snapshot_date == as_of), execution_options=no_sync)
+    bucket = _bucket(Loan.days_past_due)
+    snapshot = LoanAgingSnapshot.__table__
+    db.session.execute(insert(snapshot).from_select(
+        ['snapshot_date', 'bucket', 'loan_count', 'defaulted_count', 'outstanding', 'arrears', 'created_at'],
+        select(
+            literal(as_of, Date),
+            bucket,
+            func.count(),
+            func.sum(case((Loan.status == 'Defaulted', 1), else_=0)),
+            func.coalesce(func.sum(Loan.balance), 0),
+            func.coalesce(func.sum(Loan.arrears_amount), 0),
+            literal(datetime.utcnow(), DateTime)
+        ).where(
+            Loan.disbursed == True,
+            Loan.status.in_(OPEN_STATUSES),
+            Loan.balance > 0
+        ).group_by(bucket)
+    ))
+    db.session.commit()
+
+    return {
+        'as_of': as_of,
+        'loans_aged': aged,
+        'newly_defaulted': defaulted,
+        'default_days': default_days,
+        'snapshot': aging_snapshot(as_of),
+    }
+
+
+def aging_snapshot(snapshot_date=None):
+    """
+    Snapshot rows for a day (default: the latest snapshot), in bucket order
+
+    Returns:
+        List of LoanAgingSnapshot (empty if the job has not run yet)
+    """
+    if snapshot_date is None:
+        snapshot_date = db.session.query(func.max(LoanAgingSnapshot.snapshot_date)).scalar()
+        if snapshot_date is None:
+            return []
+    rows = LoanAgingSnapshot.query.filter_by(snapshot_date=snapshot_date).all()
+    order = {name: i for i, name in enumerate(LoanAgingSnapshot.BUCKETS)}
+    return sorted(rows, key=lambda row: order.get(row.bucket, len(order)))
+
+
+def arrears_summary(snapshot=None):
+    """
+    Loans in arrears from a snapshot (default: latest)
+
+    Returns:
+        Dict with snapshot_date, loan_count, arrears, defaulted_count, or None
+    """
+    rows = aging_snapshot() if snapshot is None else snapshot
+    if not rows:
+        return None
+    behind = [row for row in rows if row.bucket != 'Current']
+    return {
+        'snapshot_date': rows[0].snapshot_date,
+        'loan_count': sum(row.loan_count for row in behind),
+        'arrears': sum(row.arrears for row in behind),
+        'defaulted_count': sum(row.defaulted_count for row in rows),
+    }
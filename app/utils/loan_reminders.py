@@ -4,16 +4,16 @@ Sends notifications to executives and borrowers one day before loan due date
 """
 from datetime import date, timedelta
 from app import db
-from app.models.loan import Loan
 from app.models.user import User
 from app.models.member import Member
+from app.utils.amortization import unpaid_instalments_due, overdue_loans
 from app.utils.notifications import NotificationService
 from flask import current_app
 
 
 def check_and_send_due_date_reminders():
     """
-    Check for loans due tomorrow and send reminders
+    Check for loan instalments due tomorrow and send reminders
     Should be run daily (via cron job or task scheduler)
 
     Returns:
@@ -21,14 +21,10 @@ def check_and_send_due_date_reminders():
     """
     tomorrow = date.today() + timedelta(days=1)
 
-    # Find all active loans due tomorrow
-    loans_due_tomorrow = Loan.query.filter(
-        Loan.status.in_(['Active', 'Disbursed']),
-        Loan.due_date == tomorrow,
-        Loan.balance > 0
-    ).all()
+    # Unpaid instalments of active loans due tomorrow (indexed schedule rows)
+    instalments_due = unpaid_instalments_due(tomorrow, tomorrow).all()
 
-    if not loans_due_tomorrow:
+    if not instalments_due:
         return {
             'success': True,
             'loans_checked': 0,
@@ -39,15 +35,16 @@ def check_and_send_due_date_reminders():
     notifications_sent = 0
     errors = []
 
-    for loan in loans_due_tomorrow:
+    for instalment in instalments_due:
+        loan = instalment.loan
         try:
             # Send notification to borrower
-            borrower_sent = send_borrower_reminder(loan)
+            borrower_sent = send_borrower_reminder(loan, instalment)
             if borrower_sent:
                 notifications_sent += 1
 
             # Send notification to executives
-            exec_sent = send_executive_reminder(loan)
+            exec_sent = send_executive_reminder(loan, instalment)
             notifications_sent += exec_sent
 
         except Exception as e:
@@ -55,23 +52,26 @@ def check_and_send_due_date_reminders():
 
     return {
         'success': len(errors) == 0,
-        'loans_checked': len(loans_due_tomorrow),
+        'loans_checked': len(instalments_due),
         'notifications_sent': notifications_sent,
         'errors': errors if errors else None
     }
 
 
-def send_borrower_reminder(loan):
+def send_borrower_reminder(loan, instalment=None):
     """
     Send due date reminder to the borrower
 
     Args:
         loan: Loan object
+        instalment: LoanInstalment falling due (default: the loan's final due date and balance)
 
     Returns:
         bool: True if sent successfully
     """
     member = loan.member
+    due_date = instalment.due_date if instalment else loan.due_date
+    amount_due = instalment.outstanding if instalment else loan.balance
 
     if not member:
         return False
@@ -89,7 +89,8 @@ Loan Details:
 - Total Payable: UGX {loan.total_payable:,.0f}
 - Amount Paid: UGX {loan.total_paid:,.0f}
 - Balance Remaining: UGX {loan.balance:,.0f}
-- Due Date: {loan.due_date.strftime('%d/%m/%Y')}
+- Amount Due: UGX {amount_due:,.0f}
+- Due Date: {due_date.strftime('%d/%m/%Y')}
 
 Please ensure you make your payment by the due date to avoid late payment penalties.
 
@@ -117,7 +118,7 @@ Old Timers Savings Club Kiteezi
     # Send SMS
     sms_sent = False
     if member.phone_primary and current_app.config.get('SMS_ENABLED'):
-        sms_message = f"OTSC Reminder: Your loan {loan.loan_number} payment of UGX {loan.balance:,.0f} is due tomorrow ({loan.due_date.strftime('%d/%m/%Y')}). Please make your payment to avoid penalties."
+        sms_message = f"OTSC Reminder: Your loan {loan.loan_number} payment of UGX {amount_due:,.0f} is due tomorrow ({due_date.strftime('%d/%m/%Y')}). Please make your payment to avoid penalties."
         try:
             NotificationService.send_sms(
                 phone_number=member.phone_primary,
@@ -137,8 +138,9 @@ Dear {member.full_name},
 Your loan payment is due tomorrow:
 
 *Loan Number:* {loan.loan_number}
+*Amount Due:* UGX {amount_due:,.0f}
 *Balance:* UGX {loan.balance:,.0f}
-*Due Date:* {loan.due_date.strftime('%d/%m/%Y')}
+*Due Date:* {due_date.strftime('%d/%m/%Y')}
 
 Please make your payment to avoid late fees.
 
@@ -155,16 +157,20 @@ _Old Timers Savings Club Kiteezi_"""
     return email_sent or sms_sent or whatsapp_sent
 
 
-def send_executive_reminder(loan):
+def send_executive_reminder(loan, instalment=None):
     """
     Send due date reminder to all executive members
 
     Args:
         loan: Loan object
+        instalment: LoanInstalment falling due (default: the loan's final due date and balance)
 
     Returns:
         int: Number of executives notified
     """
+    due_date = instalment.due_date if instalment else loan.due_date
+    amount_due = instalment.outstanding if instalment else loan.balance
+
     # Get all executive users
     executives = User.query.filter(
         User.role.in_(['Executive', 'SuperAdmin'])
@@ -188,7 +194,8 @@ Amount Borrowed: UGX {loan.amount_approved:,.0f}
 Total Payable: UGX {loan.total_payable:,.0f}
 Amount Paid: UGX {loan.total_paid:,.0f}
 Balance Remaining: UGX {loan.balance:,.0f}
-Due Date: {loan.due_date.strftime('%d/%m/%Y')}
+Amount Due: UGX {amount_due:,.0f}
+Due Date: {due_date.strftime('%d/%m/%Y')}
 
 The borrower has been notified. Please follow up as necessary.
 
@@ -217,7 +224,7 @@ Old Timers Savings Club Kiteezi System
         # Send SMS to executive if they have a linked member profile
         if hasattr(executive, 'member') and executive.member and executive.member.phone_primary:
             if current_app.config.get('SMS_ENABLED'):
-                sms_message = f"OTSC Alert: Loan {loan.loan_number} for {member.full_name} is due tomorrow. Balance: UGX {loan.balance:,.0f}. Follow up required."
+                sms_message = f"OTSC Alert: Loan {loan.loan_number} for {member.full_name} is due tomorrow. Amount due: UGX {amount_due:,.0f}. Follow up required."
                 try:
                     NotificationService.send_sms(
                         phone_number=executive.member.phone_primary,
@@ -232,40 +239,23 @@ Old Timers Savings Club Kiteezi System
 
 def get_overdue_loans():
     """
-    Get all loans that are overdue (past due date with outstanding balance)
+    Get active loans with overdue instalments
 
     Returns:
-        list: List of overdue Loan objects
+        list: (loan, oldest overdue due date, arrears amount) tuples, oldest first
     """
-    today = date.today()
-
-    overdue_loans = Loan.query.filter(
-        Loan.status.in_(['Active', 'Disbursed']),
-        Loan.due_date < today,
-        Loan.balance > 0
-    ).order_by(Loan.due_date).all()
-
-    return overdue_loans
+    return overdue_loans(date.today())
 
 
 def get_upcoming_due_loans(days=7):
     """
-    Get loans due within the next specified number of days
+    Get unpaid instalments falling due within the next specified number of days
 
     Args:
         days (int): Number of days to look ahead (default: 7)
 
     Returns:
-        list: List of Loan objects
+        list: LoanInstalment objects ordered by due date (instalment.loan is loaded)
     """
     today = date.today()
-    future_date = today + timedelta(days=days)
-
-    upcoming_loans = Loan.query.filter(
-        Loan.status.in_(['Active', 'Disbursed']),
-        Loan.due_date >= today,
-        Loan.due_date <= future_date,
-        Loan.balance > 0
-    ).order_by(Loan.due_date).all()
-
-    return upcoming_loans
+    return unpaid_instalments_due(today, today + timedelta(days=days)).all()
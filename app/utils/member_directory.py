@@ -0,0 +1,92 @@
+"""
+Member Directory
+Compact, versioned snapshot of all members used by member picker forms
+"""
+import json
+from app import db
+from app.utils.cache import get_cache
+
+
+# Column version bumped when a member's directory fields or user link change
+# (see DataVersion.COLUMN_VERSIONS); logins and contribution totals leave it
+DIRECTORY_VERSION = 'member_directory'
+
+# Fields other users get, enough to pick a guarantor
+BASIC_FIELDS = ('id', 'number', 'name', 'qualified')
+
+
+def get_directory_version():
+    """
+    Get the current directory version tag
+
+    Returns:
+        String like "12", the member_directory column version
+    """
+    from app.models.system import DataVersion
+
+    return str(DataVersion.get_versions(DIRECTORY_VERSION)[DIRECTORY_VERSION])
+
+
+def build_member_directory():
+    """
+    Build the directory in a single query
+
+    Returns:
+        List of member dicts ordered by member number
+    """
+    from app.models.member import Member
+    from app.models.user import User
+
+    rows = db.session.query(
+        Member.id,
+        Member.member_number,
+        Member.full_name,
+        Member.status,
+        Member.qualified_for_benefits,
+        Member.phone_primary,
+        User.id
+    ).outerjoin(
+        User, User.member_id == Member.id
+    ).order_by(
+        Member.member_number
+    ).all()
+
+    return [
+        {
+            'id': member_id,
+            'number': number,
+            'name': name,
+            'status': status,
+            'qualified': bool(qualified),
+            'phone': phone,
+            'has_user': user_id is not None
+        }
+        for member_id, number, name, status, qualified, phone, user_id in rows
+    ]
+
+
+def get_member_directory(full=False):
+    """
+    Get the serialized directory for the current data version
+
+    Args:
+        full: Every member with status, user account flag and phone
+              (executive forms only). Otherwise only Active members,
+              with BASIC_FIELDS.
+
+    Returns:
+        Tuple (version, json_bytes)
+    """
+    version = get_directory_version()
+    scope = 'full' if full else 'basic'
+    cache = get_cache()
+
+    def serialize():
+        members = cache.get_or_set(('member_directory', version), build_member_directory, timeout=0)
+        if not full:
+            members = [{k: m[k] for k in BASIC_FIELDS} for m in members if m['status'] == 'Active']
+        payload = {'version': version, 'members': members}
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+    body = cache.get_or_set(('member_directory_json', version, scope), serialize, timeout=0)
+    return f'{version}-{scope}', body
@@ -0,0 +1,167 @@
+"""
+Membership Evaluation
+Set-based job: months missed for every member, suspension and expulsion
+past the configured thresholds, qualification and expulsion refunds
+"""
+import json
+from datetime import date
+from sqlalchemy import select, update, func, cast, extract, Integer
+from app import db
+from app.models.member import Member
+from app.models.contribution import Contribution
+from app.models.user import User
+from app.models.audit import AuditLog
+from app.utils.coverage import Coverage, qualifies
+from app.utils.settings import get_settings
+
+
+# Members whose contributions are still expected
+EVALUATED_STATUSES = ('Active', 'Suspended')
+
+
+def _month_index(year, month):
+    return year * 12 + month
+
+
+def _months_missed(as_of):
+    """
+    SQL expression: whole months since the member's latest paid month
+
+    Only this trailing gap counts towards suspension and expulsion; earlier
+    gaps that were followed by a payment do not (Coverage.months_in_arrears
+    counts those). The month in progress is not counted; a member who joined without
+    contributing is counted from their joining month. The latest paid month
+    comes from ix_contributions_member_month, one index seek per member.
+    """
+    last_paid = select(func.max(Contribution.contribution_month)).where(
+        Contribution.member_id == Member.id
+    ).scalar_subquery()
+    last_index = func.coalesce(
+        _month_index(cast(func.substr(last_paid, 1, 4), Integer), cast(func.substr(last_paid, 6, 2), Integer)),
+        _month_index(cast(extract('year', Member.date_joined), Integer),
+                     cast(extract('month', Member.date_joined), Integer)) - 1
+    )
+    missed = _month_index(as_of.year, as_of.month) - 1 - last_index
+    # Scalar two-argument max so the subquery appears once
+    if db.engine.dialect.name == 'sqlite':
+        return func.max(missed, 0)
+    return func.greatest(missed, 0)
+
+
+def evaluate_membership(as_of=None, user_id=None):
+    """
+    Apply the suspension, expulsion and qualification rules to every member
+
+    Runs a fixed number of statements in one transaction, whatever the
+    membership size:
+    1. UPDATE members: months_missed for Active and Suspended members
+    2. UPDATE members: 'Expelled' at EXPULSION_THRESHOLD months, with
+       expulsion_date and refund_amount (EXPELLED_REFUND_PERCENTAGE of
+       total_contributed)
+    3. UPDATE users: deactivate the expelled members' logins
+    4. UPDATE members: 'Suspended' at SUSPENSION_THRESHOLD months
+    5. SELECT, then one bulk UPDATE by id: consecutive_months_paid from the
+       coverage bitmask as of the evaluation date, and qualified_for_benefits
+       from QUALIFICATION_PERIOD (see qualifies()), for Active members
+    6. INSERT audit_logs: one summary row
+
+    Suspended members are not reactivated automatically; an executive
+    still does that from the member page.
+
+    Args:
+        as_of: Evaluation date (default today)
+        user_id: User recorded on the audit row (default: first SuperAdmin)
+
+    Returns:
+        Dict with as_of, evaluated, suspended and expelled (member numbers),
+        qualification_changes and thresholds
+    """
+    as_of = as_of or date.today()
+    settings = get_settings()
+    thresholds = {
+        'suspension': settings.get('SUSPENSION_THRESHOLD'),
+        'expulsion': settings.get('EXPULSION_THRESHOLD'),
+        'qualification': settings.get('QUALIFICATION_PERIOD'),
+        'refund_percentage': settings.get('EXPELLED_REFUND_PERCENTAGE'),
+    }
+    no_sync = {'synchronize_session': False}
+
+    evaluated = db.session.execute(
+        update(Member).where(Member.status.in_(EVALUATED_STATUSES)).values(months_missed=_months_missed(as_of)),
+        execution_options=no_sync
+    ).rowcount
+
+    # Integer shillings, rounded half up
+    refund = (func.coalesce(Member.total_contributed, 0) * thresholds['refund_percentage'] + 50) // 100
+    expelled = db.session.execute(
+        update(Member).where(
+            Member.status.in_(EVALUATED_STATUSES),
+            Member.months_missed >= thresholds['expulsion']
+        ).values(
+            status='Expelled',
+            expulsion_date=as_of,
+            expulsion_reason=f"Missed {thresholds['expulsion']} or more monthly contributions",
+            refund_amount=refund,
+            refund_paid=False,
+            qualified_for_benefits=False
+        ).returning(Member.id, Member.member_number),
+        execution_options=no_sync
+    ).all()
+    if expelled:
+        db.session.execute(
+            update(User).where(User.member_id.in_([row.id for row in expelled])).values(is_active=False),
+            execution_options=no_sync
+        )
+
+    suspended = db.session.execute(
+        update(Member).where(
+            Member.status == 'Active',
+            Member.months_missed >= thresholds['suspension']
+        ).values(
+            status='Suspended',
+            suspension_date=as_of,
+            qualified_for_benefits=False
+        ).returning(Member.member_number),
+        execution_options=no_sync
+    ).scalars().all()
+
+    # Streaks come from the coverage bitmasks as of the evaluation date: the
+    # stored consecutive_months_paid is only as fresh as the last contribution
+    changes = []
+    qualification_changes = 0
+    for member_id, start, bits, streak, qualified in db.session.execute(
+        select(Member.id, Member.coverage_start, Member.contribution_coverage,
+               Member.consecutive_months_paid, Member.qualified_for_benefits).where(Member.status == 'Active')
+    ):
+        current = Coverage(start, bits).streak(as_of)
+        qualified_now = qualifies('Active', current, thresholds['qualification'])
+        if current != streak or qualified_now != qualified:
+            changes.append({'id': member_id, 'consecutive_months_paid': current,
+                            'qualified_for_benefits': qualified_now})
+            qualification_changes += qualified_now != qualified
+    if changes:
+        db.session.execute(update(Member), changes)
+
+    expelled = [row.member_number for row in expelled]
+    if user_id is None:
+        user_id = db.session.query(User.id).filter_by(role='SuperAdmin').order_by(User.id).limit(1).scalar()
+    if user_id is not None:
+        db.session.add(AuditLog(
+            user_id=user_id,
+            action_type='MembershipEvaluation',
+            entity_type='Member',
+            description=(f'Membership evaluated as of {as_of.strftime("%d/%m/%Y")}: '
+                         f'{evaluated} evaluated, {len(suspended)} suspended, {len(expelled)} expelled'),
+            new_values=json.dumps({'suspended': suspended, 'expelled': expelled, 'thresholds': thresholds})
+        ))
+    db.session.commit()
+
+    return {
+        'as_of': as_of,
+        'evaluated': evaluated,
+        'suspended': suspended,
+        'expelled': expelled,
+        'qualification_changes': qualification_changes,
+        'thresholds': thresholds,
+    }
+
@@ -0,0 +1,282 @@
+"""
+Request Metrics
+Per-endpoint request counts and latency split into DB, template
+and outbound (SMTP/SMS/WhatsApp) time
+"""
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Latency histogram buckets in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTiming:
+    """Time spent in each phase of the current request"""
+
+    __slots__ = ('started', 'db', 'queries', 'template', 'template_started', 'outbound')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.template = 0.0
+        self.template_started = None
+        self.outbound = 0.0
+
+
+class EndpointStats:
+    """Accumulated metrics for one endpoint/method pair"""
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'buckets', 'db', 'queries', 'template', 'outbound')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.db = 0.0
+        self.queries = 0
+        self.template = 0.0
+        self.outbound = 0.0
+
+    def observe(self, duration, timing, status_code):
+        self.count += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+                break
+        self.db += timing.db
+        self.queries += timing.queries
+        self.template += timing.template
+        self.outbound += timing.outbound
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Upper bucket bound containing the q-th percentile (None if above all buckets)"""
+        target = self.count * q
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return None
+
+
+class RequestMetrics:
+    """
+    In-process metrics registry
+
+    Counters live in each worker process; scrape every worker (or run a
+    single worker) to see the full picture.
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._outbound = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def init_app(self, app):
+        """Register request hooks on the Flask app"""
+        app.extensions['metrics'] = self
+
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+        before_render_template.connect(_template_started, app, weak=False)
+        template_rendered.connect(_template_finished, app, weak=False)
+
+        app.before_request(_start_timing)
+        app.after_request(self._finish_timing)
+
+    def _finish_timing(self, response):
+        timing = g.pop('_request_timing', None)
+        if timing is not None:
+            duration = time.perf_counter() - timing.started
+            endpoint = request.endpoint or '<unmatched>'
+            self.observe(endpoint, request.method, duration, timing, response.status_code)
+        return response
+
+    def observe(self, endpoint, method, duration, timing, status_code):
+        """Record one finished request"""
+        with self._lock:
+            stats = self._endpoints.get((endpoint, method))
+            if stats is None:
+                stats = self._endpoints[(endpoint, method)] = EndpointStats()
+            stats.observe(duration, timing, status_code)
+
+    def observe_outbound(self, service, duration, ok):
+        """Record one outbound call (also outside requests, e.g. CLI jobs)"""
+        with self._lock:
+            calls, failures, total = self._outbound.get(service, (0, 0, 0.0))
+            self._outbound[service] = (calls + 1, failures + (0 if ok else 1), total + duration)
+
+    def snapshot(self):
+        """
+        Copy current metrics
+
+        Returns:
+            Tuple (endpoints, outbound) where endpoints is a list of
+            ((endpoint, method), EndpointStats) sorted by total time
+        """
+        with self._lock:
+            endpoints = []
+            for key, stats in self._endpoints.items():
+                copy = EndpointStats()
+                for slot in EndpointStats.__slots__:
+                    value = getattr(stats, slot)
+                    setattr(copy, slot, list(value) if slot == 'buckets' else value)
+                endpoints.append((key, copy))
+            outbound = dict(self._outbound)
+
+        endpoints.sort(key=lambda item: item[1].total, reverse=True)
+        return endpoints, outbound
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._endpoints.clear()
+            self._outbound.clear()
+            self.started_at = time.time()
+
+    def render_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        endpoints, outbound = self.snapshot()
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def labels(endpoint, method, **extra):
+            pairs = [('endpoint', endpoint), ('method', method)] + list(extra.items())
+            return ','.join(f'{k}="{_escape_label(v)}"' for k, v in pairs)
+
+        header('app_request_duration_seconds', 'histogram', 'Request latency by endpoint')
+        for (endpoint, method), stats in endpoints:
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'app_request_duration_seconds_bucket{{{labels(endpoint, method, le=bound)}}} {cumulative}')
+            lines.append(f'app_request_duration_seconds_bucket{{{labels(endpoint, method, le="+Inf")}}} {stats.count}')
+            lines.append(f'app_request_duration_seconds_sum{{{labels(endpoint, method)}}} {stats.total:.6f}')
+            lines.append(f'app_request_duration_seconds_count{{{labels(endpoint, method)}}} {stats.count}')
+
+        counters = (
+            ('app_request_errors_total', 'Requests answered with a 5xx status', 'errors', '{}'),
+            ('app_request_db_seconds_total', 'Time spent executing SQL', 'db', '{:.6f}'),
+            ('app_request_db_queries_total', 'SQL statements executed', 'queries', '{}'),
+            ('app_request_template_seconds_total', 'Time spent rendering templates', 'template', '{:.6f}'),
+            ('app_request_outbound_seconds_total', 'Time spent in SMTP/SMS/WhatsApp calls', 'outbound', '{:.6f}'),
+        )
+        for name, help_text, attr, fmt in counters:
+            header(name, 'counter', help_text)
+            for (endpoint, method), stats in endpoints:
+                lines.append(f'{name}{{{labels(endpoint, method)}}} {fmt.format(getattr(stats, attr))}')
+
+        outbound_counters = (
+            ('app_outbound_calls_total', 'Outbound notification calls by service', 0, '{}'),
+            ('app_outbound_failures_total', 'Failed outbound notification calls by service', 1, '{}'),
+            ('app_outbound_seconds_total', 'Time spent in outbound calls by service', 2, '{:.6f}'),
+        )
+        for name, help_text, index, fmt in outbound_counters:
+            header(name, 'counter', help_text)
+            for service, values in sorted(outbound.items()):
+                lines.append(f'{name}{{service="{_escape_label(service)}"}} {fmt.format(values[index])}')
+
+        header('app_metrics_start_time_seconds', 'gauge', 'When counters were last reset')
+        lines.append(f'app_metrics_start_time_seconds {self.started_at:.0f}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _current_timing():
+    if has_request_context():
+        return g.get('_request_timing')
+    return None
+
+
+def _start_timing():
+    g._request_timing = RequestTiming()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['_metrics_query_start'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('_metrics_query_start', None)
+    timing = _current_timing()
+    if timing is not None and started is not None:
+        timing.db += time.perf_counter() - started
+        timing.queries += 1
+
+
+def _template_started(sender, template, context, **extra):
+    timing = _current_timing()
+    if timing is not None and timing.template_started is None:
+        timing.template_started = time.perf_counter()
+
+
+def _template_finished(sender, template, context, **extra):
+    timing = _current_timing()
+    if timing is not None and timing.template_started is not None:
+        timing.template += time.perf_counter() - timing.template_started
+        timing.template_started = None
+
+
+@contextmanager
+def track_outbound(service):
+    """
+    Time an outbound call (SMTP, SMS gateway, WhatsApp API)
+
+    Usage:
+        with track_outbound('sms') as call:
+            response = requests.post(...)
+            call.ok = response.status_code == 200
+    """
+    from flask import current_app
+
+    call = _OutboundCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call.ok = False
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        timing = _current_timing()
+        if timing is not None:
+            timing.outbound += duration
+        registry = current_app.extensions.get('metrics')
+        if registry is not None:
+            registry.observe_outbound(service, duration, call.ok)
+
+
+class _OutboundCall:
+    __slots__ = ('ok',)
+
+    def __init__(self):
+        self.ok = True
@@ -5,7 +5,7 @@ Supports Email, SMS, and WhatsApp notifications
 from flask import current_app, render_template_string
 from flask_mail import Message
 from app import mail, db
-import requests
+from app.utils.metrics import track_outbound
 from datetime import datetime
 
 
@@ -180,7 +180,8 @@ Old Timers Savings Club Kiteezi
                 body=body,
                 sender=current_app.config.get('MAIL_DEFAULT_SENDER', 'noreply@oldtimerssavings.org')
             )
-            mail.send(msg)
+            with track_outbound('smtp'):
+                mail.send(msg)
             current_app.logger.info(f"Email sent to {recipient}: {subject}")
             return True
         except Exception as e:
@@ -205,17 +206,22 @@ Old Timers Savings Club Kiteezi
             elif not phone.startswith('+') and not phone.startswith('256'):
                 phone = '256' + phone
 
+            # Imported on first use so CLI jobs and workers start without it
+            import requests
+
             # Example API call - adjust based on your SMS provider
-            response = requests.post(
-                sms_api_url,
-                json={
-                    'to': phone,
-                    'message': message,
-                    'sender_id': sms_sender_id,
-                    'api_key': sms_api_key
-                },
-                timeout=10
-            )
+            with track_outbound('sms') as call:
+                response = requests.post(
+                    sms_api_url,
+                    json={
+                        'to': phone,
+                        'message': message,
+                        'sender_id': sms_sender_id,
+                        'api_key': sms_api_key
+                    },
+                    timeout=10
+                )
+                call.ok = response.status_code == 200
 
             if response.status_code == 200:
                 current_app.logger.info(f"SMS sent to {phone}")
@@ -261,12 +267,16 @@ Old Timers Savings Club Kiteezi
                 }
             }
 
-            response = requests.post(
-                f"{whatsapp_api_url}/{whatsapp_phone_id}/messages",
-                headers=headers,
-                json=payload,
-                timeout=10
-            )
+            import requests
+
+            with track_outbound('whatsapp') as call:
+                response = requests.post(
+                    f"{whatsapp_api_url}/{whatsapp_phone_id}/messages",
+                    headers=headers,
+                    json=payload,
+                    timeout=10
+                )
+                call.ok = response.status_code in [200, 201]
 
             if response.status_code in [200, 201]:
                 current_app.logger.info(f"WhatsApp sent to {phone}")
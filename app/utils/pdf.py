@@ -0,0 +1,18 @@
+"""
+PDF Helpers
+Shared reportlab setup for receipts
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def receipt_styles():
+    """
+    Sample stylesheet shared by all receipts
+
+    getSampleStyleSheet() builds ~20 ParagraphStyle objects on every call;
+    receipts only read from it, so one instance per process is enough.
+    Prefork deployments build it in the master (see app/utils/preload.py).
+    """
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
@@ -0,0 +1,134 @@
+"""
+Prefork Preloading
+Builds and warms the app once in the server master so forked workers
+share its memory copy-on-write instead of repeating the work
+"""
+import gc
+import io
+import time
+
+
+def _warm_models(app):
+    """Configure every ORM mapper (otherwise done on the first query)"""
+    from sqlalchemy.orm import configure_mappers
+    from app.migrations import load_models
+
+    load_models()
+    configure_mappers()
+
+
+def _warm_templates(app):
+    """Compile every Jinja template into the environment's cache"""
+    from app.utils.template_cache import precompile_templates
+    precompile_templates(app)
+
+
+def _warm_pdf(app):
+    """Import reportlab, build the receipt styles and load the font metrics"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph
+    from app.utils.pdf import receipt_styles
+
+    styles = receipt_styles()
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4)
+    doc.build([Paragraph('<b>Receipt</b>', styles['Title']), Table([['Amount:', 'UGX 0']])])
+
+
+def _warm_phone_numbers(app):
+    """Load phonenumbers and its metadata for the default region"""
+    from app.utils.helpers import format_phone
+    format_phone('0700000000')
+
+
+def _warm_settings(app):
+    """Load the settings snapshot and data versions (also checks the database)"""
+    from app.models.system import DataVersion
+    from app.utils.settings import get_settings
+    from app import db
+
+    with app.app_context():
+        get_settings().snapshot()
+        DataVersion.query.all()
+        db.session.remove()
+
+
+# (name, function, web mode only)
+WARMERS = [
+    ('models', _warm_models, False),
+    ('templates', _warm_templates, True),
+    ('pdf', _warm_pdf, True),
+    ('phone_numbers', _warm_phone_numbers, False),
+    ('settings', _warm_settings, False),
+]
+
+
+def warm_caches(app):
+    """
+    Run every warmer for the app's mode
+
+    A failing warmer is logged and skipped; the worker then does that
+    work on first use, as without preloading.
+
+    Returns:
+        Dict of warmer name -> milliseconds taken
+    """
+    web = app.config['APP_MODE'] == 'web'
+    timings = {}
+    for name, warm, web_only in WARMERS:
+        if web_only and not web:
+            continue
+        start = time.perf_counter()
+        try:
+            warm(app)
+        except Exception as e:
+            app.logger.warning(f'Preload warmer {name} failed: {e}')
+            continue
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def prepare_for_fork(app):
+    """
+    Close pooled connections and freeze the heap before forking
+
+    Sockets and SQLite handles must not be shared between processes, so
+    every engine's pool is emptied. gc.freeze() moves all objects built so
+    far into a permanent generation that the collector never scans, so
+    collections in the workers don't write to (and un-share) those pages.
+    """
+    from app import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    gc.collect()
+    gc.freeze()
+
+
+def preload(app):
+    """
+    Warm caches and prepare the app for forking (call once in the master)
+
+    Returns:
+        Dict of warmer name -> milliseconds taken
+    """
+    timings = warm_caches(app)
+    prepare_for_fork(app)
+    app.logger.info(
+        'Preloaded for fork: ' + ', '.join(f'{name} {ms:.0f} ms' for name, ms in timings.items())
+    )
+    return timings
+
+
+def after_fork(app):
+    """
+    Reset inherited connection pools in a newly forked worker
+
+    dispose(close=False) drops the pool without closing connections the
+    parent may still be using, so each worker opens its own.
+    """
+    from app import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
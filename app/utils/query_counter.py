@@ -0,0 +1,187 @@
+"""
+Query Counter
+Per-request SQL statement counting and N+1 detection
+"""
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Active recorders for the current thread (request recorder and/or test budgets)
+_local = threading.local()
+
+_NUMBER_RE = re.compile(r'\b\d+(\.\d+)?\b')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:\?|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+_SELECT_LIST_RE = re.compile(r'^SELECT .+? FROM ', re.IGNORECASE)
+
+
+def fingerprint(statement):
+    """
+    Normalize a SQL statement so repeated queries with different
+    parameters share the same fingerprint
+
+    Args:
+        statement: SQL text as sent to the DBAPI cursor
+
+    Returns:
+        Normalized statement string
+    """
+    text = _STRING_RE.sub('?', statement)
+    text = _NUMBER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('IN (...)', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _summarize(sql, max_length=200):
+    """Shorten a fingerprint for log output (column lists add little)"""
+    sql = _SELECT_LIST_RE.sub('SELECT ... FROM ', sql, count=1)
+    return sql if len(sql) <= max_length else sql[:max_length] + '...'
+
+
+class QueryRecorder:
+    """Collects statements executed while it is active"""
+
+    def __init__(self):
+        self.count = 0
+        self.fingerprints = Counter()
+
+    def record(self, statement):
+        """Record one executed statement"""
+        self.count += 1
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold):
+        """
+        Get statements repeated at least threshold times (likely N+1)
+
+        Returns:
+            List of (fingerprint, count) tuples, most frequent first
+        """
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+
+def _active_recorders():
+    if not hasattr(_local, 'recorders'):
+        _local.recorders = []
+    return _local.recorders
+
+
+@contextmanager
+def record_queries():
+    """
+    Record every statement executed on this thread inside the block
+
+    Usage:
+        with record_queries() as recorder:
+            ...
+        print(recorder.count)
+    """
+    recorder = QueryRecorder()
+    recorders = _active_recorders()
+    recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        recorders.remove(recorder)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for recorder in getattr(_local, 'recorders', ()):
+        recorder.record(statement)
+
+
+@contextmanager
+def assert_max_queries(n):
+    """
+    Fail if the block issues more than n SQL statements
+
+    Intended for tests, so each route can carry a query budget:
+
+        with assert_max_queries(12):
+            client.get('/contributions/')
+
+    Raises:
+        AssertionError: Listing the repeated statements when over budget
+    """
+    with record_queries() as recorder:
+        yield recorder
+
+    if recorder.count > n:
+        repeated = recorder.repeated(2)
+        detail = '\n'.join(f'  {count}x {_summarize(sql)}' for sql, count in repeated[:10])
+        raise AssertionError(
+            f'Expected at most {n} queries, {recorder.count} were executed'
+            + (f'\nRepeated statements:\n{detail}' if detail else '')
+        )
+
+
+def _start_request_recorder():
+    recorders = _active_recorders()
+    g._query_recorder = QueryRecorder()
+    recorders.append(g._query_recorder)
+
+
+def _finish_request_recorder(response):
+    recorder = g.pop('_query_recorder', None)
+    if recorder is None:
+        return response
+    _stop_recorder(recorder)
+
+    if current_app.config['QUERY_COUNT_HEADER']:
+        response.headers['X-Query-Count'] = str(recorder.count)
+
+    threshold = current_app.config['QUERY_COUNT_WARN_THRESHOLD']
+    if threshold and recorder.count > threshold:
+        current_app.logger.warning(
+            f"{request.method} {request.path} executed {recorder.count} queries "
+            f"(threshold {threshold})"
+        )
+
+    repeat_threshold = current_app.config['N_PLUS_ONE_THRESHOLD']
+    if repeat_threshold:
+        for sql, count in recorder.repeated(repeat_threshold):
+            current_app.logger.warning(
+                f"Possible N+1 on {request.method} {request.path}: {count}x {_summarize(sql)}"
+            )
+
+    return response
+
+
+def _stop_recorder(recorder):
+    recorders = getattr(_local, 'recorders', [])
+    if recorder in recorders:
+        recorders.remove(recorder)
+
+
+def _teardown_request_recorder(exc):
+    # after_request is skipped on unhandled errors; never leak the recorder
+    recorder = g.pop('_query_recorder', None)
+    if recorder is not None:
+        _stop_recorder(recorder)
+
+
+def init_query_counter(app):
+    """
+    Install statement counting on all engines and per-request reporting
+
+    Config:
+        QUERY_COUNTER_ENABLED: Count statements per request
+        QUERY_COUNT_HEADER: Add X-Query-Count response header
+        QUERY_COUNT_WARN_THRESHOLD: Log requests issuing more statements (0 = off)
+        N_PLUS_ONE_THRESHOLD: Log statements repeated this often in a request (0 = off)
+    """
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+
+    if not app.config['QUERY_COUNTER_ENABLED']:
+        return
+
+    app.before_request(_start_request_recorder)
+    app.after_request(_finish_request_recorder)
+    app.teardown_request(_teardown_request_recorder)
@@ -0,0 +1,161 @@
+"""
+Read/Write Session Routing
+Sends SELECTs from reports, dashboards and exports to a read-only engine
+so long reads run on one consistent snapshot without blocking data entry
+"""
+import sqlite3
+from contextlib import contextmanager
+from urllib.parse import quote
+from flask import g, request, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.elements import TextClause
+
+
+# SQLALCHEMY_BINDS key of the read-only engine
+READ_BIND = 'read'
+
+
+def _reads_routed():
+    return has_app_context() and g.get('_db_read_only', False)
+
+
+def _is_read(clause):
+    if clause is None:
+        return False
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() in ('SELECT', 'WITH ')
+    return getattr(clause, 'is_select', False)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to the read engine while reads are routed
+
+    Flushes, bulk UPDATE/DELETE and session.connection() always use the
+    primary engine, so a routed view can still write (e.g. audit logs).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _reads_routed() and _is_read(clause):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_only():
+    """
+    Route reads inside the block (or decorated view) to the read engine
+
+    Usage:
+        @reports.route('/export')
+        @login_required
+        @read_only()
+        def export():
+            ...
+
+        with read_only():
+            rows = Contribution.query.all()
+    """
+    previous = g.get('_db_read_only', False)
+    g._db_read_only = True
+    try:
+        yield
+    finally:
+        g._db_read_only = previous
+
+
+def read_bind_options(app):
+    """
+    Build the SQLALCHEMY_BINDS entry for the read engine
+
+    SQLite files are reopened with mode=ro; other backends use
+    READ_DATABASE_URL (a replica) or the primary URL with REPEATABLE READ
+    so each request still reads one snapshot.
+
+    Returns:
+        Engine options dict, or None when routing is disabled or the
+        database is in memory
+    """
+    from app.utils.database import pool_options
+    from app.utils.sqlite_profile import RetryingConnection, is_sqlite_file_url
+
+    if not app.config['READ_ROUTING_ENABLED']:
+        return None
+
+    primary = app.config['SQLALCHEMY_DATABASE_URI']
+    url = app.config.get('READ_DATABASE_URL') or primary
+
+    if url.startswith('sqlite'):
+        if not is_sqlite_file_url(url):
+            return None
+        uri = f'file:{quote(make_url(url).database)}?mode=ro'
+
+        def connect():
+            return sqlite3.connect(uri, uri=True, factory=RetryingConnection, check_same_thread=False)
+
+        return {'url': url, 'creator': connect, **pool_options(app, url)}
+
+    return {'url': url, 'isolation_level': 'REPEATABLE READ', **pool_options(app, url)}
+
+
+def init_read_routing(app):
+    """
+    Configure the read engine and route matching endpoints to it
+
+    Config:
+        READ_ROUTING_ENABLED: Use a read-only engine for routed requests
+        READ_DATABASE_URL: Replica URL (default: the primary database, read-only)
+        READ_ONLY_ENDPOINTS: Endpoint names or blueprint prefixes ending in '.'
+    """
+    from app import db
+
+    endpoints = tuple(app.config['READ_ONLY_ENDPOINTS'])
+
+    with app.app_context():
+        engine = db.engines.get(READ_BIND)
+        if engine is None:
+            return
+        if engine.dialect.name == 'sqlite':
+            _init_sqlite_snapshots(app, engine)
+
+    @app.before_request
+    def route_reads():
+        endpoint = request.endpoint or ''
+        if any(endpoint == e or (e.endswith('.') and endpoint.startswith(e)) for e in endpoints):
+            g._db_read_only = True
+
+
+def _init_sqlite_snapshots(app, engine):
+    """
+    Open an explicit read transaction on first use so every SELECT of a
+    request sees the same snapshot
+
+    Only in WAL mode: with a rollback journal the transaction's SHARED lock
+    would block writers until the request ends, so reads stay per-statement.
+    """
+    from app.utils.sqlite_profile import RetryingConnection, pragma_profile
+
+    pragmas = pragma_profile(app.config, read_only=True)
+    retries = int(app.config.get('SQLITE_LOCK_RETRIES') or 0)
+    backoff = float(app.config.get('SQLITE_LOCK_RETRY_BACKOFF') or 0.05)
+
+    @event.listens_for(engine, 'connect')
+    def configure(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, RetryingConnection):
+            dbapi_connection.lock_retries = retries
+            dbapi_connection.lock_retry_backoff = backoff
+        for name, value in pragmas:
+            dbapi_connection.execute(f'PRAGMA {name} = {value}')
+        journal_mode = dbapi_connection.execute('PRAGMA journal_mode').fetchone()[0]
+        connection_record.info['snapshot'] = str(journal_mode).lower() == 'wal'
+        # Take transaction control from the driver so BEGIN is emitted below
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def begin(connection):
+        if connection.connection.info.get('snapshot'):
+            connection.exec_driver_sql('BEGIN')
@@ -0,0 +1,87 @@
+"""
+Settings Service
+Single source for configurable values: system_settings rows, falling back
+to app.config (environment) and then the caller's default. All settings
+are held in an immutable snapshot that is reloaded only when the
+system_settings data version changes
+"""
+import time
+from types import MappingProxyType
+from flask import current_app
+
+
+SETTINGS_TABLE = 'system_settings'
+
+# Setting keys whose app.config counterpart has a different name
+CONFIG_KEYS = {
+    'MAX_LOAN_PERIOD': 'LOAN_MAX_PERIOD',
+}
+
+
+class SettingsService:
+    """
+    Versioned, in-process snapshot of system settings
+
+    Lookups are dict reads. At most once per check interval a lookup reads
+    the system_settings version (one primary-key query); the snapshot is
+    rebuilt, with one query, only when that version has moved. Writes through
+    SystemSetting.set_value() bump the version in the same transaction, so
+    every worker sees an edit within one interval, and the editing worker
+    at once.
+    """
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self.config = {}
+        # (version, checked_at, values), replaced as a whole
+        self._state = None
+
+    def init_app(self, app):
+        """Register the service on the Flask app"""
+        self.check_interval = app.config.get('SETTINGS_CHECK_INTERVAL', self.check_interval)
+        self.config = app.config
+        app.extensions['settings'] = self
+
+    def _load(self):
+        from app.models.system import SystemSetting
+        return MappingProxyType({s.setting_key: s.get_value() for s in SystemSetting.query.all()})
+
+    def snapshot(self):
+        """
+        Current settings
+
+        Returns:
+            Read-only mapping of setting key -> typed value
+        """
+        from app.models.system import DataVersion
+
+        state = self._state
+        now = time.monotonic()
+        if state is not None and now - state[1] < self.check_interval:
+            return state[2]
+
+        version = DataVersion.get_versions(SETTINGS_TABLE)[SETTINGS_TABLE]
+        values = state[2] if state is not None and state[0] == version else self._load()
+        self._state = (version, now, values)
+        return values
+
+    def get(self, key, default=None):
+        """Setting value, else the app.config value, else default"""
+        values = self.snapshot()
+        if key in values:
+            return values[key]
+        return self.config.get(CONFIG_KEYS.get(key, key), default)
+
+    def invalidate(self):
+        """Drop the snapshot so the next lookup checks the version"""
+        self._state = None
+
+
+def get_settings():
+    """Get the settings service registered on the current app"""
+    return current_app.extensions['settings']
+
+
+def get_setting(key, default=None):
+    """Shortcut for get_settings().get(key, default)"""
+    return current_app.extensions['settings'].get(key, default)
@@ -0,0 +1,379 @@
+"""
+SQLite Production Profile
+Connection pragmas, lock retries and online maintenance (WAL checkpoints,
+incremental vacuum, backups) for SQLite deployments
+"""
+import logging
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime
+from sqlalchemy import event
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+AUTO_VACUUM_MODES = ('NONE', 'FULL', 'INCREMENTAL')
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+def _is_locked(error):
+    return 'database is locked' in str(error) or 'database table is locked' in str(error)
+
+
+def _with_lock_retry(connection, operation, *args, rollback=False):
+    """
+    Run a DBAPI call, retrying with jittered exponential backoff while the
+    database is locked
+
+    SQLite has already waited busy_timeout before reporting the lock, and a
+    COMMIT that fails with SQLITE_BUSY leaves the transaction as it was, so
+    repeating it is safe. With rollback, the transaction the failed call
+    opened is rolled back before the retry, so the retry reads a fresh
+    snapshot (a stale one fails with SQLITE_BUSY_SNAPSHOT however often it
+    is repeated).
+    """
+    attempt = 0
+    while True:
+        try:
+            return operation(*args)
+        except sqlite3.OperationalError as e:
+            if attempt >= connection.lock_retries or not _is_locked(e):
+                raise
+            if rollback and connection.in_transaction:
+                connection.rollback()
+            delay = connection.lock_retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            logger.warning(f'SQLite database is locked, retry {attempt}/{connection.lock_retries} in {delay:.3f}s')
+            time.sleep(delay)
+
+
+class RetryingCursor(sqlite3.Cursor):
+    """
+    Cursor whose statements are retried while the database is locked, when
+    they start a transaction
+
+    Inside a transaction a statement is not retried: the transaction's
+    earlier reads may be from a snapshot another writer has since replaced,
+    and only rolling back the whole unit of work clears that. The error
+    reaches SQLAlchemy, which rolls the session back.
+    """
+
+    def _retry(self, operation, *args):
+        if self.connection.in_transaction:
+            return operation(*args)
+        return _with_lock_retry(self.connection, operation, *args, rollback=True)
+
+    def execute(self, *args):
+        return self._retry(super().execute, *args)
+
+    def executemany(self, *args):
+        return self._retry(super().executemany, *args)
+
+
+class RetryingConnection(sqlite3.Connection):
+    """
+    sqlite3 connection factory with lock retries on COMMIT and on statements
+    that open a transaction
+
+    Retry settings are per connection and filled in by the engine connect
+    hook from the app config.
+    """
+
+    lock_retries = 0
+    lock_retry_backoff = 0.05
+
+    def cursor(self, factory=RetryingCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        return _with_lock_retry(self, super().commit)
+
+
+def pragma_profile(config, read_only=False):
+    """
+    Build the PRAGMA statements for every new connection
+
+    Args:
+        config: Flask config (SQLITE_* keys); empty values skip a pragma
+        read_only: Only the per-connection pragmas a mode=ro connection can
+                   set, plus query_only
+
+    Returns:
+        List of (name, value) tuples in the order they must be applied
+
+    Raises:
+        ValueError: If a mode is not one SQLite accepts
+    """
+    def choice(key, allowed):
+        value = str(config.get(key) or '').upper()
+        if value and value not in allowed:
+            raise ValueError(f'{key} must be one of {", ".join(allowed)}, got {value!r}')
+        return value
+
+    if read_only:
+        pragmas = [('query_only', 'ON')]
+        for key, name in (('SQLITE_BUSY_TIMEOUT', 'busy_timeout'),
+                          ('SQLITE_CACHE_SIZE', 'cache_size'),
+                          ('SQLITE_MMAP_SIZE', 'mmap_size')):
+            if config.get(key) is not None:
+                pragmas.append((name, int(config[key])))
+        return pragmas
+
+    pragmas = []
+    # auto_vacuum only takes effect before the first table is created
+    auto_vacuum = choice('SQLITE_AUTO_VACUUM', AUTO_VACUUM_MODES)
+    if auto_vacuum:
+        pragmas.append(('auto_vacuum', auto_vacuum))
+    journal_mode = choice('SQLITE_JOURNAL_MODE', JOURNAL_MODES)
+    if journal_mode:
+        pragmas.append(('journal_mode', journal_mode))
+    synchronous = choice('SQLITE_SYNCHRONOUS', SYNCHRONOUS_MODES)
+    if synchronous:
+        pragmas.append(('synchronous', synchronous))
+    for key, name in (('SQLITE_BUSY_TIMEOUT', 'busy_timeout'),
+                      ('SQLITE_CACHE_SIZE', 'cache_size'),
+                      ('SQLITE_MMAP_SIZE', 'mmap_size'),
+                      ('SQLITE_WAL_AUTOCHECKPOINT', 'wal_autocheckpoint')):
+        if config.get(key) is not None:
+            pragmas.append((name, int(config[key])))
+    if config.get('SQLITE_FOREIGN_KEYS') is not None:
+        pragmas.append(('foreign_keys', 'ON' if config['SQLITE_FOREIGN_KEYS'] else 'OFF'))
+    return pragmas
+
+
+def is_sqlite_file_url(url):
+    """True for sqlite URLs that point at a file (not :memory:)"""
+    return url.startswith('sqlite:') and ':memory:' not in url and url.rstrip('/') != 'sqlite:'
+
+
+def sqlite_engine_options(app):
+    """
+    Engine options installing the retrying connection factory
+
+    Must be applied to SQLALCHEMY_ENGINE_OPTIONS before db.init_app(),
+    which creates the engines.
+    """
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_sqlite_file_url(app.config['SQLALCHEMY_DATABASE_URI']):
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('factory', RetryingConnection)
+        options['connect_args'] = connect_args
+    return options
+
+
+def init_sqlite_profile(app):
+    """
+    Apply the pragma profile to every new connection of the app's primary
+    SQLite engine
+
+    Config:
+        SQLITE_JOURNAL_MODE: Journal mode (WAL lets readers run during writes)
+        SQLITE_SYNCHRONOUS: NORMAL is durable across app crashes in WAL mode
+        SQLITE_BUSY_TIMEOUT: Milliseconds SQLite waits on a lock before failing
+        SQLITE_CACHE_SIZE: Page cache per connection (negative = KiB)
+        SQLITE_MMAP_SIZE: Bytes of the file read through memory mapping
+        SQLITE_WAL_AUTOCHECKPOINT: WAL pages before an automatic checkpoint
+        SQLITE_FOREIGN_KEYS: Enforce foreign key constraints
+        SQLITE_AUTO_VACUUM: Vacuum mode for newly created databases
+        SQLITE_LOCK_RETRIES: Extra attempts after busy_timeout expires (0 = off)
+        SQLITE_LOCK_RETRY_BACKOFF: Seconds before the first retry (doubles each time)
+    """
+    from app import db
+
+    pragmas = pragma_profile(app.config)
+    retries = int(app.config.get('SQLITE_LOCK_RETRIES') or 0)
+    backoff = float(app.config.get('SQLITE_LOCK_RETRY_BACKOFF') or 0.05)
+
+    def apply_profile(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, RetryingConnection):
+            dbapi_connection.lock_retries = retries
+            dbapi_connection.lock_retry_backoff = backoff
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', apply_profile)
+
+
+# ----------------------------------------------------------------------
+# Maintenance (flask db-maintenance)
+# ----------------------------------------------------------------------
+
+class _RawConnection:
+    """Context manager lending the pooled sqlite3 connection outside any transaction"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.raw = None
+
+    def __enter__(self):
+        self.raw = self.engine.raw_connection()
+        connection = self.raw.driver_connection
+        if connection.in_transaction:
+            connection.rollback()
+        return connection
+
+    def __exit__(self, *exc):
+        self.raw.close()
+
+
+def database_path(engine):
+    """Absolute path of the SQLite database file behind an engine"""
+    return os.path.abspath(engine.url.database)
+
+
+def database_stats(engine):
+    """
+    Get file and page statistics
+
+    Returns:
+        Dict with db_bytes, wal_bytes, page_size, page_count, freelist_count,
+        journal_mode and auto_vacuum
+    """
+    path = database_path(engine)
+    with _RawConnection(engine) as connection:
+        def pragma(name):
+            return connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+        stats = {
+            'page_size': pragma('page_size'),
+            'page_count': pragma('page_count'),
+            'freelist_count': pragma('freelist_count'),
+            'journal_mode': str(pragma('journal_mode')).upper(),
+            'auto_vacuum': AUTO_VACUUM_MODES[pragma('auto_vacuum')],
+        }
+    stats['db_bytes'] = os.path.getsize(path) if os.path.exists(path) else 0
+    stats['wal_bytes'] = os.path.getsize(path + '-wal') if os.path.exists(path + '-wal') else 0
+    return stats
+
+
+def checkpoint(engine, mode='PASSIVE'):
+    """
+    Copy WAL frames back into the database file
+
+    Args:
+        engine: SQLite engine
+        mode: PASSIVE (never waits), FULL, RESTART or TRUNCATE (also
+              shrinks the -wal file to zero bytes)
+
+    Returns:
+        Tuple (busy, wal_frames, checkpointed_frames); busy=1 means a
+        reader or writer prevented a complete checkpoint
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f'Checkpoint mode must be one of {", ".join(CHECKPOINT_MODES)}')
+    with _RawConnection(engine) as connection:
+        return tuple(connection.execute(f'PRAGMA wal_checkpoint({mode})').fetchone())
+
+
+def incremental_vacuum(engine, pages=0):
+    """
+    Return free pages to the filesystem (requires auto_vacuum=INCREMENTAL)
+
+    Args:
+        engine: SQLite engine
+        pages: Maximum pages to release (0 = all free pages)
+
+    Returns:
+        Number of pages released
+    """
+    with _RawConnection(engine) as connection:
+        before = connection.execute('PRAGMA freelist_count').fetchone()[0]
+        statement = f'PRAGMA incremental_vacuum({int(pages)})' if pages else 'PRAGMA incremental_vacuum'
+        connection.execute(statement).fetchall()
+        connection.commit()
+        after = connection.execute('PRAGMA freelist_count').fetchone()[0]
+    return before - after
+
+
+def enable_incremental_vacuum(engine):
+    """
+    Switch an existing database to auto_vacuum=INCREMENTAL
+
+    Needs a full VACUUM, which rewrites the whole file and blocks writers
+    while it runs; do it once during a quiet period.
+    """
+    with _RawConnection(engine) as connection:
+        connection.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        connection.execute('VACUUM')
+
+
+def optimize(engine):
+    """Let SQLite refresh query planner statistics where they are stale"""
+    with _RawConnection(engine) as connection:
+        connection.execute('PRAGMA optimize')
+
+
+def backup_database(engine, destination, pages=1024, verify=False):
+    """
+    Take a consistent online backup with the sqlite3 backup API
+
+    Pages are copied in steps so writers are only blocked briefly; the
+    copy is written to a temporary file and renamed when complete.
+
+    Args:
+        engine: SQLite engine
+        destination: Backup file path, or an existing directory to write a
+                     timestamped <name>-YYYYmmdd-HHMMSS.db file into
+        pages: Pages copied per step
+        verify: Run PRAGMA integrity_check on the copy
+
+    Returns:
+        Path of the backup file
+
+    Raises:
+        RuntimeError: If verification fails
+    """
+    if os.path.isdir(destination):
+        name = os.path.splitext(os.path.basename(database_path(engine)))[0]
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        destination = os.path.join(destination, f'{name}-{stamp}.db')
+
+    partial = destination + '.partial'
+    target = sqlite3.connect(partial)
+    try:
+        with _RawConnection(engine) as connection:
+            connection.backup(target, pages=pages, sleep=0.01)
+        if verify:
+            result = target.execute('PRAGMA integrity_check').fetchone()[0]
+            if result != 'ok':
+                raise RuntimeError(f'Backup failed integrity check: {result}')
+        # A backup is a single self-contained file
+        target.execute('PRAGMA journal_mode = DELETE')
+    except Exception:
+        target.close()
+        os.remove(partial)
+        raise
+    target.close()
+    os.replace(partial, destination)
+    return destination
+
+
+def prune_backups(directory, name, keep):
+    """
+    Delete all but the newest `keep` timestamped backups of a database
+
+    Returns:
+        List of deleted paths
+    """
+    prefix = f'{name}-'
+    backups = sorted(
+        f for f in os.listdir(directory)
+        if f.startswith(prefix) and f.endswith('.db')
+    )
+    removed = []
+    for filename in backups[:-keep] if keep > 0 else []:
+        path = os.path.join(directory, filename)
+        os.remove(path)
+        removed.append(path)
+    return removed
@@ -0,0 +1,729 @@
+"""
+Synthetic Data Generator
+Deterministic large-scale data for sizing, load tests and benchmarks
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from dateutil.relativedelta import relativedelta
+from app import db
+from app.models.types import to_money, MonthBitmap
+from app.utils.coverage import Coverage, month_index, qualifies
+from app.utils.database import reset_sequences
+from app.utils.settings import get_settings
+
+
+# Shared password for every generated user account
+SYNTHETIC_PASSWORD = 'Synthetic#2024'
+
+# Tables the generator writes, emptied again if a run fails part way
+SEEDED_TABLES = (
+    'members', 'users', 'receipts', 'contributions', 'loans', 'loan_guarantors',
+    'loan_repayments', 'loan_instalments', 'welfare_requests', 'welfare_payments',
+    'meetings', 'attendance', 'expenses', 'audit_logs',
+)
+
+
+class BulkWriter:
+    """
+    Buffers rows per table and writes them with core executemany INSERTs
+
+    Core inserts skip the ORM unit of work and its before_insert
+    generators, so all numbers must be assigned by the caller.
+
+    A full buffer flushes every table, so callers must add a parent row
+    before any row that references it. The flush writes the buffered
+    tables in dependency order, which only keeps foreign keys intact for
+    parents that are already buffered.
+    """
+
+    def __init__(self, connection, batch_size=50000):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, table, row):
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        order = {t: i for i, t in enumerate(db.metadata.sorted_tables)}
+        for t in sorted(self.buffers, key=lambda t: order.get(t, len(order))):
+            rows = self.buffers.get(t)
+            if rows:
+                self.connection.execute(t.insert(), self._uniform(t, rows))
+                self.counts[t.name] = self.counts.get(t.name, 0) + len(rows)
+                self.buffers[t] = []
+
+    @staticmethod
+    def _uniform(table, rows):
+        """executemany needs the same keys in every row; fill gaps with column defaults"""
+        keys = set()
+        for row in rows:
+            keys.update(row)
+        fill = {}
+        for key in keys:
+            default = table.c[key].default
+            fill[key] = default.arg if default is not None and default.is_scalar else None
+        return [row if len(row) == len(keys) else {**fill, **row} for row in rows]
+
+
+class _Sequence:
+    """Per-prefix counters for receipt/loan/voucher numbers"""
+
+    def __init__(self):
+        self.counters = {}
+
+    def next(self, prefix, width=4):
+        value = self.counters.get(prefix, 0) + 1
+        self.counters[prefix] = value
+        return f'{prefix}{value:0{width}d}'
+
+
+def _month_starts(first, last):
+    months = []
+    current = first
+    while current <= last:
+        months.append(current)
+        current += relativedelta(months=1)
+    return months
+
+
+def generate_synthetic_data(members=1000, years=10, seed=1, batch_size=50000, end_date=None, progress=None):
+    """
+    Generate a consistent history into an empty database
+
+    Covers members with user accounts, membership fees, monthly
+    contributions, loans with guarantors and repayments, welfare
+    requests and payments, meetings with attendance, expenses and
+    audit logs. Receipt/loan/voucher numbers follow the formats used by
+    the routes, member totals match their contributions and loan
+    balances match their repayments.
+
+    Phases are committed as they finish. If a later phase fails, the rows
+    already written are deleted again, so the command can simply be rerun.
+
+    Args:
+        members: Number of members
+        years: Years of history ending at end_date
+        seed: Random seed (same arguments produce the same data)
+        batch_size: Rows per executemany call
+        end_date: Last day of history (default today)
+        progress: Optional callable(message) for progress output
+
+    Returns:
+        Dict of row counts per table
+
+    Raises:
+        ValueError: If the database already has members
+    """
+    from app.models import Member
+
+    if db.session.query(Member.id).first() is not None:
+        raise ValueError('Database already contains members; seed an empty database')
+
+    try:
+        return _generate(members, years, seed, batch_size, end_date, progress)
+    except Exception:
+        db.session.rollback()
+        _remove_seeded_rows()
+        raise
+
+
+def _remove_seeded_rows():
+    """
+    Delete what a failed run committed before it failed
+
+    The run started without members, and every table it writes refers to
+    members or users, so those tables held no rows of their own.
+    """
+    for table in reversed(db.metadata.sorted_tables):
+        if table.name not in SEEDED_TABLES:
+            continue
+        statement = table.delete()
+        if table.name == 'audit_logs':
+            # Keep anonymous entries (e.g. failed logins) from before the run
+            statement = statement.where(table.c.user_id.is_not(None))
+        db.session.execute(statement)
+    db.session.commit()
+
+
+def _generate(members, years, seed, batch_size, end_date, progress):
+    """Body of generate_synthetic_data(), run on a database without members"""
+    from app.models import (
+        Member, User, Contribution, Receipt, Loan, LoanRepayment, LoanInstalment, LoanGuarantor,
+        WelfareRequest, WelfarePayment, Meeting, Attendance, AuditLog,
+        SystemSetting, DataVersion
+    )
+    from app.models.expense import Expense
+
+    def report(message):
+        if progress:
+            progress(message)
+
+    settings = get_settings()
+    monthly_amount = settings.get('MONTHLY_CONTRIBUTION')
+    membership_fee = settings.get('MEMBERSHIP_FEE')
+    bereavement_amount = settings.get('BEREAVEMENT_AMOUNT')
+    interest_rate = settings.get('LOAN_INTEREST_RATE')
+    max_period = settings.get('MAX_LOAN_PERIOD')
+    quorum = settings.get('QUORUM_REQUIREMENT')
+    qualification_period = settings.get('QUALIFICATION_PERIOD')
+
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    first_month = end_date.replace(day=1) - relativedelta(months=years * 12 - 1)
+    months = _month_starts(first_month, end_date.replace(day=1))
+    now = datetime.utcnow()
+    sequence = _Sequence()
+
+    SystemSetting.initialize_defaults()
+    DataVersion.initialize_defaults()
+
+    # One password hash shared by every account (hashing is deliberately slow)
+    hasher = User(username='synthetic', role='Member')
+    hasher.set_password(SYNTHETIC_PASSWORD)
+    password_hash = hasher.password_hash
+
+    connection = db.session.connection()
+    synchronous = None
+    if connection.dialect.name == 'sqlite':
+        synchronous = connection.exec_driver_sql('PRAGMA synchronous').scalar()
+        connection.exec_driver_sql('PRAGMA synchronous = OFF')
+
+    writer = BulkWriter(connection, batch_size)
+
+    # ------------------------------------------------------------------
+    # Members, users and membership fees
+    # ------------------------------------------------------------------
+    report(f'Generating {members} members...')
+    executive_user_ids = [2, 3, 4]
+    people = []
+    fee_receipts = []
+    for member_id in range(1, members + 1):
+        # Founding members first, the rest join over the first 80% of the window
+        if member_id <= max(10, members // 3):
+            joined = first_month + timedelta(days=rng.randrange(28))
+        else:
+            joined = months[rng.randrange(max(1, int(len(months) * 0.8)))] + timedelta(days=rng.randrange(28))
+        joined = min(joined, end_date)
+
+        # Most members stay active; a few leave at some point after joining
+        roll = rng.random()
+        left_on = None
+        status = 'Active'
+        if member_id > 5 and roll > 0.92:
+            status = rng.choice(('Suspended', 'Inactive', 'Expelled', 'Deceased'))
+            span = (end_date - joined).days
+            left_on = joined + timedelta(days=rng.randrange(span)) if span > 60 else end_date
+
+        gender = rng.choice(('Male', 'Female'))
+        phone = f'07{(member_id * 7919) % 100000000:08d}'
+        fee_receipt = sequence.next(f'MF-{joined.year}-{joined.month:02d}-')
+
+        people.append({
+            'id': member_id,
+            'joined': joined,
+            'left_on': left_on,
+            'status': status,
+            'reliability': rng.uniform(0.75, 1.0),
+            'total': 0,
+            'coverage': Coverage(month_index(joined)),
+            'last_paid': None,
+            'qualified_on': None,
+        })
+
+        writer.add(Member.__table__, {
+            'id': member_id,
+            'member_number': f'OT-{member_id:03d}',
+            'full_name': f"{rng.choice(_FIRST_NAMES[gender])} {rng.choice(_LAST_NAMES)}",
+            'national_id': f'C{"M" if gender == "Male" else "F"}{member_id:012d}',
+            'date_of_birth': date(rng.randrange(1950, 1990), rng.randrange(1, 13), rng.randrange(1, 29)),
+            'gender': gender,
+            'phone_primary': phone,
+            'email': f'member{member_id}@example.org' if rng.random() < 0.6 else None,
+            'physical_address': f'Plot {rng.randrange(1, 500)}, Kiteezi',
+            'occupation': rng.choice(_OCCUPATIONS),
+            'date_joined': joined,
+            'membership_fee_paid': True,
+            'membership_fee_date': joined,
+            'membership_fee_receipt': fee_receipt,
+            'status': status,
+            'suspension_date': left_on if status == 'Suspended' else None,
+            'expulsion_date': left_on if status == 'Expelled' else None,
+            'expulsion_reason': 'Failure to contribute' if status == 'Expelled' else None,
+            'refund_paid': False,
+            'created_at': now,
+            'updated_at': now,
+        })
+
+        role = 'SuperAdmin' if member_id == 1 else 'Executive' if member_id in executive_user_ids else \
+            'Auditor' if member_id == 5 else 'Member'
+        writer.add(User.__table__, {
+            'id': member_id,
+            'member_id': member_id,
+            'username': phone,
+            'password_hash': password_hash,
+            'role': role,
+            'is_active': status in ('Active', 'Suspended'),
+            'must_change_password': False,
+            'failed_login_attempts': 0,
+            'created_at': now,
+            'updated_at': now,
+        })
+
+        fee_receipts.append({
+            'receipt_number': fee_receipt,
+            'receipt_type': 'MembershipFee',
+            'member_id': member_id,
+            'amount': membership_fee,
+            'payment_date': joined,
+            'payment_method': 'Cash',
+            'description': 'Membership registration fee',
+            'generated_by': executive_user_ids[0] if members >= 4 else 1,
+            'created_at': now,
+        })
+    # Receipts name an executive as issuer, so they follow all the users
+    for row in fee_receipts:
+        writer.add(Receipt.__table__, row)
+    writer.flush()
+    db.session.commit()
+    connection = db.session.connection()
+    writer.connection = connection
+
+    recorder_ids = [uid for uid in executive_user_ids if uid <= members] or [1]
+
+    # ------------------------------------------------------------------
+    # Monthly contributions
+    # ------------------------------------------------------------------
+    report('Generating contributions...')
+    contribution_table = Contribution.__table__
+    for person in people:
+        stop = person['left_on'] or end_date
+        for month_start in months:
+            if month_start < person['joined'].replace(day=1) or month_start > stop:
+                continue
+            if rng.random() > person['reliability']:
+                continue
+
+            paid_on = month_start + timedelta(days=rng.randrange(28))
+            if paid_on > end_date:
+                continue
+
+            writer.add(contribution_table, {
+                'member_id': person['id'],
+                'amount': monthly_amount,
+                'payment_date': paid_on,
+                'contribution_month': month_start.strftime('%Y-%m'),
+                'payment_method': rng.choice(_PAYMENT_METHODS),
+                'transaction_reference': f'TX{rng.randrange(10 ** 9):09d}' if rng.random() < 0.5 else None,
+                'receipt_number': sequence.next(f'OT-{paid_on.year}-{paid_on.month:02d}-'),
+                'recorded_by': rng.choice(recorder_ids),
+                'created_at': now,
+                'updated_at': now,
+            })
+
+            person['total'] += monthly_amount
+            person['coverage'].add(month_start)
+            if person['last_paid'] is None or paid_on > person['last_paid']:
+                person['last_paid'] = paid_on
+            if person['qualified_on'] is None and person['coverage'].streak(paid_on) >= qualification_period:
+                person['qualified_on'] = paid_on
+    writer.flush()
+
+    # Member totals mirror Member.update_contribution_stats()
+    member_table = Member.__table__
+    connection.execute(
+        member_table.update().where(member_table.c.id == db.bindparam('b_id')).values(
+            total_contributed=db.bindparam('b_total'),
+            consecutive_months_paid=db.bindparam('b_streak'),
+            coverage_start=db.bindparam('b_coverage_start'),
+            contribution_coverage=db.bindparam('b_coverage', type_=MonthBitmap()),
+            last_contribution_date=db.bindparam('b_last'),
+            qualified_for_benefits=db.bindparam('b_qualified'),
+        ),
+        [
+            {
+                'b_id': p['id'],
+                'b_total': p['total'],
+                'b_streak': streak,
+                'b_coverage_start': coverage.start,
+                'b_coverage': coverage.bits,
+                'b_last': p['last_paid'],
+                'b_qualified': qualifies(p['status'], streak, qualification_period),
+            }
+            for p, coverage, streak in (
+                (p, p['coverage'], p['coverage'].streak(end_date)) for p in people
+            )
+        ]
+    )
+    db.session.commit()
+    connection = db.session.connection()
+    writer.connection = connection
+
+    # ------------------------------------------------------------------
+    # Loans with guarantors and repayments
+    # ------------------------------------------------------------------
+    report('Generating loans...')
+    loan_id = 0
+    for person in people:
+        if person['qualified_on'] is None:
+            continue
+        stop = person['left_on'] or end_date
+        applied = person['qualified_on'] + timedelta(days=rng.randrange(30, 120))
+
+        while applied <= stop:
+            loan_id += 1
+            amount = rng.choice(_LOAN_AMOUNTS)
+            period = rng.randint(1, max_period)
+            total_payable = amount + to_money(amount * interest_rate / 100 * period)
+            loan_number = sequence.next(f'LN-{applied.year}-')
+
+            # Guarantors: two other members already qualified when applying
+            candidates = [
+                p for p in rng.sample(people, min(len(people), 20))
+                if p['id'] != person['id'] and p['qualified_on'] and p['qualified_on'] <= applied
+            ]
+            use_guarantors = len(candidates) >= 2 and rng.random() < 0.7
+            guarantors = candidates[:2] if use_guarantors else []
+
+            loan = {
+                'id': loan_id,
+                'loan_number': loan_number,
+                'member_id': person['id'],
+                'amount_requested': amount,
+                'purpose': rng.choice(_LOAN_PURPOSES),
+                'repayment_period_months': period,
+                'interest_rate': interest_rate,
+                'security_type': 'Guarantors' if use_guarantors else 'Collateral',
+                'collateral_description': None if use_guarantors else 'Land title',
+                'collateral_value': None if use_guarantors else amount * 3,
+                'guarantor1_id': guarantors[0]['id'] if guarantors else None,
+                'guarantor2_id': guarantors[1]['id'] if guarantors else None,
+                'executive_approved': False,
+                'disbursed': False,
+                'total_paid': 0,
+                'created_at': datetime.combine(applied, time(10, 0)),
+                'updated_at': now,
+            }
+            if guarantors:
+                approval_time = datetime.combine(applied + timedelta(days=1), time(12, 0))
+                loan.update({
+                    'guarantor1_approved': True,
+                    'guarantor2_approved': True,
+                    'guarantor1_approval_date': approval_time,
+                    'guarantor2_approval_date': approval_time,
+                })
+
+            repayments = instalments = ()
+            age_days = (end_date - applied).days
+            if age_days < 3:
+                loan['status'] = 'Pending Guarantor Approval' if guarantors else 'Pending Executive Approval'
+                if guarantors:
+                    loan.update({'guarantor1_approved': None, 'guarantor2_approved': None,
+                                 'guarantor1_approval_date': None, 'guarantor2_approval_date': None})
+            elif age_days < 7:
+                loan['status'] = 'Pending Executive Approval'
+            elif rng.random() < 0.05:
+                loan['status'] = 'Rejected'
+                loan['approval_notes'] = 'Insufficient repayment capacity'
+            else:
+                repayments, instalments = _disburse_loan(
+                    loan, applied, amount, period, total_payable, end_date,
+                    recorder_ids, sequence, LoanInstalment.__table__, rng
+                )
+
+            writer.add(Loan.__table__, loan)
+            for row in repayments:
+                writer.add(LoanRepayment.__table__, row)
+            for row in instalments:
+                writer.add(LoanInstalment.__table__, row)
+            for slot, guarantor in enumerate(guarantors, start=1):
+                approved = loan[f'guarantor{slot}_approved']
+                writer.add(LoanGuarantor.__table__, {
+                    'loan_id': loan_id,
+                    'member_id': guarantor['id'],
+                    'slot': slot,
+                    'decision': LoanGuarantor.decision_for(approved),
+                    'decided_at': loan[f'guarantor{slot}_approval_date'],
+                })
+            writer.add(AuditLog.__table__, {
+                'user_id': person['id'],
+                'action_type': 'Create',
+                'entity_type': 'Loan',
+                'entity_id': loan_id,
+                'description': f'Loan application {loan_number} submitted',
+                'timestamp': datetime.combine(applied, time(10, 0)),
+            })
+
+            # Roughly one loan a year per borrowing member
+            applied += timedelta(days=rng.randrange(200, 600))
+    writer.flush()
+    db.session.commit()
+    connection = db.session.connection()
+    writer.connection = connection
+
+    # ------------------------------------------------------------------
+    # Welfare requests and payments
+    # ------------------------------------------------------------------
+    report('Generating welfare requests...')
+    welfare_id = 0
+    for person in people:
+        if person['qualified_on'] is None:
+            continue
+        for _ in range(years):
+            if rng.random() > 0.05:
+                continue
+            incident = person['qualified_on'] + timedelta(days=rng.randrange(max(1, (end_date - person['qualified_on']).days)))
+            welfare_id += 1
+            request_type = rng.choice(('Bereavement', 'Medical', 'Celebration'))
+            requested = bereavement_amount if request_type == 'Bereavement' else rng.choice((200000, 300000, 500000))
+            request_number = sequence.next(f'WR-{incident.year}-')
+            submitted = datetime.combine(incident + timedelta(days=2), time(9, 0))
+
+            recent = (end_date - incident).days < 14
+            status = rng.choice(('Submitted', 'UnderReview')) if recent else \
+                'Rejected' if rng.random() < 0.1 else 'Paid'
+
+            row = {
+                'id': welfare_id,
+                'request_number': request_number,
+                'member_id': person['id'],
+                'request_type': request_type,
+                'affected_person': 'Family member',
+                'relationship': rng.choice(('Spouse', 'Child', 'Parent')),
+                'incident_date': incident,
+                'description': f'{request_type} support request',
+                'amount_requested': requested,
+                'status': status,
+                'submitted_date': submitted,
+                'created_at': submitted,
+                'updated_at': now,
+            }
+            if status in ('Rejected', 'Paid'):
+                row.update({
+                    'reviewed_by_secretary': recorder_ids[-1],
+                    'secretary_review_date': submitted + timedelta(days=1),
+                    'approved_by_chairman': recorder_ids[0],
+                    'chairman_approval_date': submitted + timedelta(days=2),
+                })
+            if status == 'Rejected':
+                row['rejection_reason'] = 'Not eligible under the constitution'
+            if status == 'Paid':
+                paid_on = min((submitted + timedelta(days=3)).date(), end_date)
+                voucher = sequence.next(f'WV-{paid_on.year}-')
+                row.update({'amount_approved': requested, 'payment_voucher_number': voucher})
+                payment = {
+                    'welfare_request_id': welfare_id,
+                    'payment_voucher_number': voucher,
+                    'amount_paid': requested,
+                    'payment_date': paid_on,
+                    'payment_method': 'Bank Transfer',
+                    'beneficiary_name': f'Beneficiary of OT-{person["id"]:03d}',
+                    'paid_by_treasurer': recorder_ids[0],
+                    'confirmed_by_secretary': recorder_ids[-1],
+                    'created_at': now,
+                }
+            writer.add(WelfareRequest.__table__, row)
+            if status == 'Paid':
+                writer.add(WelfarePayment.__table__, payment)
+    writer.flush()
+    db.session.commit()
+    connection = db.session.connection()
+    writer.connection = connection
+
+    # ------------------------------------------------------------------
+    # Meetings with attendance, expenses and login audit trail
+    # ------------------------------------------------------------------
+    report('Generating meetings, expenses and audit logs...')
+    meeting_id = 0
+    for month_start in months:
+        meeting_date = month_start + timedelta(days=(5 - month_start.weekday()) % 7 + 7)  # 2nd Saturday
+        meetings_this_month = [('Regular', meeting_date)]
+        if month_start.month == 12:
+            meetings_this_month.append(('AnnualGeneral', meeting_date + timedelta(days=7)))
+
+        for meeting_type, held_on in meetings_this_month:
+            meeting_id += 1
+            completed = held_on < end_date
+            present = 0
+            attendance = []
+            if completed:
+                for person in people:
+                    if person['joined'] > held_on or (person['left_on'] and person['left_on'] < held_on):
+                        continue
+                    roll = rng.random()
+                    status = 'Present' if roll < 0.75 else 'Absent' if roll < 0.9 else 'Excused'
+                    if status == 'Present':
+                        present += 1
+                    attendance.append({
+                        'meeting_id': meeting_id,
+                        'member_id': person['id'],
+                        'status': status,
+                        'arrival_time': time(10, rng.randrange(60)) if status == 'Present' else None,
+                        'recorded_by': recorder_ids[-1],
+                        'created_at': now,
+                    })
+
+            writer.add(Meeting.__table__, {
+                'id': meeting_id,
+                'meeting_type': meeting_type,
+                'meeting_date': held_on,
+                'meeting_time': time(10, 0),
+                'venue': 'Kiteezi Community Hall',
+                'agenda': 'Contributions, loans and welfare updates',
+                'called_by': recorder_ids[0],
+                'quorum_met': present >= quorum if completed else None,
+                'total_attendance': present if completed else None,
+                'status': 'Completed' if completed else 'Scheduled',
+                'notification_sent': True,
+                'created_at': now,
+                'updated_at': now,
+            })
+            for row in attendance:
+                writer.add(Attendance.__table__, row)
+
+        for _ in range(rng.randrange(2, 7)):
+            spent_on = month_start + timedelta(days=rng.randrange(28))
+            if spent_on > end_date:
+                continue
+            writer.add(Expense.__table__, {
+                'expense_number': sequence.next(f"EXP{spent_on.strftime('%Y%m')}"),
+                'expense_category': rng.choice(('Stationery', 'Airtime', 'Transport', 'Meetings', 'Other')),
+                'description': 'Operational expense',
+                'amount': rng.choice((10000, 20000, 35000, 50000, 100000)),
+                'expense_date': spent_on,
+                'payment_method': rng.choice(('Cash', 'Mobile Money')),
+                'payee': 'Local supplier',
+                'approved_by': recorder_ids[0],
+                'recorded_by': recorder_ids[-1],
+                'created_at': now,
+                'updated_at': now,
+            })
+
+        for user_id in recorder_ids:
+            for _ in range(rng.randrange(4, 12)):
+                writer.add(AuditLog.__table__, {
+                    'user_id': user_id,
+                    'action_type': 'Login',
+                    'description': 'User logged in successfully',
+                    'ip_address': '10.0.0.' + str(rng.randrange(2, 250)),
+                    'timestamp': datetime.combine(month_start + timedelta(days=rng.randrange(28)), time(rng.randrange(7, 20), 0)),
+                })
+    writer.flush()
+
+    # Ids were assigned here; PostgreSQL sequences must continue after them
+    reset_sequences(connection, [t for t in db.metadata.sorted_tables if t.name in writer.counts])
+
+    # Version-keyed caches must not serve data from before the seed
+    DataVersion.bump(connection, sorted(writer.counts) + DataVersion.covering(writer.counts))
+    db.session.commit()
+
+    if synchronous is not None:
+        # Back to the connection profile's level (SQLITE_SYNCHRONOUS)
+        db.session.connection().exec_driver_sql(f'PRAGMA synchronous = {int(synchronous)}')
+
+    return dict(sorted(writer.counts.items()))
+
+
+def _disburse_loan(loan, applied, amount, period, total_payable, end_date,
+                   recorder_ids, sequence, instalment_table, rng):
+    """
+    Fill disbursement fields and build the schedule and repayments consistent with the loan status
+
+    Returns:
+        Tuple (repayment rows, instalment rows), to be written after the loan row
+    """
+    from app.utils.amortization import build_schedule, apply_payment
+
+    approved_on = applied + timedelta(days=rng.randrange(2, 5))
+    disbursed_on = approved_on + timedelta(days=rng.randrange(1, 3))
+    due = disbursed_on + relativedelta(months=period)
+    schedule = build_schedule(SimpleNamespace(
+        id=loan['id'], amount_approved=amount, total_payable=total_payable,
+        repayment_period_months=period, disbursement_date=disbursed_on
+    ))
+
+    loan.update({
+        'amount_approved': amount,
+        'executive_approved': True,
+        'approved_by_chairman': recorder_ids[0],
+        'approved_by_secretary': recorder_ids[-1],
+        'approved_by_treasurer': recorder_ids[len(recorder_ids) // 2],
+        'approval_date': approved_on,
+        'disbursed': True,
+        'disbursement_date': disbursed_on,
+        'due_date': due,
+        'disbursement_method': rng.choice(('Cash', 'Mobile Money', 'Bank Transfer')),
+        'total_payable': total_payable,
+    })
+
+    # Decide how much gets repaid by end_date
+    overdue = due < end_date
+    roll = rng.random()
+    if overdue and roll < 0.85:
+        target = total_payable
+    elif overdue and roll < 0.95:
+        target = round(total_payable * rng.uniform(0.1, 0.7), -3)
+        default_on = due + timedelta(days=30)
+        if default_on <= end_date:
+            loan['status'] = 'Defaulted'
+            loan['default_date'] = default_on
+            loan['recovery_notes'] = 'Referred to guarantors'
+    else:
+        elapsed = max(0, (end_date - disbursed_on).days)
+        target = round(total_payable * min(1.0, elapsed / max(1, (due - disbursed_on).days)) * rng.uniform(0, 0.9), -3)
+
+    paid = 0
+    repayments = []
+    installments = rng.randint(1, period + 1)
+    last_day = min(due + timedelta(days=10), end_date)
+    span = max(1, (last_day - disbursed_on).days)
+    for i in range(installments):
+        if paid >= target:
+            break
+        amount_paid = int(target - paid if i == installments - 1 else round(target / installments, -3))
+        if amount_paid <= 0:
+            continue
+        paid_on = disbursed_on + timedelta(days=span * (i + 1) // installments)
+        principal_portion, interest_portion = apply_payment(
+            [s for s in schedule if not s.paid_date], amount_paid, paid_on
+        )
+        repayments.append({
+            'loan_id': loan['id'],
+            'payment_date': paid_on,
+            'amount_paid': amount_paid,
+            'principal_portion': principal_portion,
+            'interest_portion': interest_portion,
+            'payment_method': rng.choice(_PAYMENT_METHODS),
+            'receipt_number': sequence.next(f'LR-{paid_on.year}-{paid_on.month:02d}-'),
+            'recorded_by': rng.choice(recorder_ids),
+            'created_at': datetime.combine(paid_on, time(11, 0)),
+        })
+        paid += amount_paid
+
+    loan['total_paid'] = paid
+    loan['balance'] = total_payable - paid
+    if 'status' not in loan:
+        loan['status'] = 'Completed' if paid >= total_payable else 'Active'
+
+    instalments = [
+        {c.name: getattr(instalment, c.name) for c in instalment_table.c if c.name != 'id'}
+        for instalment in schedule
+    ]
+    return repayments, instalments
+
+
+_FIRST_NAMES = {
+    'Male': ('John', 'Moses', 'Robert', 'Joseph', 'David', 'Samuel', 'Peter', 'Paul', 'Henry', 'Charles'),
+    'Female': ('Mary', 'Grace', 'Sarah', 'Florence', 'Margaret', 'Ruth', 'Agnes', 'Rose', 'Jane', 'Esther'),
+}
+_LAST_NAMES = ('Okello', 'Nakato', 'Mukasa', 'Namubiru', 'Ssempala', 'Achieng', 'Kato', 'Nansubuga',
+               'Wasswa', 'Babirye', 'Ochieng', 'Tumusiime', 'Kyomuhendo', 'Lubega', 'Atim')
+_OCCUPATIONS = ('Teacher', 'Trader', 'Farmer', 'Civil Servant', 'Retired', 'Nurse', 'Mechanic', 'Accountant')
+_PAYMENT_METHODS = ('Cash', 'MobileMoney', 'BankTransfer')
+_LOAN_AMOUNTS = (300000, 500000, 1000000, 1500000, 2000000, 3000000)
+_LOAN_PURPOSES = ('School fees', 'Business capital', 'Medical bills', 'Home improvement', 'Farming inputs')
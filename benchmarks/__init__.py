@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Route-level and model hot-path benchmarks with baseline tracking
+"""
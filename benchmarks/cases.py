@@ -0,0 +1,109 @@
+"""
+Benchmark Cases
+Hot endpoints and model paths measured by run_benchmarks.py
+"""
+from datetime import date
+from decimal import Decimal
+from app import db
+
+
+class Case:
+    """
+    One benchmark case
+
+    Args:
+        name: Stable name used as the baseline key
+        run: Callable(bench) performing one iteration
+        role: Login role for HTTP cases (None for model cases)
+    """
+
+    def __init__(self, name, run, role=None):
+        self.name = name
+        self.run = run
+        self.role = role
+
+
+def _get(path, expected=200):
+    def run(bench):
+        response = bench.client.get(path.format(**bench.info))
+        assert response.status_code == expected, f'{path}: HTTP {response.status_code}'
+    return run
+
+
+def _batch_contributions(bench):
+    """POST a batch for a fresh month so no row is skipped as duplicate"""
+    bench.batch_counter += 1
+    year, month = divmod(bench.batch_counter - 1, 12)
+    member_ids = [str(i) for i in range(1, min(bench.info['members'], 50) + 1)]
+    response = bench.client.post('/contributions/batch', data={
+        'contribution_month': f'{2200 + year}-{month + 1:02d}',
+        'member_ids[]': member_ids,
+        'amounts[]': ['100000'] * len(member_ids),
+        'payment_dates[]': [date.today().isoformat()] * len(member_ids),
+        'payment_methods[]': ['Cash'] * len(member_ids),
+        'transaction_references[]': [''] * len(member_ids),
+    })
+    assert response.status_code == 302, f'batch: HTTP {response.status_code}'
+
+
+def _update_contribution_stats(bench):
+    from app.models.member import Member
+
+    member = db.session.get(Member, bench.info['statement_member_id'])
+    member.update_contribution_stats()
+    db.session.rollback()
+
+
+def _member_number_generator(bench):
+    from app.models.member import Member
+
+    db.session.add(Member(full_name='Bench Member', phone_primary='+256700000000', date_joined=date.today()))
+    db.session.flush()
+    db.session.rollback()
+
+
+def _receipt_number_generator(bench):
+    from app.models.contribution import Contribution
+
+    db.session.add(Contribution(
+        member_id=1, amount=100000, payment_date=date.today(),
+        contribution_month='2199-01', payment_method='Cash', recorded_by=1
+    ))
+    db.session.flush()
+    db.session.rollback()
+
+
+def _calculate_total_payable(bench):
+    from app.models.loan import Loan
+
+    loan = Loan(amount_approved=Decimal('1000000'), interest_rate=Decimal('5.00'), repayment_period_months=2)
+    for _ in range(1000):
+        loan.calculate_total_payable()
+
+
+CASES = [
+    # Reports
+    Case('financial_summary', _get('/reports/financial-summary'), 'Executive'),
+    Case('member_statement', _get('/reports/member-statement/{statement_member_id}'), 'Executive'),
+    Case('contributions_report', _get('/reports/contributions'), 'Executive'),
+    Case('loans_report', _get('/reports/loans'), 'Executive'),
+
+    # Dashboards
+    Case('dashboard_executive', _get('/dashboard'), 'Executive'),
+    Case('dashboard_auditor', _get('/dashboard'), 'Auditor'),
+    Case('dashboard_member', _get('/dashboard'), 'Member'),
+
+    # Contributions
+    Case('list_contributions', _get('/contributions/'), 'Executive'),
+    Case('batch_contributions_post', _batch_contributions, 'Executive'),
+
+    # Receipt PDFs
+    Case('contribution_receipt_pdf', _get('/contributions/1/receipt'), 'Executive'),
+    Case('membership_receipt_pdf', _get('/membership-fees/receipt/{membership_receipt}/download'), 'Executive'),
+
+    # Model hot paths
+    Case('update_contribution_stats', _update_contribution_stats),
+    Case('member_number_generator', _member_number_generator),
+    Case('receipt_number_generator', _receipt_number_generator),
+    Case('calculate_total_payable_x1000', _calculate_total_payable),
+]
@@ -0,0 +1,49 @@
+"""
+Benchmark Dataset
+Builds the benchmark database with the synthetic data generator
+"""
+from app import db
+from app.utils.synthetic_data import generate_synthetic_data, SYNTHETIC_PASSWORD
+
+
+# Member ids whose accounts hold each role in generated data
+ROLE_MEMBER_IDS = {
+    'SuperAdmin': 1,
+    'Executive': 2,
+    'Auditor': 5,
+    'Member': 6,
+}
+BENCH_PASSWORD = SYNTHETIC_PASSWORD
+
+
+def build_dataset(members=200, years=2, seed=42):
+    """
+    Fill the current (empty) database and collect ids used by the cases
+
+    Returns:
+        Dict with scale, row counts, role usernames and case parameters
+    """
+    from app.models import User, Contribution, Receipt
+
+    counts = generate_synthetic_data(members=members, years=years, seed=seed)
+
+    usernames = {
+        role: db.session.get(User, member_id).username
+        for role, member_id in ROLE_MEMBER_IDS.items()
+    }
+    statement_member_id = db.session.query(Contribution.member_id).group_by(
+        Contribution.member_id
+    ).order_by(db.func.count().desc()).limit(1).scalar()
+    membership_receipt = db.session.query(Receipt.receipt_number).filter(
+        Receipt.receipt_type == 'MembershipFee'
+    ).order_by(Receipt.id).limit(1).scalar()
+
+    return {
+        'members': members,
+        'years': years,
+        'contributions': counts.get('contributions', 0),
+        'loans': counts.get('loans', 0),
+        'usernames': usernames,
+        'statement_member_id': statement_member_id,
+        'membership_receipt': membership_receipt,
+    }
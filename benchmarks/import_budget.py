@@ -0,0 +1,131 @@
+"""
+Import-Time Budget
+Reports how long `flask --help` and app startup take, and checks that heavy
+modules (reportlab, phonenumbers, requests) are only imported on first use
+
+Each measurement runs in a fresh interpreter against a temporary database.
+Timings depend on the machine, so the default budgets are generous and
+only catch a real regression (a heavy import back at startup); tighten
+them with the options or CLI_BUDGET_MS / STARTUP_BUDGET_MS, 0 for none.
+tests/test_startup_imports.py runs the import check and the startup budget.
+
+Usage:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --runs 7 --cli-budget 900 --startup-budget 600
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Must not be imported while the app starts, in either mode
+LAZY_MODULES = ('reportlab', 'phonenumbers', 'requests')
+
+# Milliseconds, several times a typical run (about 1000 for `flask --help`,
+# 550 for create_app()); 0 turns a budget off
+CLI_BUDGET_MS = float(os.getenv('CLI_BUDGET_MS', 5000))
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', 3000))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app('production', mode=sys.argv[1])
+elapsed = (time.perf_counter() - start) * 1000
+loaded = [m for m in sys.argv[2:] if m in sys.modules]
+print(json.dumps({'ms': elapsed, 'loaded': loaded}))
+"""
+
+
+def _env(database_url):
+    env = dict(os.environ)
+    env['DATABASE_URL'] = database_url
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    env.pop('APP_MODE', None)
+    return env
+
+
+def time_command(command, env, runs):
+    """Median wall time in ms of a command run in a fresh process"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def probe_app(mode, env, runs):
+    """Median create_app() time and the lazy modules it imported"""
+    timings, loaded = [], set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE, mode, *LAZY_MODULES],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['ms'])
+        loaded.update(result['loaded'])
+    return statistics.median(timings), sorted(loaded)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Startup import-time budget')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per measurement (median is reported)')
+    parser.add_argument('--cli-budget', type=float, default=CLI_BUDGET_MS,
+                        help='Fail if `flask --help` takes longer (ms, 0 = no budget)')
+    parser.add_argument('--startup-budget', '--worker-budget', type=float, default=STARTUP_BUDGET_MS,
+                        help='Fail if create_app() takes longer in either mode (ms, 0 = no budget)')
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _env(f"sqlite:///{os.path.join(tmp, 'budget.db')}")
+        flask = [sys.executable, '-m', 'flask']
+
+        # First run creates the schema so it is not counted below
+        subprocess.run([*flask, '--app', 'worker', '--help'], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        print('=' * 60)
+        print('IMPORT-TIME BUDGET')
+        print('=' * 60)
+        print(f"{'Measurement':<34}{'ms':>10}{'budget':>10}")
+        print('-' * 60)
+
+        rows = [
+            ('flask --app run --help', time_command([*flask, '--app', 'run', '--help'], env, args.runs), args.cli_budget),
+            ('flask --app worker --help', time_command([*flask, '--app', 'worker', '--help'], env, args.runs), args.cli_budget),
+        ]
+        for mode in ('web', 'worker'):
+            elapsed, loaded = probe_app(mode, env, args.runs)
+            rows.append((f'create_app(mode={mode!r})', elapsed, args.startup_budget))
+            if loaded:
+                failures.append(f"{mode} mode imported {', '.join(loaded)} at startup")
+
+        for name, elapsed, budget in rows:
+            print(f"{name:<34}{elapsed:>10.1f}{f'{budget:.0f}' if budget else '-':>10}")
+            if budget and elapsed > budget:
+                failures.append(f'{name} took {elapsed:.0f} ms (budget {budget:.0f} ms)')
+        print('-' * 60)
+
+    if failures:
+        print('\nOVER BUDGET:')
+        for message in failures:
+            print(f'  ✗ {message}')
+        return 1
+
+    print(f"\n✓ {', '.join(LAZY_MODULES)} load on first use"
+          + ('; timings within budget' if args.cli_budget or args.startup_budget else ''))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+Meeting-Day Load Simulator
+Replays concurrent executive writes (contributions, batch entry,
+attendance, loan repayments) and reports throughput, tail latency and
+"database is locked" counts so configurations can be compared
+
+Usage:
+    # Self-contained: seed a temp SQLite DB, 4 worker processes x 2 threads, 30s
+    python benchmarks/meeting_day_load.py --workers 4 --threads 2 --duration 30
+
+    # Compare a setting (environment is passed to every worker)
+    python benchmarks/meeting_day_load.py --env SQLALCHEMY_ECHO=False --label baseline --json before.json
+
+    # Against a running server that uses an already seeded database
+    python benchmarks/meeting_day_load.py --url http://127.0.0.1:5000 --database sqlite:///sizing.db
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_MIX = 'add=40,batch=10,attendance=25,repay=25'
+LOCK_MESSAGE = 'database is locked'
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Meeting-day concurrent write load simulator')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes (like gunicorn workers)')
+    parser.add_argument('--threads', type=int, default=2, help='Concurrent executives per worker')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Operation weights, e.g. "add=40,batch=10,attendance=25,repay=25"')
+    parser.add_argument('--batch-size', type=int, default=20, help='Members per batch/attendance POST')
+    parser.add_argument('--members', type=int, default=300, help='Members to seed (self-contained mode)')
+    parser.add_argument('--years', type=int, default=2, help='Years of history to seed (self-contained mode)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--database', help='Database URL to use instead of a fresh temp SQLite file (receives writes!)')
+    parser.add_argument('--url', help='Base URL of a running server (default: in-process test clients)')
+    parser.add_argument('--password', default=None, help='Executive password (default: synthetic data password)')
+    parser.add_argument('--env', action='append', default=[], help='KEY=VALUE set in every worker before create_app')
+    parser.add_argument('--label', default='', help='Label stored with the results')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    return parser.parse_args(argv)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f'Unknown operation "{name}" (choose from {", ".join(OPERATIONS)})')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ----------------------------------------------------------------------
+# Operations
+# ----------------------------------------------------------------------
+
+def op_add(client, plan, state, rng):
+    member_id = rng.choice(plan['member_ids'])
+    return client.post('/contributions/add', data={
+        'member_id': member_id,
+        'amount': '100000',
+        'payment_date': date.today().isoformat(),
+        'contribution_month': date.today().strftime('%Y-%m'),
+        'payment_method': 'Cash',
+        'transaction_reference': f'LOAD{state["worker"]}-{rng.randrange(10 ** 9)}',
+    })
+
+
+def op_batch(client, plan, state, rng):
+    # Batch entry skips members who already paid for the month, so every
+    # executive thread walks its own range of far-future months
+    state['batch_month'] += 1
+    year, month = divmod(state['batch_month'], 12)
+    member_ids = rng.sample(plan['member_ids'], min(plan['batch_size'], len(plan['member_ids'])))
+    return client.post('/contributions/batch', data={
+        'contribution_month': f'{3000 + state["worker"] * 500 + year}-{month + 1:02d}',
+        'member_ids[]': member_ids,
+        'amounts[]': ['100000'] * len(member_ids),
+        'payment_dates[]': [date.today().isoformat()] * len(member_ids),
+        'payment_methods[]': ['Cash'] * len(member_ids),
+        'transaction_references[]': [''] * len(member_ids),
+    })
+
+
+def op_attendance(client, plan, state, rng):
+    member_ids = rng.sample(plan['member_ids'], min(plan['batch_size'], len(plan['member_ids'])))
+    statuses = [rng.choice(('Present', 'Present', 'Absent', 'Excused')) for _ in member_ids]
+    return client.post(f'/meetings/{plan["meeting_id"]}/attendance', data={
+        'member_ids[]': member_ids,
+        'statuses[]': statuses,
+        'arrival_times[]': [f'10:{rng.randrange(60):02d}' for _ in member_ids],
+    })
+
+
+def op_repay(client, plan, state, rng):
+    loan_id = rng.choice(plan['loan_ids'])
+    return client.post(f'/loans/{loan_id}/repay', data={
+        'amount': '1000',
+        'payment_date': date.today().isoformat(),
+        'payment_method': 'Cash',
+        'transaction_reference': f'LOADR{rng.randrange(10 ** 9)}',
+    })
+
+
+OPERATIONS = {
+    'add': op_add,
+    'batch': op_batch,
+    'attendance': op_attendance,
+    'repay': op_repay,
+}
+
+
+# ----------------------------------------------------------------------
+# Clients
+# ----------------------------------------------------------------------
+
+class HttpClient:
+    """Minimal test-client lookalike over requests for --url mode"""
+
+    def __init__(self, base_url):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def post(self, path, data):
+        return self.session.post(self.base_url + path, data=data, allow_redirects=False, timeout=120)
+
+
+def _classify(status_code, exception):
+    """Map a response (and the server-side exception, if seen) to an outcome"""
+    if exception is not None:
+        text = str(exception)
+        if LOCK_MESSAGE in text:
+            return 'locked'
+        if 'IntegrityError' in type(exception).__name__ or 'UNIQUE constraint' in text:
+            return 'integrity'
+        return 'error'
+    if status_code >= 500:
+        return 'error'
+    if status_code >= 400:
+        return 'rejected'
+    return 'ok'
+
+
+def worker_main(index, args, plan, barrier, results):
+    """Run one worker process: create the app, log in executives, replay the mix"""
+    for item in args.env:
+        key, _, value = item.partition('=')
+        os.environ[key] = value
+    os.environ['DATABASE_URL'] = plan['database_url']
+    os.environ.setdefault('QUERY_COUNT_WARN_THRESHOLD', '0')
+    os.environ.setdefault('N_PLUS_ONE_THRESHOLD', '0')
+
+    app = None
+    captured = threading.local()
+    if not args.url:
+        import logging
+        from flask import got_request_exception
+        from app import create_app
+
+        app = create_app(os.getenv('FLASK_ENV', 'production'))
+        app.logger.setLevel(logging.CRITICAL)
+
+        def remember_exception(sender, exception, **extra):
+            captured.exception = exception
+        got_request_exception.connect(remember_exception, app, weak=False)
+
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = []
+    lock = threading.Lock()
+
+    def executive(thread_index):
+        rng = random.Random(args.seed * 1000 + index * 100 + thread_index)
+        username = plan['usernames'][(index * args.threads + thread_index) % len(plan['usernames'])]
+        client = HttpClient(args.url) if args.url else app.test_client()
+        response = client.post('/login', data={'username': username, 'password': plan['password']})
+        barrier.wait()
+        if response.status_code != 302:
+            print(f'Login failed for {username}: HTTP {response.status_code}', file=sys.stderr)
+            return
+
+        state = {'worker': index * args.threads + thread_index, 'batch_month': 0}
+        deadline = time.perf_counter() + args.duration
+        local = []
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            captured.exception = None
+            started = time.perf_counter()
+            try:
+                response = OPERATIONS[name](client, plan, state, rng)
+                status_code, exception = response.status_code, captured.exception
+            except Exception as e:  # connection errors in --url mode
+                status_code, exception = 599, e
+            local.append((name, time.perf_counter() - started, _classify(status_code, exception)))
+
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=executive, args=(t,)) for t in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results.put(samples)
+
+
+# ----------------------------------------------------------------------
+# Setup and reporting
+# ----------------------------------------------------------------------
+
+def prepare_plan(args):
+    """Seed (or open) the database and collect ids the operations need"""
+    database_url = args.database
+    if not database_url:
+        workdir = tempfile.mkdtemp(prefix='otsc-load-')
+        database_url = f'sqlite:///{os.path.join(workdir, "load.db")}'
+
+    os.environ['DATABASE_URL'] = database_url
+    for item in args.env:
+        key, _, value = item.partition('=')
+        os.environ[key] = value
+
+    from app import create_app, db
+    from app.models import Member, User, Loan, Meeting
+    from app.utils.synthetic_data import generate_synthetic_data, SYNTHETIC_PASSWORD
+
+    app = create_app(os.getenv('FLASK_ENV', 'production'))
+    with app.app_context():
+        if not args.database:
+            print(f'Seeding {args.members} members / {args.years} years into {database_url} ...')
+            generate_synthetic_data(members=args.members, years=args.years, seed=args.seed)
+
+        usernames = [u for (u,) in db.session.query(User.username).filter(
+            User.role.in_(('Executive', 'SuperAdmin')), User.is_active == True
+        ).order_by(User.id)]
+        member_ids = [m for (m,) in db.session.query(Member.id).filter(Member.status == 'Active')]
+        loan_ids = [l for (l,) in db.session.query(Loan.id).filter(Loan.status.in_(('Active', 'Disbursed')))]
+        meeting_id = db.session.query(Meeting.id).filter(Meeting.status != 'Cancelled').order_by(
+            Meeting.meeting_date.desc()
+        ).limit(1).scalar()
+        db.session.remove()
+        db.engine.dispose()
+
+    if not (usernames and member_ids and loan_ids and meeting_id):
+        raise SystemExit('Database needs executives, active members, active loans and a meeting')
+
+    return {
+        'database_url': database_url,
+        'usernames': usernames,
+        'password': args.password or SYNTHETIC_PASSWORD,
+        'member_ids': member_ids,
+        'loan_ids': loan_ids,
+        'meeting_id': meeting_id,
+        'batch_size': args.batch_size,
+    }
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered) - 1, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+def summarize(samples, duration):
+    """Aggregate (operation, seconds, outcome) samples per operation and overall"""
+    groups = {'ALL': samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+
+    summary = {}
+    for name, rows in groups.items():
+        latencies = [seconds * 1000 for _, seconds, _ in rows]
+        outcomes = {}
+        for _, _, outcome in rows:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        summary[name] = {
+            'requests': len(rows),
+            'throughput_per_s': round(outcomes.get('ok', 0) / duration, 2),
+            'p50_ms': round(percentile(latencies, 0.50), 1),
+            'p95_ms': round(percentile(latencies, 0.95), 1),
+            'p99_ms': round(percentile(latencies, 0.99), 1),
+            'max_ms': round(max(latencies), 1) if latencies else 0.0,
+            'ok': outcomes.get('ok', 0),
+            'locked': outcomes.get('locked', 0),
+            'integrity': outcomes.get('integrity', 0),
+            'errors': outcomes.get('error', 0) + outcomes.get('rejected', 0),
+        }
+    return summary
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    parse_mix(args.mix)
+    plan = prepare_plan(args)
+
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(args.workers * args.threads + 1)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=worker_main, args=(i, args, plan, barrier, results))
+        for i in range(args.workers)
+    ]
+
+    print('=' * 96)
+    print('MEETING-DAY LOAD SIMULATION' + (f' [{args.label}]' if args.label else ''))
+    print('=' * 96)
+    print(f'Target: {args.url or "in-process test clients"}  Database: {plan["database_url"]}')
+    print(f'{args.workers} workers x {args.threads} executives for {args.duration:.0f}s, mix {args.mix}')
+
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+
+    samples = []
+    for _ in processes:
+        samples.extend(results.get())
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(samples, elapsed)
+
+    print(f"\n{'Operation':<12}{'requests':>10}{'ok/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'max ms':>10}{'locked':>9}{'integrity':>11}{'errors':>8}")
+    print('-' * 96)
+    for name in [n for n in OPERATIONS if n in summary] + ['ALL']:
+        row = summary[name]
+        print(f"{name:<12}{row['requests']:>10}{row['throughput_per_s']:>9.1f}{row['p50_ms']:>10.1f}"
+              f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}"
+              f"{row['locked']:>9}{row['integrity']:>11}{row['errors']:>8}")
+    print('-' * 96)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'label': args.label,
+                'workers': args.workers,
+                'threads': args.threads,
+                'duration': args.duration,
+                'mix': args.mix,
+                'env': args.env,
+                'target': args.url or 'test-client',
+                'results': summary,
+            }, f, indent=2)
+        print(f'Results written to {args.json}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
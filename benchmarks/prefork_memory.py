@@ -0,0 +1,188 @@
+"""
+Prefork Memory Measurement
+Forks workers the way gunicorn does, with and without preloading, serves
+the same requests in each worker and reports per-worker memory
+
+For each worker it reads /proc/self/smaps_rollup (Linux only):
+    RSS: resident pages, shared ones counted in full
+    PSS: shared pages divided among the processes sharing them
+    USS: pages private to the worker (what each extra worker really costs)
+
+Usage:
+    python benchmarks/prefork_memory.py
+    python benchmarks/prefork_memory.py --workers 8 --requests 20
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+PATHS = [
+    '/dashboard',
+    '/members/',
+    '/contributions/',
+    '/contributions/summary',
+    '/loans/',
+    '/reports/financial-summary',
+    '/contributions/1/receipt',
+]
+
+
+def memory_kb():
+    """RSS, PSS and USS of this process in KiB"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'uss': values['Private_Clean'] + values['Private_Dirty'],
+    }
+
+
+def serve(app, requests):
+    """Log in and request each page a few times, like a worker under load"""
+    from app.models import User
+    from app.utils.synthetic_data import SYNTHETIC_PASSWORD
+
+    with app.app_context():
+        username = User.query.filter_by(role='Executive').first().username
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': SYNTHETIC_PASSWORD})
+    for _ in range(requests):
+        for path in PATHS:
+            response = client.get(path)
+            if response.status_code != 200:
+                raise RuntimeError(f'{path}: HTTP {response.status_code}')
+
+
+def run_scenario(preload_app, workers, requests):
+    """
+    Fork workers and collect their memory once all of them have served
+
+    Returns:
+        Dict with master and per-worker memory
+    """
+    app = None
+    if preload_app:
+        from app import create_app
+        from app.utils.preload import preload
+        app = create_app('production')
+        preload(app)
+
+    ready_r, ready_w = os.pipe()
+    results_r, results_w = os.pipe()
+    go = []
+    children = []
+    for _ in range(workers):
+        go_r, go_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            os.close(results_r)
+            os.close(go_w)
+            worker_app = app
+            if worker_app is None:
+                from app import create_app
+                worker_app = create_app('production')
+            else:
+                from app.utils.preload import after_fork
+                after_fork(worker_app)
+            serve(worker_app, requests)
+            os.write(ready_w, b'.')
+            os.read(go_r, 1)
+            line = json.dumps(memory_kb()) + '\n'
+            os.write(results_w, line.encode())
+            os._exit(0)
+        os.close(go_r)
+        go.append(go_w)
+        children.append(pid)
+
+    os.close(ready_w)
+    os.close(results_w)
+    received = 0
+    while received < workers:
+        chunk = os.read(ready_r, workers)
+        if not chunk:
+            raise RuntimeError('A worker exited before serving its requests')
+        received += len(chunk)
+
+    # Measure while every worker is alive so shared pages are split fairly
+    master = memory_kb()
+    for go_w in go:
+        os.write(go_w, b'.')
+        os.close(go_w)
+    with os.fdopen(results_r) as f:
+        worker_memory = [json.loads(line) for line in f]
+    for pid in children:
+        os.waitpid(pid, 0)
+
+    return {'master': master, 'workers': worker_memory}
+
+
+def _average(rows, key):
+    return sum(r[key] for r in rows) / len(rows) / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-worker memory with and without preloading')
+    parser.add_argument('--workers', type=int, default=4, help='Workers to fork')
+    parser.add_argument('--requests', type=int, default=10, help='Passes over the pages per worker')
+    parser.add_argument('--members', type=int, default=200, help='Members in the generated database')
+    parser.add_argument('--scenario', choices=['lazy', 'preload'], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print('This measurement needs Linux (/proc/self/smaps_rollup)')
+        return 1
+
+    if args.scenario:
+        # Child run: one scenario in a fresh interpreter
+        result = run_scenario(args.scenario == 'preload', args.workers, args.requests)
+        print(json.dumps(result))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'prefork.db')}"
+        env['METRICS_ENABLED'] = 'False'
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'worker', 'seed-synthetic',
+             '--members', str(args.members), '--years', '2'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+        results = {}
+        for scenario in ('lazy', 'preload'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--scenario', scenario,
+                 '--workers', str(args.workers), '--requests', str(args.requests)],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results[scenario] = json.loads(output.strip().splitlines()[-1])
+
+    print('=' * 72)
+    print(f'PREFORK MEMORY ({args.workers} workers, {args.requests} passes over {len(PATHS)} pages)')
+    print('=' * 72)
+    print(f"{'Mode':<10}{'RSS/worker':>14}{'PSS/worker':>14}{'USS/worker':>14}{'Total PSS':>14}")
+    print('-' * 72)
+    for scenario, result in results.items():
+        workers = result['workers']
+        total = (sum(w['pss'] for w in workers) + result['master']['pss']) / 1024
+        print(f"{scenario:<10}{_average(workers, 'rss'):>11.1f} MB{_average(workers, 'pss'):>11.1f} MB"
+              f"{_average(workers, 'uss'):>11.1f} MB{total:>11.1f} MB")
+    print('-' * 72)
+    print('Total PSS includes the master process.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Benchmark Runner
+Drives hot endpoints and model paths against a generated database,
+records p50/p95 latency and query counts, and compares with a baseline
+
+Usage:
+    python benchmarks/run_benchmarks.py                     # Compare with baseline
+    python benchmarks/run_benchmarks.py --update-baseline   # Record a new baseline
+    python benchmarks/run_benchmarks.py --members 500 --years 3 --only report
+    python benchmarks/run_benchmarks.py --database postgresql+psycopg://otsc@localhost/otsc_bench \
+        --baseline benchmarks/baseline-postgresql.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+class Bench:
+    """State shared by cases during a run"""
+
+    def __init__(self, app, info):
+        self.app = app
+        self.info = info
+        self.client = None
+        self.batch_counter = 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Route-level benchmark suite')
+    parser.add_argument('--members', type=int, default=200, help='Members in the generated database')
+    parser.add_argument('--years', type=int, default=2, help='Years of history to generate')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset')
+    parser.add_argument('--iterations', type=int, default=20, help='Measured iterations per case')
+    parser.add_argument('--warmup', type=int, default=3, help='Unmeasured iterations per case')
+    parser.add_argument('--only', default='', help='Run cases whose name contains this text')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Write results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative p95 slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help='Ignore p95 slowdowns smaller than this (timer noise)')
+    parser.add_argument('--query-tolerance', type=int, default=0,
+                        help='Allowed extra queries per iteration before failing')
+    parser.add_argument('--database', default=None,
+                        help='Empty database URL to use instead of a temp SQLite file (e.g. PostgreSQL)')
+    return parser.parse_args(argv)
+
+
+def create_bench_app(database_url):
+    """Create the app against a throwaway database"""
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('QUERY_COUNT_WARN_THRESHOLD', '0')
+    os.environ.setdefault('N_PLUS_ONE_THRESHOLD', '0')
+
+    from app import create_app
+    return create_app('benchmark')
+
+
+def login(app, info, role):
+    """Get a test client logged in with the generated user for a role"""
+    from benchmarks.dataset import BENCH_PASSWORD
+
+    username = info['usernames'][role]
+    client = app.test_client()
+    response = client.post('/login', data={'username': username, 'password': BENCH_PASSWORD})
+    if response.status_code != 302:
+        raise RuntimeError(f'Login failed for {role}: HTTP {response.status_code}')
+    return client
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_case(bench, case, iterations, warmup):
+    """
+    Run one case
+
+    Returns:
+        Dict with p50_ms, p95_ms, mean_ms and queries (max per iteration)
+    """
+    from app.utils.query_counter import record_queries
+
+    for _ in range(warmup):
+        case.run(bench)
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with record_queries() as recorder:
+            started = time.perf_counter()
+            case.run(bench)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(recorder.count)
+
+    return {
+        'p50_ms': round(percentile(timings, 0.50), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'queries': max(queries),
+    }
+
+
+def compare(results, baseline, args):
+    """
+    Compare results with a baseline
+
+    Returns:
+        List of regression messages (empty when within tolerance)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline['cases'].get(name)
+        if base is None:
+            continue
+
+        allowed_p95 = max(base['p95_ms'] * (1 + args.tolerance), base['p95_ms'] + args.min_delta_ms)
+        if result['p95_ms'] > allowed_p95:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.1f}ms > {allowed_p95:.1f}ms "
+                f"(baseline {base['p95_ms']:.1f}ms)"
+            )
+
+        if result['queries'] > base['queries'] + args.query_tolerance:
+            regressions.append(
+                f"{name}: {result['queries']} queries > baseline {base['queries']}"
+            )
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.database:
+        database_url = args.database
+    else:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='otsc-bench-'), 'bench.db')}"
+    app = create_bench_app(database_url)
+
+    from app import db
+    from benchmarks.cases import CASES
+    from benchmarks.dataset import build_dataset
+
+    cases = [case for case in CASES if args.only in case.name]
+    with app.app_context():
+        backend = db.engine.dialect.name
+        display_url = db.engine.url.render_as_string(hide_password=True)
+
+    scale = {'members': args.members, 'years': args.years, 'seed': args.seed}
+    if backend != 'sqlite':
+        scale['backend'] = backend
+
+    print('=' * 78)
+    print('BENCHMARKS')
+    print('=' * 78)
+    print(f'Database: {display_url}')
+
+    with app.app_context():
+        started = time.perf_counter()
+        info = build_dataset(members=args.members, years=args.years, seed=args.seed)
+        print(f"Dataset: {info['members']} members, {info['contributions']} contributions, "
+              f"{info['loans']} loans ({time.perf_counter() - started:.1f}s)")
+        db.session.remove()
+
+    bench = Bench(app, info)
+    clients = {}
+    results = {}
+
+    print(f"\n{'Case':<34}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'queries':>10}")
+    print('-' * 78)
+    for case in cases:
+        if case.role:
+            if case.role not in clients:
+                clients[case.role] = login(app, info, case.role)
+            bench.client = clients[case.role]
+            result = run_case(bench, case, args.iterations, args.warmup)
+        else:
+            with app.app_context():
+                result = run_case(bench, case, args.iterations, args.warmup)
+                db.session.remove()
+
+        results[case.name] = result
+        print(f"{case.name:<34}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+              f"{result['mean_ms']:>10.2f}{result['queries']:>10}")
+
+    print('-' * 78)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump({'scale': scale, 'iterations': args.iterations, 'cases': results}, f, indent=2, sort_keys=True)
+        print(f'\nBaseline written to {args.baseline}')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    if baseline.get('scale') != scale:
+        print(f"\nBaseline scale {baseline.get('scale')} differs from this run {scale}; "
+              f"rerun with matching options or --update-baseline.")
+        return 2
+
+    regressions = compare(results, baseline, args)
+    if regressions:
+        print('\nREGRESSIONS:')
+        for message in regressions:
+            print(f'  ✗ {message}')
+        return 1
+
+    print(f'\n✓ Within tolerance of {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Template Cold Start
+First-request latency of a fresh worker with and without the Jinja
+bytecode cache, against the same requests once the worker is warm
+
+Each scenario runs in a fresh interpreter against a temporary database:
+    cold: no bytecode cache, every template is parsed and compiled
+    bytecode: cache filled by `flask precompile-templates` beforehand
+    startup: bytecode cache, plus warm_caches() when the app is created
+             (what the WSGI file does; see PYTHONANYWHERE_DEPLOYMENT.md)
+Warm latency is the second pass over the pages in the same process.
+
+Usage:
+    python benchmarks/template_cold_start.py
+    python benchmarks/template_cold_start.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PATHS = [
+    '/dashboard',
+    '/members/',
+    '/contributions/',
+    '/loans/',
+    '/reports/financial-summary',
+    '/reports/loans',
+]
+
+_PROBE = """
+import json, sys, time
+from app import create_app
+from app.models import User
+from app.utils.synthetic_data import SYNTHETIC_PASSWORD
+
+app = create_app('production')
+if sys.argv[1] == 'startup':
+    from app.utils.preload import warm_caches
+    warm_caches(app)
+with app.app_context():
+    username = User.query.filter_by(role='Executive').first().username
+client = app.test_client()
+client.post('/login', data={'username': username, 'password': SYNTHETIC_PASSWORD})
+
+passes = []
+for _ in range(2):
+    timings = {}
+    for path in sys.argv[2:]:
+        start = time.perf_counter()
+        response = client.get(path)
+        timings[path] = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            raise SystemExit(f'{path}: HTTP {response.status_code}')
+    passes.append(timings)
+print(json.dumps(passes))
+"""
+
+
+def run_probe(env, scenario):
+    """First and second pass timings (ms per path) in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE, scenario] + PATHS,
+        cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='First-request latency with and without the template bytecode cache')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh processes per scenario (median is reported)')
+    parser.add_argument('--members', type=int, default=100, help='Members in the generated database')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'cold.db')}"
+        env['METRICS_ENABLED'] = 'False'
+        env['TEMPLATE_CACHE_DIR'] = os.path.join(tmp, 'jinja_cache')
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'worker', 'seed-synthetic',
+             '--members', str(args.members), '--years', '2'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+        cold_env = dict(env, TEMPLATE_BYTECODE_CACHE='False')
+        subprocess.run(
+            [sys.executable, '-m', 'flask', '--app', 'run', 'precompile-templates', '--clear'],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+        results = {'cold': [], 'bytecode': [], 'startup': []}
+        for _ in range(args.runs):
+            results['cold'].append(run_probe(cold_env, 'cold'))
+            results['bytecode'].append(run_probe(env, 'bytecode'))
+            results['startup'].append(run_probe(env, 'startup'))
+
+    print('=' * 72)
+    print(f'TEMPLATE COLD START (median of {args.runs} fresh processes, ms)')
+    print('=' * 72)
+    print(f"{'Page':<30}{'Cold':>10}{'Bytecode':>10}{'Startup':>10}{'Warm':>10}")
+    print('-' * 72)
+    totals = {'cold': 0, 'bytecode': 0, 'startup': 0, 'warm': 0}
+    for path in PATHS:
+        row = {
+            'cold': statistics.median(run[0][path] for run in results['cold']),
+            'bytecode': statistics.median(run[0][path] for run in results['bytecode']),
+            'startup': statistics.median(run[0][path] for run in results['startup']),
+            'warm': statistics.median(run[1][path] for run in results['bytecode']),
+        }
+        for key, value in row.items():
+            totals[key] += value
+        print(f"{path:<30}" + ''.join(f'{row[key]:>10.1f}' for key in totals))
+    print('-' * 72)
+    print(f"{'Total':<30}" + ''.join(f'{totals[key]:>10.1f}' for key in totals))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,7 +13,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from sqlalchemy import text
+from sqlalchemy import text, inspect
 
 def migrate(auto_confirm=False):
     """Add due_date column to loans table"""
@@ -40,8 +40,7 @@ def migrate(auto_confirm=False):
 
         try:
             # Check if column already exists
-            result = db.session.execute(text("PRAGMA table_info(loans)"))
-            columns = [row[1] for row in result.fetchall()]
+            columns = [column['name'] for column in inspect(db.engine).get_columns('loans')]
 
             if 'due_date' in columns:
                 print("\n✓ Column 'due_date' already exists. Skipping column creation.")
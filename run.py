@@ -24,7 +24,8 @@ def make_shell_context():
 def init_db_command():
     """Initialize the database tables"""
     with app.app_context():
-        db.create_all()
+        from app.migrations import upgrade
+        upgrade()
 
         # Initialize default system settings
         from app.models.system import SystemSetting
@@ -14,7 +14,8 @@ cd /home/alex/savings-system
 source venv/bin/activate
 
 # Run the Flask command
-flask send-loan-reminders
+# Worker mode skips blueprints and templates so the job starts quickly
+flask --app worker send-loan-reminders
 
 # Exit
 exit 0
@@ -0,0 +1,46 @@
+"""
+Test fixtures
+One application per session on a temporary SQLite database, filled with a
+small synthetic history (see docs/SYNTHETIC_DATA.md)
+"""
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    from app import create_app, db
+    from app.utils.synthetic_data import generate_synthetic_data
+
+    # create_app() reads its settings from the environment; restore it afterwards
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('DATABASE_URL', f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}")
+        env.setenv('METRICS_ENABLED', 'False')
+        env.setenv('FRAGMENT_CACHE_ENABLED', 'True')
+        app = create_app()
+
+    app.config['TESTING'] = True
+    with app.app_context():
+        generate_synthetic_data(members=40, years=2, seed=1)
+        db.session.remove()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client, app):
+    """Log the test client in as a synthetic member, e.g. login('OT-006')"""
+    def _login(member_number):
+        from app.models.member import Member
+        from app.utils.synthetic_data import SYNTHETIC_PASSWORD
+
+        with app.app_context():
+            member = Member.query.filter_by(member_number=member_number).one()
+            username = member.user.username
+        response = client.post('/login', data={'username': username, 'password': SYNTHETIC_PASSWORD})
+        assert response.status_code == 302
+        return client
+    return _login
@@ -0,0 +1,52 @@
+"""
+Amortization
+Schedules spread principal and interest evenly with the remainders on the
+last instalment; repayments pay instalments oldest first, interest first
+"""
+from datetime import date
+
+
+def make_loan(amount=100_000, total=121_000, months=3):
+    from app.models.loan import Loan
+
+    return Loan(amount_approved=amount, total_payable=total,
+                repayment_period_months=months, disbursement_date=date(2026, 1, 31))
+
+
+def test_schedule_puts_remainders_on_the_last_instalment():
+    from app.utils.amortization import build_schedule
+
+    instalments = build_schedule(make_loan())
+    assert [i.principal_due for i in instalments] == [33_333, 33_333, 33_334]
+    assert [i.interest_due for i in instalments] == [7_000, 7_000, 7_000]
+    assert [i.cumulative_due for i in instalments] == [40_333, 80_666, 121_000]
+    assert [i.due_date for i in instalments] == [date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
+
+
+def test_payment_is_allocated_across_instalments_interest_first():
+    from app.utils.amortization import apply_payment, build_schedule
+
+    instalments = build_schedule(make_loan())
+    assert apply_payment(instalments, 50_000, date(2026, 3, 1)) == (36_000, 14_000)
+
+    first, second, third = instalments
+    assert first.outstanding == 0 and first.paid_date == date(2026, 3, 1)
+    assert (second.interest_paid, second.principal_paid) == (7_000, 2_667)
+    assert second.paid_date is None
+    assert third.amount_paid == 0
+
+
+def test_overpayment_counts_as_principal():
+    from app.utils.amortization import apply_payment, build_schedule
+
+    instalments = build_schedule(make_loan())
+    assert apply_payment(instalments, 130_000, date(2026, 3, 1)) == (109_000, 21_000)
+    assert all(i.outstanding == 0 and i.paid_date == date(2026, 3, 1) for i in instalments)
+
+
+def test_loan_without_schedule_splits_in_proportion(app):
+    from app.utils.amortization import allocate_repayment
+
+    with app.app_context():
+        # Never flushed, so no instalment rows refer to it
+        assert allocate_repayment(make_loan(), 12_100, date(2026, 3, 1)) == (10_000, 2_100)
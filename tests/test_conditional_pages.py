@@ -0,0 +1,36 @@
+"""
+Conditional pages
+ETags follow the page's tables and the current user's own rows, not
+other users' accounts
+"""
+
+
+def test_etag_follows_own_user_row_only(app, login):
+    from app import db
+    from app.models.user import User
+    from app.models.member import Member
+    from app.utils.synthetic_data import SYNTHETIC_PASSWORD
+
+    client = login('OT-006')
+    etag = client.get('/api/v1/notifications').headers['ETag']
+
+    def revalidate():
+        return client.get('/api/v1/notifications', headers={'If-None-Match': etag}).status_code
+
+    def toggle(member_number):
+        with app.app_context():
+            user = User.query.join(Member).filter(Member.member_number == member_number).one()
+            user.is_active = not user.is_active
+            db.session.commit()
+            user.is_active = not user.is_active
+            db.session.commit()
+
+    other = app.test_client()
+    with app.app_context():
+        username = Member.query.filter_by(member_number='OT-008').one().user.username
+    assert other.post('/login', data={'username': username, 'password': SYNTHETIC_PASSWORD}).status_code == 302
+    toggle('OT-009')
+    assert revalidate() == 304
+
+    toggle('OT-006')
+    assert revalidate() == 200
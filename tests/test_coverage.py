@@ -0,0 +1,80 @@
+"""
+Contribution coverage
+Paid-months bitmask: streaks, gaps and arrears as of a date
+"""
+from datetime import date
+from app.utils.coverage import Coverage, month_index, qualifies
+
+AS_OF = date(2025, 10, 15)
+
+
+def test_streak_counts_back_from_this_month_or_last():
+    coverage = Coverage.from_months(['2025-07', '2025-08', '2025-09'], joined=date(2025, 7, 1))
+    assert coverage.streak(AS_OF) == 3          # October still in progress
+    coverage.add('2025-10')
+    assert coverage.streak(AS_OF) == 4
+    assert coverage.streak(date(2025, 12, 1)) == 0
+
+
+def test_double_payment_in_one_month_is_one_month():
+    coverage = Coverage.from_months(['2025-08', '2025-08', '2025-09'], joined=date(2025, 8, 1))
+    assert coverage.paid_months == 2
+    assert coverage.streak(AS_OF) == 2
+
+
+def test_skipped_month_breaks_the_streak():
+    coverage = Coverage.from_months(['2025-05', '2025-06', '2025-08', '2025-09'], joined=date(2025, 5, 1))
+    assert coverage.streak(AS_OF) == 2
+    assert coverage.months_missed(AS_OF) == 0
+    assert coverage.months_in_arrears(AS_OF) == 1
+    assert coverage.longest_gap(AS_OF) == 1
+
+
+def test_missed_counts_the_trailing_gap_and_arrears_every_gap():
+    coverage = Coverage.from_months(['2025-01', '2025-04', '2025-05', '2025-06'], joined=date(2025, 1, 1))
+    # July, August and September unpaid; February and March before them
+    assert coverage.months_missed(AS_OF) == 3
+    assert coverage.months_in_arrears(AS_OF) == 5
+    assert coverage.longest_gap(AS_OF) == 3
+    assert coverage.streak(AS_OF) == 0
+
+
+def test_paying_ahead_extends_the_streak():
+    coverage = Coverage.from_months(['2025-09', '2025-10', '2025-11', '2025-12'], joined=date(2025, 9, 1))
+    assert coverage.is_paid('2025-12')
+    assert coverage.streak(AS_OF) == 2
+    assert coverage.streak(date(2025, 12, 20)) == 4
+    assert coverage.months_missed(AS_OF) == 0
+    assert coverage.months_in_arrears(AS_OF) == 0
+
+
+def test_member_who_never_paid_is_in_arrears_since_joining():
+    coverage = Coverage.from_months([], joined=date(2025, 7, 20))
+    assert coverage.start == month_index(date(2025, 7, 1))
+    assert coverage.streak(AS_OF) == 0
+    assert coverage.months_in_arrears(AS_OF) == 3
+
+
+def test_add_earlier_month_moves_bit_zero_back():
+    coverage = Coverage.from_months(['2025-08', '2025-09'])
+    coverage.add('2025-05')
+    assert coverage.start == month_index('2025-05')
+    assert [m for m in ('2025-05', '2025-06', '2025-07', '2025-08', '2025-09') if coverage.is_paid(m)] == \
+        ['2025-05', '2025-08', '2025-09']
+    assert coverage.streak(AS_OF) == 2
+    assert coverage.months_in_arrears(AS_OF) == 2
+
+
+def test_empty_coverage():
+    coverage = Coverage()
+    assert not coverage.is_paid('2025-10')
+    assert coverage.streak(AS_OF) == coverage.months_missed(AS_OF) == coverage.months_in_arrears(AS_OF) == 0
+    coverage.add('2025-10')
+    assert coverage.start == month_index('2025-10') and coverage.bits == 1
+
+
+def test_only_active_members_qualify():
+    assert qualifies('Active', 5, 5)
+    assert not qualifies('Active', 4, 5)
+    assert not qualifies('Suspended', 12, 5)
+    assert not qualifies('Active', None, 5)
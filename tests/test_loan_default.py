@@ -0,0 +1,50 @@
+"""
+Loan default
+A defaulted loan is still open: it stays in the arrears queries, takes
+repayments and returns to Active once it has caught up
+"""
+from datetime import date, timedelta
+
+
+def test_defaulted_loan_can_be_repaid_back_to_active(app, login):
+    from app import db
+    from app.models.loan import Loan, LoanInstalment
+    from app.utils.amortization import arrears, overdue_loans
+    from app.utils.loan_aging import age_loans
+
+    with app.app_context():
+        # An Active loan with two instalments still to pay, aged as of the day
+        # after the first falls due
+        unpaid = db.session.query(LoanInstalment.loan_id, LoanInstalment.due_date).join(Loan).filter(
+            Loan.status == 'Active',
+            LoanInstalment.paid_date.is_(None)
+        ).order_by(LoanInstalment.loan_id, LoanInstalment.due_date).all()
+        due = {}
+        for loan_id, due_date in unpaid:
+            due.setdefault(loan_id, []).append(due_date)
+        loan_id, dates = next((loan_id, dates) for loan_id, dates in due.items() if len(dates) >= 2)
+        as_of = dates[0] + timedelta(days=1)
+        amount = arrears(db.session.get(Loan, loan_id), as_of)
+
+        age_loans(as_of=as_of, default_days=1)
+        loan = db.session.get(Loan, loan_id)
+        assert loan.status == 'Defaulted'
+        assert loan_id in {loan.id for loan, _, _ in overdue_loans(as_of)}
+        balance, default_date = loan.balance, loan.default_date
+        db.session.remove()
+
+    client = login('OT-002')
+    response = client.post(f'/loans/{loan_id}/repay', data={
+        'amount': str(amount),
+        'payment_date': date.today().isoformat(),
+        'payment_method': 'Cash',
+    })
+    assert response.status_code == 302
+
+    with app.app_context():
+        loan = db.session.get(Loan, loan_id)
+        assert loan.balance == balance - amount
+        assert loan.status == 'Active'
+        assert loan.days_past_due == 0 and loan.arrears_amount == 0
+        assert loan.default_date == default_date
+        assert loan_id not in {loan.id for loan, _, _ in overdue_loans(as_of)}
@@ -0,0 +1,58 @@
+"""
+Member directory
+Executives get every member; other users only what a guarantor picker needs
+"""
+
+
+def test_member_gets_basic_directory(login):
+    client = login('OT-006')
+    members = client.get('/members/directory.json').get_json()['members']
+    assert members
+    assert all(set(m) == {'id', 'number', 'name', 'qualified'} for m in members)
+
+
+def test_basic_directory_lists_active_members_only(app, login):
+    from app.models.member import Member
+
+    client = login('OT-006')
+    ids = {m['id'] for m in client.get('/members/directory.json').get_json()['members']}
+    with app.app_context():
+        active = {member_id for member_id, in Member.query.filter_by(status='Active').with_entities(Member.id)}
+    assert ids == active
+
+
+def test_executive_gets_full_directory(login):
+    client = login('OT-002')
+    members = client.get('/members/directory.json').get_json()['members']
+    assert {'status', 'has_user', 'phone'} <= set(members[0])
+    assert len({m['status'] for m in members}) > 1
+
+
+def test_directory_version_ignores_logins_and_totals(app, login):
+    from app import db
+    from app.models.member import Member
+    from app.models.system import DataVersion
+    from app.utils.member_directory import get_directory_version
+
+    def versions():
+        with app.app_context():
+            return get_directory_version(), DataVersion.get_versions('users')['users']
+
+    before = versions()
+    login('OT-007')
+    with app.app_context():
+        member = Member.query.filter_by(member_number='OT-007').one()
+        member.total_contributed += 1
+        db.session.commit()
+    assert versions() == before
+
+    with app.app_context():
+        member = Member.query.filter_by(member_number='OT-007').one()
+        member.total_contributed -= 1
+        member.phone_primary = member.phone_primary + '0'
+        db.session.commit()
+        member.phone_primary = member.phone_primary[:-1]
+        db.session.commit()
+    directory, users = versions()
+    assert int(directory) == int(before[0]) + 2
+    assert users == before[1]
@@ -0,0 +1,48 @@
+"""
+Schema migrations
+create_app() only creates an empty database; pending migrations wait for
+`flask db upgrade` or the gunicorn master's auto_upgrade()
+"""
+import pytest
+
+
+def make_app(tmp_path, auto_upgrade='False'):
+    from app import create_app
+
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'schema.db'}")
+        env.setenv('METRICS_ENABLED', 'False')
+        env.setenv('SCHEMA_AUTO_UPGRADE', auto_upgrade)
+        return create_app(mode='worker')
+
+
+def revision(app):
+    from app import migrations
+
+    with app.app_context():
+        return migrations.current_revision()
+
+
+def test_startup_does_not_undo_a_downgrade(tmp_path):
+    from app import migrations
+
+    app = make_app(tmp_path)
+    head = migrations.head_revision()
+    assert revision(app) == head
+
+    with app.app_context():
+        migrations.downgrade(head - 1)
+    assert revision(make_app(tmp_path)) == head - 1
+
+
+def test_auto_upgrade_applies_pending_migrations(tmp_path):
+    from app import migrations
+
+    app = make_app(tmp_path)
+    head = migrations.head_revision()
+    with app.app_context():
+        migrations.downgrade(head - 2)
+
+    assert migrations.auto_upgrade(make_app(tmp_path)) is None
+    assert migrations.auto_upgrade(make_app(tmp_path, auto_upgrade='True')) == (head - 2, head)
+    assert revision(app) == head
@@ -0,0 +1,63 @@
+"""
+PostgreSQL
+Runs the migrations, a synthetic seed and the nightly jobs against a
+scratch database on the server in TEST_POSTGRES_URL. Skipped when it is
+not set to a postgresql:// URL.
+
+    pip install "psycopg[binary]"
+    TEST_POSTGRES_URL=postgresql+psycopg://otsc@localhost/postgres python -m pytest tests/test_postgresql.py
+
+The user needs CREATEDB. The scratch database is dropped afterwards; the
+database named in the URL is only used to connect.
+"""
+import os
+import subprocess
+import sys
+import uuid
+import pytest
+
+SERVER_URL = os.getenv('TEST_POSTGRES_URL', '')
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+pytestmark = pytest.mark.skipif(
+    not SERVER_URL.startswith('postgresql'),
+    reason='TEST_POSTGRES_URL is not set to a postgresql:// URL'
+)
+
+
+@pytest.fixture(scope='module')
+def database_url():
+    from sqlalchemy import create_engine, make_url, text
+
+    url = make_url(SERVER_URL)
+    name = f'otsc_test_{uuid.uuid4().hex[:8]}'
+    server = create_engine(url, isolation_level='AUTOCOMMIT')
+    with server.connect() as connection:
+        connection.execute(text(f'CREATE DATABASE {name}'))
+    try:
+        yield url.set(database=name).render_as_string(hide_password=False)
+    finally:
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS {name} WITH (FORCE)'))
+        server.dispose()
+
+
+def flask(database_url, *args):
+    """Run a worker-mode flask command in a fresh process"""
+    env = dict(os.environ, DATABASE_URL=database_url, METRICS_ENABLED='False', SCHEMA_AUTO_UPGRADE='False')
+    env.pop('APP_MODE', None)
+    return subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'worker', *args],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def test_upgrade_seed_and_nightly_jobs(database_url):
+    for command in (
+        ['db', 'upgrade'],
+        ['seed-synthetic', '--members', '60', '--years', '2'],
+        ['age-loans'],
+        ['evaluate-membership'],
+    ):
+        result = flask(database_url, *command)
+        assert result.returncode == 0, f"flask {' '.join(command)} failed:\n{result.stdout}\n{result.stderr}"
@@ -0,0 +1,22 @@
+"""
+Query budgets
+Each test fails when a page issues more SQL statements than its budget,
+listing the repeated statements (usually an N+1 on a lazy relationship)
+"""
+from app.utils.query_counter import assert_max_queries
+
+
+def test_member_dashboard(login):
+    client = login('OT-006')
+    with assert_max_queries(11):
+        response = client.get('/dashboard')
+    assert response.status_code == 200
+
+
+def test_executive_dashboard_warm_cache(login):
+    client = login('OT-002')
+    client.get('/dashboard')
+    # Statistics and Action Required fragments come from the fragment cache
+    with assert_max_queries(8):
+        response = client.get('/dashboard')
+    assert response.status_code == 200
@@ -0,0 +1,20 @@
+"""
+Startup imports
+Heavy optional modules must load on first use, not while the app starts,
+and create_app() must stay within STARTUP_BUDGET_MS (generous by default;
+set it in CI for the runner, 0 to skip the timing)
+"""
+import pytest
+
+from benchmarks.import_budget import LAZY_MODULES, STARTUP_BUDGET_MS, probe_app, _env
+
+
+@pytest.mark.parametrize('mode', ['web', 'worker'])
+def test_startup_is_lazy_and_within_budget(mode, tmp_path):
+    # Fresh interpreters: this one has already imported the whole app.
+    # The median of three leaves out the first run's schema creation.
+    elapsed, loaded = probe_app(mode, _env(f"sqlite:///{tmp_path / 'startup.db'}"), runs=3)
+    assert loaded == [], f"{mode} mode imported {', '.join(loaded)} at startup"
+    if STARTUP_BUDGET_MS:
+        assert elapsed <= STARTUP_BUDGET_MS, \
+            f'{mode} create_app() took {elapsed:.0f} ms (STARTUP_BUDGET_MS={STARTUP_BUDGET_MS:.0f})'
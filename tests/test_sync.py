@@ -0,0 +1,49 @@
+"""
+Delta sync
+/api/v1/sync sends everything once, then only what changed, and answers
+304 while nothing has
+"""
+from datetime import timedelta
+
+
+def test_full_then_delta_sync(app, login, monkeypatch):
+    from app import db
+    from app.models.contribution import Contribution
+    from app.models.member import Member
+
+    # The seed wrote every row moments ago; with the usual overlap the
+    # first token would still cover them
+    monkeypatch.setattr('app.routes.api.SYNC_OVERLAP', timedelta(0))
+    client = login('OT-006')
+
+    full = client.get('/api/v1/sync').get_json()
+    assert full['full'] is True
+    assert full['contributions']
+    assert sorted(full['contribution_ids']) == sorted(c['id'] for c in full['contributions'])
+
+    url = f"/api/v1/sync?since={full['token']}"
+    delta = client.get(url)
+    body = delta.get_json()
+    assert body['full'] is False
+    assert all(body[key] == [] for key in ('contributions', 'loans', 'repayments', 'welfare', 'notifications'))
+    assert body['token'] == full['token']
+    assert body['contribution_ids'] == full['contribution_ids']
+    assert client.get(url, headers={'If-None-Match': delta.headers['ETag']}).status_code == 304
+
+    with app.app_context():
+        member_id = Member.query.filter_by(member_number='OT-006').one().id
+        contribution = Contribution.query.filter_by(member_id=member_id).order_by(Contribution.id).first()
+        contribution.payment_method = 'Cash' if contribution.payment_method != 'Cash' else 'MobileMoney'
+        db.session.commit()
+        edited = (contribution.id, contribution.payment_method)
+
+    changed = client.get(url, headers={'If-None-Match': delta.headers['ETag']})
+    assert changed.status_code == 200
+    body = changed.get_json()
+    assert [(c['id'], c['payment_method']) for c in body['contributions']] == [edited]
+    assert body['token'] != full['token']
+
+    url = f"/api/v1/sync?since={body['token']}"
+    caught_up = client.get(url)
+    assert caught_up.get_json()['contributions'] == []
+    assert client.get(url, headers={'If-None-Match': caught_up.headers['ETag']}).status_code == 304
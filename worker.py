@@ -0,0 +1,13 @@
+"""
+Old Timers Savings Group - Digital Records Management System
+Worker Entry Point (cron jobs, background workers)
+
+Loads models and services only; no blueprints or template helpers.
+
+Usage:
+    flask --app worker send-loan-reminders
+"""
+from app import create_app
+import os
+
+app = create_app(os.getenv('FLASK_ENV', 'production'), mode='worker')